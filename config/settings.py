@@ -35,8 +35,64 @@ DATA_SOURCES = {
 # 界面配置
 UI_CONFIG = {
     "default_window_size": "1000x700",
-    "theme": "default"
+    "theme": "default",
+    "month_cache_size": 12,  # 日历视图缓存的月份数
+    "search_debounce_ms": 300,  # 数据管理边输入边搜索的延迟
+    "report_render_time": False  # 调试用：每次重绘月历后打印渲染耗时
 }
 
 # 数据库类型配置
-USE_MYSQL = True  # 设置为 False 则使用 SQLite
\ No newline at end of file
+USE_MYSQL = True  # 设置为 False 则使用 SQLite
+
+# 数据库连接池配置（每个数据库 URL 共享一个 Engine）
+DB_POOL_CONFIG = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_recycle": 3600,  # MySQL 默认 8 小时断开空闲连接
+    "pool_timeout": 30,
+    "pool_pre_ping": True
+}
+
+# SQLite 连接参数（USE_MYSQL 为 False 或 MySQL 不可用时生效），每个新连接建立时执行：
+# WAL 让界面的读取不被写入阻塞，synchronous=NORMAL 在 WAL 下只在检查点同步磁盘，
+# mmap_size / cache_size（负数表示 KiB）减少读取时的系统调用，临时表和排序放在内存中
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000
+}
+
+# 本地 SQLite 镜像（scripts/sync_mirror.py）：从 MySQL 增量同步到 url，
+# 默认与 SQLITE_URL 相同，MySQL 不可用而回退到 SQLite 时直接读取镜像数据
+MIRROR_CONFIG = {
+    "url": SQLITE_URL,
+    "batch_size": 1000,
+    "overlap_seconds": 5  # 每次同步从水位往前回看的秒数，覆盖时间戳相同或提交较晚的行
+}
+
+# 流式读取（导出、分析、数据检查）时每批从服务端游标取回的行数
+STREAM_BATCH_SIZE = 1000
+
+# 关键词搜索最多返回的事件数（按相关度取前若干条）
+SEARCH_RESULT_LIMIT = 100
+
+# 查询结果缓存：disk_path 为 None 时只在进程内缓存，
+# 设置为文件路径（如 os.path.join(BASE_DIR, "storage", "cache", "query_cache.db")）时多个进程共享
+QUERY_CACHE_CONFIG = {
+    "enabled": True,
+    "max_entries": 256,
+    "ttl": 60,  # 秒；其他进程写入数据库时依靠过期时间刷新
+    "disk_path": None
+}
+
+# 查询耗时统计：超过 slow_ms 的语句写入慢查询日志（JSON Lines）；
+# log_all 为 True 时记录全部语句，供 scripts/query_report.py 统计各方法的总耗时
+QUERY_LOG_CONFIG = {
+    "enabled": True,
+    "slow_ms": 100,
+    "log_all": False,
+    "path": os.path.join(BASE_DIR, "storage", "logs", "slow_queries.jsonl")
+}
@@ -6,18 +6,35 @@
 from .models import (
     Base, 
     InternetEvent, 
+    DailyEventStats,
     init_database, 
-    get_db_session
+    get_engine,
+    get_db_session,
+    remove_db_session,
+    dispose_engines
 )
 
+from .migrations import run_migrations
+from .pagination import EventPage, encode_cursor, decode_cursor
+from .records import EventListRow, EventRecord
 from .database_manager import DatabaseManager, db_manager
 from .query_builder import QueryBuilder
 
 __all__ = [
     'Base',
     'InternetEvent', 
+    'DailyEventStats',
     'init_database',
+    'get_engine',
     'get_db_session',
+    'remove_db_session',
+    'dispose_engines',
+    'run_migrations',
+    'EventPage',
+    'encode_cursor',
+    'decode_cursor',
+    'EventListRow',
+    'EventRecord',
     'DatabaseManager',
     'db_manager',
     'QueryBuilder'
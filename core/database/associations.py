@@ -0,0 +1,147 @@
+"""
+分类/关键词关联表 - 与 InternetEvent 的 categories、keywords JSON 列保持同步
+
+JSON 列无法建索引，按分类或关键词筛选时改为查 event_categories /
+event_keywords 上的复合索引。
+"""
+
+import json
+
+from sqlalchemy import event, inspect, select, delete, insert, text
+
+from .models import InternetEvent, EventCategory, EventKeyword
+
+# 关联表字段长度上限（与模型定义一致）
+_MAX_VALUE_LENGTH = 100
+
+
+def normalize_values(values):
+    """把 JSON 列内容整理为去重、去空白的字符串列表"""
+    if not values:
+        return []
+    if isinstance(values, str):
+        try:
+            values = json.loads(values)
+        except ValueError:
+            values = [values]
+    if not isinstance(values, (list, tuple, set)):
+        values = [values]
+
+    normalized = []
+    for value in values:
+        value = str(value).strip()[:_MAX_VALUE_LENGTH]
+        if value and value not in normalized:
+            normalized.append(value)
+    return normalized
+
+
+def sync_event_associations(conn, event_id, categories=None, keywords=None, sync_categories=True, sync_keywords=True):
+    """用事件当前的 JSON 列内容覆盖关联表中的记录"""
+    if sync_categories:
+        conn.execute(delete(EventCategory.__table__).where(EventCategory.event_id == event_id))
+        rows = [{"event_id": event_id, "category": c} for c in normalize_values(categories)]
+        if rows:
+            conn.execute(insert(EventCategory.__table__), rows)
+
+    if sync_keywords:
+        conn.execute(delete(EventKeyword.__table__).where(EventKeyword.event_id == event_id))
+        rows = [{"event_id": event_id, "keyword": k} for k in normalize_values(keywords)]
+        if rows:
+            conn.execute(insert(EventKeyword.__table__), rows)
+
+
+def sync_many_event_associations(conn, rows):
+    """批量覆盖关联记录，rows 为 (event_id, categories, keywords) 序列"""
+    rows = list(rows)
+    if not rows:
+        return
+
+    event_ids = [row[0] for row in rows]
+    conn.execute(delete(EventCategory.__table__).where(EventCategory.event_id.in_(event_ids)))
+    conn.execute(delete(EventKeyword.__table__).where(EventKeyword.event_id.in_(event_ids)))
+
+    category_rows, keyword_rows = [], []
+    for event_id, categories, keywords in rows:
+        category_rows.extend({"event_id": event_id, "category": c} for c in normalize_values(categories))
+        keyword_rows.extend({"event_id": event_id, "keyword": k} for k in normalize_values(keywords))
+    _flush_rows(conn, category_rows, keyword_rows)
+
+
+def remove_event_associations(conn, event_id):
+    """删除事件的所有关联记录（SQLite 默认不执行外键级联）"""
+    conn.execute(delete(EventCategory.__table__).where(EventCategory.event_id == event_id))
+    conn.execute(delete(EventKeyword.__table__).where(EventKeyword.event_id == event_id))
+
+
+def backfill_event_associations(conn, batch_size=1000):
+    """根据 internet_events 的 JSON 列重建两张关联表，返回处理的事件数"""
+    conn.execute(delete(EventCategory.__table__))
+    conn.execute(delete(EventKeyword.__table__))
+
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+        text("SELECT id, categories, keywords FROM internet_events")
+    )
+
+    processed = 0
+    category_rows, keyword_rows = [], []
+    for event_id, categories, keywords in result:
+        category_rows.extend({"event_id": event_id, "category": c} for c in normalize_values(categories))
+        keyword_rows.extend({"event_id": event_id, "keyword": k} for k in normalize_values(keywords))
+        processed += 1
+
+        if processed % batch_size == 0:
+            _flush_rows(conn, category_rows, keyword_rows)
+            category_rows, keyword_rows = [], []
+
+    _flush_rows(conn, category_rows, keyword_rows)
+    return processed
+
+
+def _flush_rows(conn, category_rows, keyword_rows):
+    if category_rows:
+        conn.execute(insert(EventCategory.__table__), category_rows)
+    if keyword_rows:
+        conn.execute(insert(EventKeyword.__table__), keyword_rows)
+
+
+def create_association_tables(conn):
+    """迁移步骤：创建关联表并回填已有事件"""
+    EventCategory.__table__.create(conn, checkfirst=True)
+    EventKeyword.__table__.create(conn, checkfirst=True)
+    count = backfill_event_associations(conn)
+    print(f"📊 已为 {count} 个事件回填分类/关键词关联")
+
+
+def category_clause(model, category):
+    """按分类过滤：走 (category, event_id) 索引"""
+    return model.id.in_(select(EventCategory.event_id).where(EventCategory.category == category))
+
+
+def tag_clause(model, keyword):
+    """按关键词标签精确过滤：走 (keyword, event_id) 索引"""
+    return model.id.in_(select(EventKeyword.event_id).where(EventKeyword.keyword == keyword))
+
+
+# ==================== 与 InternetEvent 写入保持同步 ====================
+
+@event.listens_for(InternetEvent, 'after_insert')
+def _associations_after_insert(mapper, connection, target):
+    sync_event_associations(connection, target.id, target.categories, target.keywords)
+
+
+@event.listens_for(InternetEvent, 'after_update')
+def _associations_after_update(mapper, connection, target):
+    state = inspect(target)
+    categories_changed = state.attrs.categories.history.has_changes()
+    keywords_changed = state.attrs.keywords.history.has_changes()
+    if categories_changed or keywords_changed:
+        sync_event_associations(
+            connection, target.id, target.categories, target.keywords,
+            sync_categories=categories_changed,
+            sync_keywords=keywords_changed
+        )
+
+
+@event.listens_for(InternetEvent, 'before_delete')
+def _associations_before_delete(mapper, connection, target):
+    remove_event_associations(connection, target.id)
@@ -0,0 +1,565 @@
+"""
+异步数据访问 - 基于 SQLAlchemy asyncio 扩展（aiomysql / aiosqlite）
+
+FastAPI 的 async 路由通过 AsyncEventRepository 访问数据库：每个请求从 async_sessionmaker
+取得独立的 AsyncSession，连接由异步连接池管理，查询期间不阻塞事件循环。
+提供与 DatabaseManager 相同的读写操作（含批量写入、流式读取和派生数据重建）；
+表结构仍由同步的 init_database / 迁移系统维护，全文检索后端、QueryBuilder 和批量写入等
+同步代码通过 AsyncSession.run_sync 复用。
+应用启动时调用 init_async_database，在线程池中完成同步的迁移，之后的请求不再阻塞事件循环。
+
+以下 DatabaseManager 方法只有同步版本：connect / disconnect / release_connection（会话由
+async_sessionmaker 按请求创建和关闭）、变更监听器（改用构造参数 notify）、查询结果缓存
+（Web 层用 ETag 做条件请求）、update_database_schema（迁移由 init_async_database 执行）。
+"""
+
+import os
+import asyncio
+import threading
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import select, func, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from .models import InternetEvent, EventCategory, DailyEventStats, init_database, get_database_url, apply_sqlite_pragmas
+from .pagination import encode_cursor, keyset_filter, keyset_order, locate_position, make_page
+from .search_index import keyword_clause, ranked_search, get_search_backend
+from .associations import category_clause, tag_clause, backfill_event_associations
+from .daily_stats import rebuild_daily_stats as _rebuild_daily_stats
+from .query_cache import QueryCache
+from .database_manager import DatabaseManager
+from .records import LIST_COLUMNS, make_list_row
+from .query_builder import advanced_search_builder, event_list_builder, heat_band_range, FACET_DIMENSIONS
+from .revisions import get_revision
+from .instrumentation import track_public_methods, install_query_instrumentation
+from config.settings import SEARCH_RESULT_LIMIT, STREAM_BATCH_SIZE
+
+# 同步驱动对应的异步驱动
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
+_async_engines = {}
+_async_sessionmakers = {}
+_async_engine_lock = threading.Lock()
+
+
+def async_database_url(database_url):
+    """把同步 URL（mysql+pymysql / sqlite）换成对应的异步驱动"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"不支持异步访问的数据库: {backend}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+async def init_async_database():
+    """在线程池中执行同步的 init_database（迁移，MySQL 不可用时回退到 SQLite），返回生效的数据库 URL
+
+    应用启动时调用一次，之后 get_async_engine() 直接使用已确定的数据库。
+    """
+    await asyncio.get_running_loop().run_in_executor(None, init_database)
+    return get_database_url()
+
+
+def get_async_engine(database_url=None):
+    """获取（必要时惰性创建）当前数据库的共享 AsyncEngine
+
+    不执行迁移：未指定 URL 时使用 init_async_database 确定的数据库。
+    """
+    if database_url is None:
+        database_url = get_database_url()
+
+    engine = _async_engines.get(database_url)
+    if engine is None:
+        with _async_engine_lock:
+            engine = _async_engines.get(database_url)
+            if engine is None:
+                from config.settings import DB_POOL_CONFIG, SQLITE_PRAGMAS
+
+                options = {"pool_pre_ping": DB_POOL_CONFIG.get("pool_pre_ping", True)}
+                if not database_url.startswith("sqlite"):
+                    options.update(
+                        pool_size=DB_POOL_CONFIG.get("pool_size", 5),
+                        max_overflow=DB_POOL_CONFIG.get("max_overflow", 10),
+                        pool_recycle=DB_POOL_CONFIG.get("pool_recycle", 3600),
+                        pool_timeout=DB_POOL_CONFIG.get("pool_timeout", 30),
+                    )
+                engine = create_async_engine(async_database_url(database_url), **options)
+                # 连接事件和计时事件注册在底层的同步 Engine 上
+                if database_url.startswith("sqlite"):
+                    apply_sqlite_pragmas(engine.sync_engine, SQLITE_PRAGMAS)
+                install_query_instrumentation(engine.sync_engine)
+                _async_engines[database_url] = engine
+    return engine
+
+
+def get_async_sessionmaker(database_url=None):
+    """AsyncSession 工厂（提交后不过期对象，响应序列化时不会再触发查询）"""
+    engine = get_async_engine(database_url)
+    key = str(engine.url)
+    factory = _async_sessionmakers.get(key)
+    if factory is None:
+        with _async_engine_lock:
+            factory = _async_sessionmakers.get(key)
+            if factory is None:
+                factory = async_sessionmaker(engine, expire_on_commit=False)
+                _async_sessionmakers[key] = factory
+    return factory
+
+
+async def dispose_async_engines():
+    """关闭所有异步 Engine 的连接池（应用关闭时调用）"""
+    with _async_engine_lock:
+        engines = list(_async_engines.values())
+        _async_engines.clear()
+        _async_sessionmakers.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+@track_public_methods
+class AsyncEventRepository:
+    """事件数据的异步读写（每个请求一个实例，绑定该请求的 AsyncSession）
+
+    notify 为可选的变更回调 notify(dates)，写入提交后调用，
+    例如传入 db_manager.query_cache.invalidate_dates 使同一进程中的查询缓存失效。
+    """
+
+    def __init__(self, session, notify=None):
+        self.session = session
+        self.notify = notify
+
+    def _notify_change(self, dates=None):
+        if self.notify is None:
+            return
+        if dates is not None:
+            dates = {value for value in dates if value is not None}
+        try:
+            self.notify(dates)
+        except Exception as e:
+            print(f"数据变更通知失败: {e}")
+
+    async def _filter(self, statement, keyword=None, category=None, event_type=None, heat=None):
+        """附加关键词（全文索引）、分类、事件类型和热度区间条件，与 DatabaseManager._filter_events 一致"""
+        if keyword and keyword.strip():
+            keyword = keyword.strip()
+            clause = await self.session.run_sync(
+                lambda session: keyword_clause(session.connection(), InternetEvent, keyword)
+            )
+            statement = statement.where(clause)
+
+        if category and category.strip() and category != "全部":
+            statement = statement.where(category_clause(InternetEvent, category.strip()))
+
+        if event_type:
+            statement = statement.where(InternetEvent.event_type == event_type)
+
+        if heat:
+            min_score, max_score = heat_band_range(heat)
+            if min_score is not None:
+                statement = statement.where(InternetEvent.heat_score >= min_score)
+            if max_score is not None:
+                statement = statement.where(InternetEvent.heat_score <= max_score)
+        return statement
+
+    async def get_all_events(self, limit=100):
+        """按日期倒序获取事件"""
+        try:
+            result = await self.session.scalars(
+                select(InternetEvent).order_by(InternetEvent.date.desc()).limit(limit)
+            )
+            return list(result)
+        except Exception as e:
+            print(f"获取所有事件失败: {e}")
+            return []
+
+    async def get_events_by_date_range(self, start_date, end_date):
+        """按日期范围获取事件"""
+        try:
+            result = await self.session.scalars(
+                select(InternetEvent)
+                .where(InternetEvent.date.between(start_date, end_date))
+                .order_by(InternetEvent.date.desc())
+            )
+            return list(result)
+        except Exception as e:
+            print(f"按日期范围获取事件失败: {e}")
+            return []
+
+    async def get_event_rows_by_date_range(self, start_date, end_date):
+        """按日期范围获取列表行 EventListRow（只查询列表需要的列）"""
+        try:
+            result = await self.session.execute(
+                select(*LIST_COLUMNS)
+                .where(InternetEvent.date.between(start_date, end_date))
+                .order_by(*keyset_order(InternetEvent))
+            )
+            return [make_list_row(row) for row in result]
+        except Exception as e:
+            print(f"按日期范围获取事件列表失败: {e}")
+            return []
+
+    async def count_events(self, keyword=None, category=None, event_type=None, heat=None):
+        """统计事件数：无筛选条件时直接汇总每日聚合，不扫描事件表"""
+        try:
+            statement = await self._filter(
+                select(func.count()).select_from(InternetEvent), keyword, category, event_type, heat
+            )
+            if statement.whereclause is None:
+                statement = select(func.coalesce(func.sum(DailyEventStats.event_count), 0))
+            return await self.session.scalar(statement)
+        except Exception as e:
+            print(f"统计事件数失败: {e}")
+            return 0
+
+    async def get_events_page(self, cursor=None, page_size=50, keyword=None, category=None, descending=True,
+                              event_type=None, heat=None, start_date=None, end_date=None):
+        """按 (date, id) 游标分页获取事件，返回 EventPage(items, next_cursor)
+
+        游标无效时抛出 ValueError；数据库错误直接抛出（API 返回 5xx，而不是空列表）。
+        """
+        builder = event_list_builder(
+            start_date, end_date, keyword, category, event_type, heat, cursor, page_size, descending
+        )
+        statement, params = await self.session.run_sync(
+            lambda session: builder.build_statement(session.connection())
+        )
+        return make_page(await self.session.scalars(statement, params), page_size)
+
+    async def get_cursor_at(self, position, keyword=None, category=None, event_type=None, heat=None):
+        """返回按日期倒序第 position 条事件之前的游标，position 为 0 时返回 None（即首页）
+
+        与 DatabaseManager.get_cursor_at 相同：无筛选条件时借助每日聚合的累计数定位，
+        有筛选条件时只在 (date, id) 上做 OFFSET。
+        """
+        if position <= 0:
+            return None
+
+        try:
+            statement = await self._filter(
+                select(InternetEvent.date, InternetEvent.id), keyword, category, event_type, heat
+            )
+            if statement.whereclause is not None:
+                row = (await self.session.execute(
+                    statement.order_by(*keyset_order(InternetEvent)).offset(position - 1).limit(1)
+                )).first()
+                return encode_cursor(row.date, row.id) if row else encode_cursor(date.min, '')
+
+            days = (await self.session.execute(
+                select(DailyEventStats.date, DailyEventStats.event_count).order_by(DailyEventStats.date.desc())
+            )).all()
+            located = locate_position(days, position)
+            if located is None:
+                return encode_cursor(date.min, '')
+
+            day, offset = located
+            if offset == 0:
+                return encode_cursor(day + timedelta(days=1), '')
+
+            previous_id = await self.session.scalar(
+                select(InternetEvent.id)
+                .where(InternetEvent.date == day)
+                .order_by(InternetEvent.id.desc())
+                .offset(offset - 1)
+                .limit(1)
+            )
+            return encode_cursor(day, previous_id)
+        except Exception as e:
+            print(f"定位分页游标失败: {e}")
+            return None
+
+    async def iter_events(self, keyword=None, category=None, tag=None, start_date=None, end_date=None,
+                          batch_size=STREAM_BATCH_SIZE):
+        """按 (date, id) 倒序逐条产出事件（async for），适合导出和全量扫描
+
+        使用服务端游标（yield_per），内存中只保留一批 batch_size 条；读取失败时抛出异常，
+        不会把中途出错的结果当作完整数据。
+        """
+        statement = await self._filter(select(InternetEvent), keyword, category)
+        if tag and tag.strip():
+            statement = statement.where(tag_clause(InternetEvent, tag.strip()))
+        if start_date is not None:
+            statement = statement.where(InternetEvent.date >= start_date)
+        if end_date is not None:
+            statement = statement.where(InternetEvent.date <= end_date)
+
+        result = await self.session.stream_scalars(
+            statement.order_by(*keyset_order(InternetEvent)).execution_options(yield_per=batch_size)
+        )
+        try:
+            async for event in result:
+                yield event
+        finally:
+            await result.close()
+
+    def iter_events_by_date_range(self, start_date, end_date, batch_size=STREAM_BATCH_SIZE):
+        """get_events_by_date_range 的流式版本（async for）"""
+        return self.iter_events(start_date=start_date, end_date=end_date, batch_size=batch_size)
+
+    async def get_events_revision(self):
+        """事件表的修订号（任何写入后递增），用于生成 ETag；查询失败时返回 None"""
+        try:
+            return await self.session.run_sync(lambda session: get_revision(session.connection()))
+        except Exception as e:
+            print(f"获取事件修订号失败: {e}")
+            return None
+
+    async def get_event_rows_page(self, cursor=None, page_size=50, keyword=None, category=None, descending=True,
+                                  event_type=None, heat=None):
+        """与 get_events_page 相同的游标分页，但只查询列表列，返回 EventListRow 组成的 EventPage"""
+        statement = await self._filter(select(*LIST_COLUMNS), keyword, category, event_type, heat)
+        if cursor:
+            statement = statement.where(keyset_filter(InternetEvent, cursor, descending))
+
+        result = await self.session.execute(
+            statement.order_by(*keyset_order(InternetEvent, descending)).limit(page_size + 1)
+        )
+        return make_page([make_list_row(row) for row in result], page_size)
+
+    async def search_events(self, keyword=None, category=None, tag=None, limit=SEARCH_RESULT_LIMIT):
+        """搜索事件 - 有关键词时走全文索引并按相关度排序，否则按日期倒序；最多返回 limit 条"""
+        try:
+            clauses = []
+            if category and category.strip() and category != "全部":
+                clauses.append(category_clause(InternetEvent, category.strip()))
+            if tag and tag.strip():
+                clauses.append(tag_clause(InternetEvent, tag.strip()))
+
+            keyword = keyword.strip() if keyword else None
+            if keyword:
+                results = await self.session.run_sync(
+                    lambda session: ranked_search(session, keyword, clauses, limit)
+                )
+                if results is not None:
+                    return results
+                # 输入无法分词（如只有标点），按子串匹配
+                clauses.append(
+                    InternetEvent.title.contains(keyword) |
+                    InternetEvent.description.contains(keyword)
+                )
+
+            statement = select(InternetEvent).where(*clauses).order_by(InternetEvent.date.desc()).limit(limit)
+            return list(await self.session.scalars(statement))
+        except Exception as e:
+            print(f"❌ 搜索事件失败: {e}")
+            return []
+
+    async def advanced_search(self, **filters):
+        """按 advanced_search_builder 的参数查询（语句模板按查询形状缓存）"""
+        try:
+            builder = advanced_search_builder(**filters)
+            statement, params = await self.session.run_sync(
+                lambda session: builder.build_statement(session.connection())
+            )
+            return list(await self.session.scalars(statement, params))
+        except Exception as e:
+            print(f"高级搜索失败: {e}")
+            return []
+
+    async def get_facet_counts(self, keyword=None, category=None, event_type=None, heat=None, tag=None,
+                               start_date=None, end_date=None, dimensions=FACET_DIMENSIONS):
+        """当前筛选条件下各分类/事件类型/热度区间的事件数：{维度: [(取值, 数量), ...]}"""
+        try:
+            builder = advanced_search_builder(
+                keyword=keyword, category=None if category == "全部" else category,
+                start_date=start_date, end_date=end_date, event_type=event_type, tag=tag, limit=None
+            ).filter_by_heat_band(heat)
+            return await self.session.run_sync(
+                lambda session: builder.facet_counts(session.connection(), dimensions)
+            )
+        except Exception as e:
+            print(f"统计筛选项数量失败: {e}")
+            return {dimension: [] for dimension in dimensions}
+
+    async def get_event(self, event_id):
+        """按 ID 获取事件"""
+        try:
+            return await self.session.get(InternetEvent, event_id)
+        except Exception as e:
+            print(f"获取事件失败: {e}")
+            return None
+
+    async def get_event_with_literature(self, event_id):
+        """获取事件及其文献内容"""
+        event = await self.get_event(event_id)
+        if event and getattr(event, 'has_literature', False):
+            return event, event.get_literature_content()
+        return event, None
+
+    async def get_all_categories(self):
+        """获取所有分类及事件数（只扫描分类索引）"""
+        try:
+            result = await self.session.execute(
+                select(EventCategory.category, func.count(EventCategory.event_id))
+                .group_by(EventCategory.category)
+                .order_by(EventCategory.category)
+            )
+            return [(category, count) for category, count in result]
+        except Exception as e:
+            print(f"获取分类列表失败: {e}")
+            return []
+
+    async def get_daily_stats(self, start_date, end_date):
+        """获取日期范围内每天的事件数、最高/平均热度和热度最高的事件 ID（按日期升序）"""
+        try:
+            result = await self.session.execute(
+                select(
+                    DailyEventStats.date,
+                    DailyEventStats.event_count,
+                    DailyEventStats.max_heat,
+                    DailyEventStats.avg_heat,
+                    DailyEventStats.top_event_id
+                ).where(
+                    DailyEventStats.date >= start_date,
+                    DailyEventStats.date <= end_date
+                ).order_by(DailyEventStats.date)
+            )
+            return result.all()
+        except Exception as e:
+            print(f"统计每日事件失败: {e}")
+            return []
+
+    async def add_event(self, event_data):
+        """添加新事件，返回 (是否成功, 消息)"""
+        try:
+            new_event = InternetEvent(
+                id=f"event_{uuid4().hex[:8]}",
+                date=event_data['date'],
+                title=event_data['title'],
+                description=event_data.get('description', ''),
+                event_type=event_data.get('event_type', 'meme'),
+                categories=event_data.get('categories', []),
+                keywords=event_data.get('keywords', []),
+                heat_level=event_data.get('heat_level', 'medium'),
+                heat_score=event_data.get('heat_score', 50),
+                sources=event_data.get('sources', ['手动添加']),
+                media_urls=event_data.get('media_urls', []),
+                has_literature=event_data.get('has_literature', False),
+                literature_path=event_data.get('literature_path')
+            )
+            self.session.add(new_event)
+            await self.session.commit()
+            self._notify_change([new_event.date])
+            return True, "添加成功"
+        except Exception as e:
+            await self.session.rollback()
+            error_msg = f"添加事件失败: {str(e)}"
+            print(error_msg)
+            return False, error_msg
+
+    async def update_event(self, event_id, event_data):
+        """更新事件"""
+        try:
+            event = await self.session.get(InternetEvent, event_id)
+            if not event:
+                return False
+
+            previous_date = event.date
+            for key, value in event_data.items():
+                if hasattr(event, key):
+                    setattr(event, key, value)
+
+            event.updated_at = datetime.now()
+            await self.session.commit()
+            self._notify_change([previous_date, event.date])
+            return True
+        except Exception as e:
+            await self.session.rollback()
+            print(f"更新事件失败: {e}")
+            return False
+
+    def _sync_manager(self, session):
+        """绑定到 AsyncSession 底层同步会话的 DatabaseManager，复用批量写入的同步实现"""
+        manager = DatabaseManager()
+        manager.set_query_cache(QueryCache(enabled=False))
+        manager.session = session
+        manager.add_change_listener(self._notify_change)
+        return manager
+
+    async def bulk_upsert_events(self, events, batch_size=500):
+        """批量写入或更新事件，与 DatabaseManager.bulk_upsert_events 相同
+
+        events 为普通可迭代对象（可以是生成器），按批提交；
+        返回 {'inserted': n, 'updated': n, 'skipped': n, 'failed_ids': [...]}
+        """
+        return await self.session.run_sync(
+            lambda session: self._sync_manager(session).bulk_upsert_events(events, batch_size)
+        )
+
+    async def rebuild_daily_stats(self):
+        """全量重建每日事件聚合表"""
+        try:
+            days = await self.session.run_sync(lambda session: _rebuild_daily_stats(session.connection()))
+            await self.session.commit()
+            print(f"✅ 已重建 {days} 天的事件聚合")
+            self._notify_change()
+            return days
+        except Exception as e:
+            await self.session.rollback()
+            print(f"重建每日事件聚合失败: {e}")
+            return 0
+
+    async def backfill_associations(self):
+        """根据 JSON 列重建分类/关键词关联表"""
+        try:
+            count = await self.session.run_sync(lambda session: backfill_event_associations(session.connection()))
+            await self.session.commit()
+            print(f"✅ 已回填 {count} 个事件的分类/关键词关联")
+            self._notify_change()
+            return count
+        except Exception as e:
+            await self.session.rollback()
+            print(f"回填分类/关键词关联失败: {e}")
+            return 0
+
+    async def rebuild_search_index(self):
+        """重建全文检索索引"""
+        def rebuild(session):
+            conn = session.connection()
+            get_search_backend(conn).rebuild(conn)
+
+        try:
+            await self.session.run_sync(rebuild)
+            await self.session.commit()
+            print("✅ 全文检索索引重建完成")
+            self._notify_change()
+            return True
+        except Exception as e:
+            await self.session.rollback()
+            print(f"重建全文检索索引失败: {e}")
+            return False
+
+    async def check_database_health(self):
+        """检查数据库健康状态，返回 (是否正常, 说明)"""
+        try:
+            count = await self.session.scalar(text("SELECT COUNT(*) FROM internet_events"))
+            return True, f"数据库正常，共有 {count} 条记录"
+        except Exception as e:
+            return False, f"数据库检查失败: {e}"
+
+    async def delete_event(self, event_id):
+        """删除事件（同时删除文献文件）"""
+        try:
+            event = await self.session.get(InternetEvent, event_id)
+            if not event:
+                return False
+
+            if getattr(event, 'has_literature', False) and getattr(event, 'literature_path', None):
+                try:
+                    from config.settings import LITERATURE_BASE_DIR
+                    file_path = os.path.join(LITERATURE_BASE_DIR, event.literature_path)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                except Exception as e:
+                    print(f"删除文献文件失败: {e}")
+
+            event_date = event.date
+            await self.session.delete(event)
+            await self.session.commit()
+            self._notify_change([event_date])
+            return True
+        except Exception as e:
+            await self.session.rollback()
+            print(f"删除事件失败: {e}")
+            return False
@@ -0,0 +1,104 @@
+"""
+每日事件聚合 - 维护 daily_event_stats 表
+
+日历只需要每天的事件数和最高热度，不必加载完整事件。
+InternetEvent 写入时按受影响的日期增量刷新（单日只涉及 date 索引上的几行），
+rebuild_daily_stats 用一次 GROUP BY 全量重建。
+"""
+
+from sqlalchemy import event, inspect, select, delete, insert, func, text
+
+from .models import InternetEvent, DailyEventStats
+
+
+# 每条 IN 查询包含的日期数上限
+_DATE_CHUNK = 500
+
+
+def refresh_daily_stats(conn, dates):
+    """重新计算指定日期的聚合（当天已无事件则删除该行）"""
+    dates = sorted({d for d in dates if d is not None})
+    for start in range(0, len(dates), _DATE_CHUNK):
+        _refresh_dates(conn, dates[start:start + _DATE_CHUNK])
+
+
+def _refresh_dates(conn, dates):
+    # 按 (日期, 热度倒序, id) 读取当天的事件，一次遍历同时得到计数、最高/平均热度和热度最高的事件
+    result = conn.execute(
+        select(InternetEvent.date, InternetEvent.id, InternetEvent.heat_score)
+        .where(InternetEvent.date.in_(dates))
+        .order_by(InternetEvent.date, InternetEvent.heat_score.desc(), InternetEvent.id)
+    )
+
+    rows = {}
+    for event_date, event_id, heat_score in result:
+        heat_score = heat_score or 0
+        stats = rows.get(event_date)
+        if stats is None:
+            rows[event_date] = {
+                "date": event_date,
+                "event_count": 1,
+                "max_heat": heat_score,
+                "avg_heat": heat_score,
+                "top_event_id": event_id
+            }
+        else:
+            stats["event_count"] += 1
+            stats["avg_heat"] += heat_score
+    for stats in rows.values():
+        stats["avg_heat"] = float(stats["avg_heat"]) / stats["event_count"]
+
+    conn.execute(delete(DailyEventStats.__table__).where(DailyEventStats.date.in_(dates)))
+    if rows:
+        conn.execute(insert(DailyEventStats.__table__), list(rows.values()))
+
+
+def rebuild_daily_stats(conn):
+    """全量重建每日聚合，返回天数"""
+    conn.execute(delete(DailyEventStats.__table__))
+    conn.execute(
+        insert(DailyEventStats.__table__).from_select(
+            ["date", "event_count", "max_heat", "avg_heat"],
+            select(
+                InternetEvent.date,
+                func.count(InternetEvent.id),
+                func.coalesce(func.max(InternetEvent.heat_score), 0),
+                func.coalesce(func.avg(InternetEvent.heat_score), 0)
+            ).group_by(InternetEvent.date)
+        )
+    )
+    conn.execute(text(
+        "UPDATE daily_event_stats SET top_event_id = ("
+        "SELECT e.id FROM internet_events e WHERE e.date = daily_event_stats.date "
+        "ORDER BY e.heat_score DESC, e.id LIMIT 1)"
+    ))
+    return conn.execute(select(func.count()).select_from(DailyEventStats.__table__)).scalar()
+
+
+def create_daily_stats_table(conn):
+    """迁移步骤：创建每日聚合表并根据已有事件填充"""
+    DailyEventStats.__table__.create(conn, checkfirst=True)
+    days = rebuild_daily_stats(conn)
+    print(f"📊 已生成 {days} 天的事件聚合")
+
+
+# ==================== 与 InternetEvent 写入保持同步 ====================
+
+@event.listens_for(InternetEvent, 'after_insert')
+def _stats_after_insert(mapper, connection, target):
+    refresh_daily_stats(connection, [target.date])
+
+
+@event.listens_for(InternetEvent, 'after_update')
+def _stats_after_update(mapper, connection, target):
+    state = inspect(target)
+    date_history = state.attrs.date.history
+    if not (date_history.has_changes() or state.attrs.heat_score.history.has_changes()):
+        return
+    # 日期被修改时，旧日期和新日期都要刷新
+    refresh_daily_stats(connection, [target.date, *(date_history.deleted or ())])
+
+
+@event.listens_for(InternetEvent, 'after_delete')
+def _stats_after_delete(mapper, connection, target):
+    refresh_daily_stats(connection, [target.date])
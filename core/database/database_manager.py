@@ -2,13 +2,29 @@
 数据库管理器 - MySQL 适配版本
 """
 
-from .models import InternetEvent, get_db_session
-from datetime import datetime
+from .models import (
+    InternetEvent, EventCategory, DailyEventStats, get_db_session, get_readonly_db_session, new_db_session,
+    is_scoped_session
+)
+from .migrations import run_migrations
+from .pagination import EventPage, encode_cursor, keyset_filter, keyset_order, locate_position, make_page
+from .search_index import keyword_clause, ranked_search, get_search_backend
+from .associations import category_clause, tag_clause, backfill_event_associations
+from .derived import refresh_derived_data
+from .daily_stats import rebuild_daily_stats as _rebuild_daily_stats
+from .records import LIST_COLUMNS, DEFERRED_LIST_COLUMNS, EventRecord, make_list_row
+from .query_cache import QueryCache
+from .query_builder import advanced_search_builder, heat_band_range, FACET_DIMENSIONS
+from .instrumentation import track_public_methods, get_query_stats
+from datetime import datetime, date, timedelta
 import os
-from tkinter import messagebox
-from sqlalchemy import text, inspect
-from config.settings import USE_MYSQL
+import threading
+from uuid import uuid4
+from sqlalchemy import text, inspect, func, select, bindparam, null, JSON
+from sqlalchemy.orm import defer
+from config.settings import USE_MYSQL, STREAM_BATCH_SIZE, SEARCH_RESULT_LIMIT, QUERY_CACHE_CONFIG
 
+@track_public_methods
 class DatabaseManager:
     def get_events_by_date_range(self, start_date, end_date):
         """按日期范围获取事件"""
@@ -32,82 +48,117 @@ class DatabaseManager:
             return filtered_events
 
     def __init__(self):
+        # 会话按线程隔离：界面的后台加载线程各自使用独立的会话
+        self._local = threading.local()
         self.session = None
-        # 自动检查并更新数据库表结构
-        self.update_database_schema()
+        # 数据变更监听器：callback(dates)，dates 为受影响的日期集合，None 表示全部
+        self._change_listeners = []
+        # 只读查询结果缓存：写入后由变更通知按日期失效（最先注册，界面监听器重新查询时缓存已失效）
+        self.query_cache = QueryCache.from_config(QUERY_CACHE_CONFIG)
+        self.add_change_listener(self.query_cache.invalidate_dates)
+        # 表结构由迁移系统在首次连接时检查（已是最新时仅一次版本查询）
+    
+    @property
+    def session(self):
+        """当前线程的数据库会话"""
+        return getattr(self._local, 'session', None)
+    
+    @session.setter
+    def session(self, value):
+        self._local.session = value
     
     def update_database_schema(self):
-        """更新数据库表结构 - 添加所有缺失的列"""
+        """更新数据库表结构 - 执行所有未应用的迁移"""
         try:
-            # 先连接数据库
             if not self.connect():
                 print("❌ 无法连接数据库，跳过表结构更新")
                 return False
             
-            # 使用 SQLAlchemy 的 Inspector 来检查表结构
-            inspector = inspect(self.session.get_bind())
-            columns = [col['name'] for col in inspector.get_columns('internet_events')]
-            print(f"📋 当前表结构: {columns}")
-            
-            # 定义所有需要的列
-            expected_columns = {
-                'event_type': "ALTER TABLE internet_events ADD COLUMN event_type VARCHAR(20) DEFAULT 'meme'",
-                'sources': "ALTER TABLE internet_events ADD COLUMN sources JSON",
-                'media_urls': "ALTER TABLE internet_events ADD COLUMN media_urls JSON",
-                'heat_level': "ALTER TABLE internet_events ADD COLUMN heat_level VARCHAR(20)",
-                'has_literature': "ALTER TABLE internet_events ADD COLUMN has_literature BOOLEAN DEFAULT FALSE",
-                'literature_path': "ALTER TABLE internet_events ADD COLUMN literature_path VARCHAR(500)",
-                'created_at': "ALTER TABLE internet_events ADD COLUMN created_at DATETIME DEFAULT CURRENT_TIMESTAMP",
-                'updated_at': "ALTER TABLE internet_events ADD COLUMN updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
-            }
-            
-            # 检查并添加缺失的列
-            added_columns = []
-            for col_name, sql in expected_columns.items():
-                if col_name not in columns:
-                    try:
-                        print(f"➕ 添加缺失列: {col_name}")
-                        self.session.execute(text(sql))
-                        added_columns.append(col_name)
-                    except Exception as e:
-                        print(f"⚠️ 添加列 {col_name} 失败: {e}")
-            
-            if added_columns:
-                self.session.commit()
-                print(f"✅ 成功添加列: {added_columns}")
-                
-                # 重新连接以确保新的表结构生效
-                self.disconnect()
-                self.connect()
-                
-                # 验证最终表结构
-                inspector = inspect(self.session.get_bind())
-                final_columns = [col['name'] for col in inspector.get_columns('internet_events')]
-                print(f"📊 最终表结构: {final_columns}")
-            else:
-                print("✅ 表结构完整，无需更新")
-            
+            version = run_migrations(self.session.get_bind(), force=True)
+            print(f"✅ 表结构已是最新版本: {version}")
             return True
             
         except Exception as e:
             print(f"❌ 更新表结构失败: {e}")
             return False
     
-    def connect(self):
-        """连接数据库"""
+    def add_change_listener(self, callback):
+        """注册数据变更监听器（事件增删改或批量导入后调用）"""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+    
+    def remove_change_listener(self, callback):
+        """移除数据变更监听器"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+    
+    def set_query_cache(self, cache):
+        """替换查询结果缓存（例如改用 SQLiteCacheStore 或传入 enabled=False 的缓存）"""
+        self.remove_change_listener(self.query_cache.invalidate_dates)
+        self.query_cache = cache
+        self._change_listeners.insert(0, cache.invalidate_dates)
+    
+    def get_cache_stats(self):
+        """查询结果缓存的命中统计"""
+        return self.query_cache.stats()
+    
+    def get_query_stats(self):
+        """本进程内按方法汇总的 SQL 耗时（按总耗时倒序）"""
+        return get_query_stats()
+    
+    def _notify_change(self, dates=None):
+        """通知监听器哪些日期的数据已变化（在提交之后调用）"""
+        if dates is not None:
+            normalized = set()
+            for value in dates:
+                if isinstance(value, datetime):
+                    value = value.date()
+                elif isinstance(value, str):
+                    try:
+                        value = date.fromisoformat(value[:10])
+                    except ValueError:
+                        continue
+                if value is not None:
+                    normalized.add(value)
+            dates = normalized
+            if not dates:
+                return
+        
+        for callback in list(self._change_listeners):
+            try:
+                callback(dates)
+            except Exception as e:
+                print(f"数据变更通知失败: {e}")
+    
+    def connect(self, read_only=False):
+        """连接数据库；read_only 为 True 时当前线程改用只读连接（SQLite 下不会与写入争用）"""
         try:
-            self.session = get_db_session()
+            self.session = get_readonly_db_session() if read_only else get_db_session()
             return True
         except Exception as e:
             print(f"数据库连接失败: {e}")
             return False
     
     def disconnect(self):
-        """断开数据库连接"""
+        """断开数据库连接
+
+        线程共享的 scoped_session 可能仍被同一线程的其他窗口使用，这里只解除引用，
+        由程序退出时的 remove_db_session() 统一释放；其他会话直接关闭。
+        """
         if self.session:
-            self.session.close()
+            if not is_scoped_session(self.session):
+                self.session.close()
             self.session = None
     
+    def release_connection(self):
+        """结束当前线程会话的事务并把连接归还连接池，会话之后仍可继续使用
+        
+        长期存在的后台线程在每个任务结束后调用：MySQL（REPEATABLE READ）在事务的第一次读取时
+        固定快照，事务不结束就一直读到旧数据，空闲连接也一直被占用。已加载对象的属性仍可读取。
+        """
+        if self.session:
+            self.session.close()
+    
     # 其他方法保持不变...
     def get_all_events(self, limit=100):
         """获取所有事件"""
@@ -115,7 +166,9 @@ class DatabaseManager:
             return []
         
         try:
-            events = self.session.query(InternetEvent).order_by(
+            events = self.session.query(InternetEvent).options(
+                *[defer(column) for column in DEFERRED_LIST_COLUMNS]
+            ).order_by(
                 InternetEvent.date.desc()
             ).limit(limit).all()
             return events
@@ -129,7 +182,9 @@ class DatabaseManager:
             return []
         
         try:
-            events = self.session.query(InternetEvent).filter(
+            events = self.session.query(InternetEvent).options(
+                *[defer(column) for column in DEFERRED_LIST_COLUMNS]
+            ).filter(
                 InternetEvent.date.between(start_date, end_date)
             ).order_by(InternetEvent.date.desc()).all()
             return events
@@ -137,6 +192,228 @@ class DatabaseManager:
             print(f"按日期范围获取事件失败: {e}")
             return self._get_events_by_date_range_safe(start_date, end_date)
     
+    def iter_events(self, keyword=None, category=None, tag=None, start_date=None, end_date=None,
+                    batch_size=STREAM_BATCH_SIZE):
+        """按 (date, id) 倒序逐条产出事件，适合导出和全量扫描
+        
+        使用独立会话和服务端游标（yield_per / stream_results），内存中只保留一批 batch_size 条；
+        关键词条件按日期排序，不按相关度排序。
+        """
+        try:
+            session = new_db_session()
+        except Exception as e:
+            print(f"数据库连接失败: {e}")
+            return
+        
+        try:
+            query = self._filter_events(session.query(InternetEvent), keyword, category, session=session)
+            if tag and tag.strip():
+                query = query.filter(tag_clause(InternetEvent, tag.strip()))
+            if start_date is not None:
+                query = query.filter(InternetEvent.date >= start_date)
+            if end_date is not None:
+                query = query.filter(InternetEvent.date <= end_date)
+            
+            yield from query.order_by(*keyset_order(InternetEvent)).yield_per(batch_size)
+        except Exception as e:
+            print(f"流式读取事件失败: {e}")
+        finally:
+            session.close()
+    
+    def iter_events_by_date_range(self, start_date, end_date, batch_size=STREAM_BATCH_SIZE):
+        """get_events_by_date_range 的流式版本"""
+        return self.iter_events(start_date=start_date, end_date=end_date, batch_size=batch_size)
+    
+    def get_event_rows_by_date_range(self, start_date, end_date):
+        """按日期范围获取列表行 EventListRow（只查询列表需要的列）"""
+        if not self.session and not self.connect():
+            return []
+        
+        try:
+            return self.query_cache.get_or_load(
+                'event_rows_by_date_range', {'start': start_date, 'end': end_date},
+                lambda: self._load_event_rows_by_date_range(start_date, end_date),
+                start_date=start_date, end_date=end_date
+            )
+        except Exception as e:
+            print(f"按日期范围获取事件列表失败: {e}")
+            return []
+    
+    def _load_event_rows_by_date_range(self, start_date, end_date):
+        rows = self.session.execute(
+            select(*LIST_COLUMNS)
+            .where(InternetEvent.date.between(start_date, end_date))
+            .order_by(*keyset_order(InternetEvent))
+        )
+        return [make_list_row(row) for row in rows]
+    
+    def _filter_params(self, keyword=None, category=None, event_type=None, heat=None):
+        """筛选条件的缓存键参数（"全部" 等同于不限分类）"""
+        return {
+            'keyword': keyword, 'category': None if category == "全部" else category,
+            'event_type': event_type, 'heat': heat
+        }
+    
+    def _filter_events(self, query, keyword=None, category=None, session=None, event_type=None, heat=None):
+        """为事件查询附加关键词（全文索引）、分类（关联表索引）、事件类型和热度区间条件"""
+        if keyword and keyword.strip():
+            conn = (session or self.session).connection()
+            query = query.filter(keyword_clause(conn, InternetEvent, keyword.strip()))
+        
+        if category and category.strip() and category != "全部":
+            query = query.filter(category_clause(InternetEvent, category.strip()))
+        
+        if event_type:
+            query = query.filter(InternetEvent.event_type == event_type)
+        
+        if heat:
+            min_score, max_score = heat_band_range(heat)
+            if min_score is not None:
+                query = query.filter(InternetEvent.heat_score >= min_score)
+            if max_score is not None:
+                query = query.filter(InternetEvent.heat_score <= max_score)
+        return query
+    
+    def count_events(self, keyword=None, category=None, event_type=None, heat=None):
+        """统计事件数：无筛选条件时直接汇总每日聚合，不扫描事件表"""
+        if not self.session and not self.connect():
+            return 0
+        
+        try:
+            return self.query_cache.get_or_load(
+                'count_events', self._filter_params(keyword, category, event_type, heat),
+                lambda: self._load_event_count(keyword, category, event_type, heat),
+                all_dates=True
+            )
+        except Exception as e:
+            print(f"统计事件数失败: {e}")
+            return 0
+    
+    def _load_event_count(self, keyword=None, category=None, event_type=None, heat=None):
+        query = self._filter_events(
+            select(func.count()).select_from(InternetEvent), keyword, category,
+            event_type=event_type, heat=heat
+        )
+        if query.whereclause is None:
+            return self.session.execute(
+                select(func.coalesce(func.sum(DailyEventStats.event_count), 0))
+            ).scalar()
+        return self.session.execute(query).scalar()
+    
+    def get_cursor_at(self, position, keyword=None, category=None, event_type=None, heat=None):
+        """返回按日期倒序第 position 条事件之前的游标，position 为 0 时返回 None（即首页）
+        
+        无筛选条件时借助每日聚合的累计数定位到具体日期，再在当天的少量事件中取偏移，
+        不需要对事件表做大 OFFSET 扫描；有筛选条件时只在 (date, id) 上做 OFFSET。
+        """
+        if position <= 0:
+            return None
+        if not self.session and not self.connect():
+            return None
+        
+        try:
+            query = self._filter_events(
+                select(InternetEvent.date, InternetEvent.id), keyword, category,
+                event_type=event_type, heat=heat
+            )
+            if query.whereclause is not None:
+                row = self.session.execute(
+                    query.order_by(*keyset_order(InternetEvent)).offset(position - 1).limit(1)
+                ).first()
+                return encode_cursor(row.date, row.id) if row else encode_cursor(date.min, '')
+            
+            days = self.session.execute(
+                select(DailyEventStats.date, DailyEventStats.event_count).order_by(DailyEventStats.date.desc())
+            ).all()
+            
+            located = locate_position(days, position)
+            if located is None:
+                # 超出末尾：返回早于所有日期的游标（结果为空页）
+                return encode_cursor(date.min, '')
+            
+            day, offset = located
+            if offset == 0:
+                # 当天第一条之前：严格早于次日的位置
+                return encode_cursor(day + timedelta(days=1), '')
+            
+            previous_id = self.session.execute(
+                select(InternetEvent.id)
+                .where(InternetEvent.date == day)
+                .order_by(InternetEvent.id.desc())
+                .offset(offset - 1)
+                .limit(1)
+            ).scalar()
+            return encode_cursor(day, previous_id)
+        except Exception as e:
+            print(f"定位分页游标失败: {e}")
+            return None
+    
+    def get_events_page(self, cursor=None, page_size=50, keyword=None, category=None, descending=True,
+                        event_type=None, heat=None):
+        """按 (date, id) 游标分页获取事件，返回 EventPage(items, next_cursor)
+        
+        cursor 为上一页返回的 next_cursor，首页传 None；
+        深度翻页只做索引范围查找，不使用 OFFSET。
+        """
+        if not self.session and not self.connect():
+            return EventPage([], None)
+        
+        try:
+            query = self.session.query(InternetEvent).options(
+                *[defer(column) for column in DEFERRED_LIST_COLUMNS]
+            )
+            query = self._filter_events(query, keyword, category, event_type=event_type, heat=heat)
+            
+            if cursor:
+                query = query.filter(keyset_filter(InternetEvent, cursor, descending))
+            
+            # 多取一条用于判断是否还有下一页
+            rows = query.order_by(*keyset_order(InternetEvent, descending)).limit(page_size + 1).all()
+            return make_page(rows, page_size)
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"分页获取事件失败: {e}")
+            return EventPage([], None)
+    
+    def get_event_rows_page(self, cursor=None, page_size=50, keyword=None, category=None, descending=True,
+                            event_type=None, heat=None):
+        """与 get_events_page 相同的游标分页，但只查询列表列，返回 EventListRow 组成的 EventPage"""
+        if not self.session and not self.connect():
+            return EventPage([], None)
+        
+        try:
+            params = dict(
+                self._filter_params(keyword, category, event_type, heat),
+                cursor=cursor, page_size=page_size, descending=descending
+            )
+            return self.query_cache.get_or_load(
+                'event_rows_page', params,
+                lambda: self._load_event_rows_page(
+                    cursor, page_size, keyword, category, descending, event_type, heat
+                ),
+                all_dates=True
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"分页获取事件列表失败: {e}")
+            return EventPage([], None)
+    
+    def _load_event_rows_page(self, cursor, page_size, keyword, category, descending, event_type=None, heat=None):
+        query = self._filter_events(
+            select(*LIST_COLUMNS), keyword, category, event_type=event_type, heat=heat
+        )
+        
+        if cursor:
+            query = query.where(keyset_filter(InternetEvent, cursor, descending))
+        
+        # 多取一条用于判断是否还有下一页
+        rows = self.session.execute(
+            query.order_by(*keyset_order(InternetEvent, descending)).limit(page_size + 1)
+        )
+        return make_page([make_list_row(row) for row in rows], page_size)
+    
     def _get_events_safe(self):
         """安全的事件查询 - 使用原始 SQL 只查询基本字段"""
         try:
@@ -161,12 +438,7 @@ class DatabaseManager:
             
             result = self.session.execute(sql)
             
-            events = []
-            for row in result:
-                event = self._create_safe_event(row)
-                events.append(event)
-            
-            return events
+            return [self._create_safe_event(row) for row in result]
         except Exception as e:
             print(f"安全查询失败: {e}")
             return []
@@ -198,71 +470,48 @@ class DatabaseManager:
                 'end_date': end_date
             })
             
-            events = []
-            for row in result:
-                event = self._create_safe_event(row)
-                events.append(event)
-            
-            return events
+            return [self._create_safe_event(row) for row in result]
         except Exception as e:
             print(f"安全日期范围查询失败: {e}")
             return []
     
     def _create_safe_event(self, row):
         """创建安全事件对象"""
-        event = type('SafeEvent', (), {})()
-        event.id = row[0]
-        event.date = row[1]
-        event.title = row[2]
-        event.description = row[3] or ""
-        event.heat_score = row[4] if row[4] is not None else 50
-        
-        # 处理 JSON 字段
-        try:
-            import json
-            event.categories = json.loads(row[5]) if row[5] else []
-            event.keywords = json.loads(row[6]) if row[6] else []
-        except:
-            event.categories = []
-            event.keywords = []
-        
-        # 设置默认值
-        event.event_type = "meme"
-        event.sources = []
-        event.media_urls = []
-        event.heat_level = "medium"
-        event.has_literature = False
-        event.literature_path = None
-        
-        return event
-    
-    def search_events(self, keyword=None, category=None):
-        """搜索事件"""
+        return EventRecord.from_row(row)
+    
+    def search_events(self, keyword=None, category=None, tag=None, limit=SEARCH_RESULT_LIMIT):
+        """搜索事件 - 有关键词时走全文索引并按相关度排序，否则按日期倒序；最多返回 limit 条"""
         if not self.session and not self.connect():
             return []
         
         try:
-            query = self.session.query(InternetEvent)
+            clauses = []
+            if category and category.strip() and category != "全部":
+                clauses.append(category_clause(InternetEvent, category.strip()))
+            if tag and tag.strip():
+                clauses.append(tag_clause(InternetEvent, tag.strip()))
             
-            if keyword and keyword.strip():
-                keyword = keyword.strip()
-                query = query.filter(
+            keyword = keyword.strip() if keyword else None
+            if keyword:
+                results = ranked_search(self.session, keyword, clauses, limit)
+                if results is not None:
+                    return results
+                # 输入无法分词（如只有标点），按子串匹配
+                clauses.append(
                     InternetEvent.title.contains(keyword) |
                     InternetEvent.description.contains(keyword)
                 )
             
-            if category and category.strip() and category != "全部":
-                category = category.strip()
-                query = query.filter(InternetEvent.categories.contains([category]))
-            
-            results = query.order_by(InternetEvent.date.desc()).all()
-            return results
+            return self.session.query(InternetEvent).filter(*clauses).order_by(
+                InternetEvent.date.desc()
+            ).limit(limit).all()
             
         except Exception as e:
-            print(f"搜索事件失败: {e}")
-            return self._search_events_safe(keyword, category)
+            print(f"❌ 搜索事件失败，退回 LIKE 全表扫描（请检查全文索引）: {e}")
+            self.session.rollback()
+            return self._search_events_safe(keyword, category, limit)
     
-    def _search_events_safe(self, keyword=None, category=None):
+    def _search_events_safe(self, keyword=None, category=None, limit=SEARCH_RESULT_LIMIT):
         """安全搜索 - 使用原始 SQL"""
         try:
             sql = """
@@ -278,15 +527,13 @@ class DatabaseManager:
                 params['keyword'] = f'%{keyword}%'
             
             sql += " ORDER BY date DESC"
+            if limit:
+                sql += " LIMIT :limit"
+                params['limit'] = limit
             
             results = self.session.execute(text(sql), params)
             
-            events = []
-            for row in results:
-                event = self._create_safe_event(row)
-                events.append(event)
-            
-            return events
+            return [self._create_safe_event(row) for row in results]
         except Exception as e:
             print(f"安全搜索失败: {e}")
             return []
@@ -342,6 +589,7 @@ class DatabaseManager:
             self.session.add(new_event)
             self.session.commit()
             print(f"✅ 成功添加事件: {event_data['title']}")
+            self._notify_change([event_data['date']])
             return True, "添加成功"
         except Exception as e:
             error_msg = f"添加事件失败: {str(e)}"
@@ -350,6 +598,191 @@ class DatabaseManager:
                 self.session.rollback()
             return False, error_msg
     
+    # 批量导入时可写入的字段及新事件的默认值（与 add_event 一致）
+    _BULK_DEFAULTS = {
+        'description': '',
+        'event_type': 'meme',
+        'categories': [],
+        'keywords': [],
+        'heat_level': 'medium',
+        'heat_score': 50,
+        'sources': ['批量导入'],
+        'media_urls': [],
+        'has_literature': False,
+        'literature_path': None,
+        'meme_image_url': None,
+        'detailed_overview': None,
+        'figure_id': None
+    }
+    
+    def bulk_upsert_events(self, events, batch_size=500):
+        """批量写入或更新事件
+        
+        events 可以是任意可迭代对象（包括生成器），按 batch_size 分批流式处理，
+        内存占用与输入总量无关。已存在的 ID 执行更新（输入中缺失的字段保持原值），
+        新 ID 执行插入；缺少标题或日期的行计入 skipped。
+        
+        某一批写入失败时逐行重试，只跳过出错的行，其 ID 记入 failed_ids。
+        
+        返回 {'inserted': n, 'updated': n, 'skipped': n, 'failed_ids': [...]}
+        """
+        stats = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed_ids': []}
+        if not self.session and not self.connect():
+            return stats
+        
+        batch = {}
+        for raw in events:
+            row = self._prepare_bulk_row(raw)
+            if row is None:
+                stats['skipped'] += 1
+                continue
+            if row['id'] in batch:
+                stats['skipped'] += 1  # 同一批次内重复的 ID 以最后一条为准
+            batch[row['id']] = row
+            
+            if len(batch) >= batch_size:
+                self._upsert_batch(list(batch.values()), stats)
+                batch = {}
+        
+        if batch:
+            self._upsert_batch(list(batch.values()), stats)
+        
+        print(f"✅ 批量导入完成: 新增 {stats['inserted']}，更新 {stats['updated']}，跳过 {stats['skipped']}")
+        return stats
+    
+    def _prepare_bulk_row(self, raw):
+        """把输入字典整理为完整的列字典；无效行返回 None"""
+        title = raw.get('title')
+        if isinstance(title, str):
+            title = title.strip()
+        event_date = raw.get('date')
+        if not title or not event_date:
+            return None
+        
+        if isinstance(event_date, str):
+            try:
+                event_date = date.fromisoformat(event_date[:10])
+            except ValueError:
+                return None
+        elif isinstance(event_date, datetime):
+            event_date = event_date.date()
+        
+        row = {
+            'id': str(raw.get('id') or f"event_{uuid4().hex[:16]}"),
+            'date': event_date,
+            'title': title
+        }
+        # 缺失字段先置为 None：更新时保留原值，插入时再填默认值
+        for column in self._BULK_DEFAULTS:
+            row[column] = raw.get(column)
+        return row
+    
+    def _upsert_batch(self, rows, stats):
+        """写入一个批次并提交；整批失败时逐行重试，只跳过出错的行"""
+        try:
+            self._write_batch(rows, stats)
+        except Exception as e:
+            self.session.rollback()
+            if len(rows) == 1:
+                print(f"写入事件 {rows[0]['id']} 失败（已跳过）: {e}")
+                stats['skipped'] += 1
+                stats['failed_ids'].append(rows[0]['id'])
+                return
+            print(f"批量写入失败，本批 {len(rows)} 条改为逐行写入: {e}")
+            for row in rows:
+                self._upsert_batch([row], stats)
+    
+    def _write_batch(self, rows, stats):
+        """在一个事务中写入一批行并刷新派生数据"""
+        ids = [row['id'] for row in rows]
+        previous_dates = dict(self.session.execute(
+            select(InternetEvent.id, InternetEvent.date).where(InternetEvent.id.in_(ids))
+        ).all())
+        existing = set(previous_dates)
+        
+        now = datetime.now()
+        for row in rows:
+            row['updated_at'] = now
+            if row['id'] not in existing:
+                row['created_at'] = now
+                for column, default in self._BULK_DEFAULTS.items():
+                    if row[column] is None:
+                        row[column] = default
+            else:
+                row['created_at'] = None
+        
+        params = [{f"v_{column}": value for column, value in row.items()} for row in rows]
+        statement = self._build_upsert_statement()
+        if statement is not None:
+            self.session.execute(statement, params)
+        else:
+            self._insert_then_update(params, existing)
+        refresh_derived_data(self.session.connection(), ids, previous_dates.values())
+        self.session.commit()
+        
+        stats['inserted'] += len(rows) - len(existing)
+        stats['updated'] += len(existing)
+        self._notify_change({row['date'] for row in rows} | set(previous_dates.values()))
+    
+    def _bulk_bind_values(self):
+        """批量写入的列 -> 绑定参数（参数名为 v_列名）"""
+        table = InternetEvent.__table__
+        # JSON 列的 None 必须绑定为 SQL NULL（默认会序列化为 'null'），否则 COALESCE 无法保留原值
+        columns = ['id', 'date', 'title', *self._BULK_DEFAULTS, 'created_at', 'updated_at']
+        values = {}
+        for column in columns:
+            column_type = table.c[column].type
+            if isinstance(column_type, JSON):
+                column_type = JSON(none_as_null=True)
+            values[column] = bindparam(f"v_{column}", type_=column_type)
+        return values
+    
+    def _bulk_updates(self, incoming):
+        """已存在的行的更新值：输入为 NULL 的字段保留原值"""
+        table = InternetEvent.__table__
+        updates = {
+            column: func.coalesce(incoming[column], table.c[column])
+            for column in ['date', 'title', *self._BULK_DEFAULTS]
+        }
+        updates['updated_at'] = incoming['updated_at']
+        return updates
+    
+    def _build_upsert_statement(self):
+        """按数据库方言构造 INSERT ... ON DUPLICATE KEY UPDATE / ON CONFLICT 语句；不支持时返回 None"""
+        table = InternetEvent.__table__
+        dialect = self.session.get_bind().dialect.name
+        
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            return None
+        
+        stmt = insert(table).values(self._bulk_bind_values())
+        updates = self._bulk_updates(stmt.inserted if dialect == 'mysql' else stmt.excluded)
+        
+        if dialect == 'mysql':
+            return stmt.on_duplicate_key_update(updates)
+        return stmt.on_conflict_do_update(index_elements=[table.c.id], set_=updates)
+    
+    def _insert_then_update(self, params, existing):
+        """没有原生 upsert 语法的数据库：已存在的 ID 批量 UPDATE，其余批量 INSERT"""
+        table = InternetEvent.__table__
+        values = self._bulk_bind_values()
+        
+        new_rows = [row for row in params if row['v_id'] not in existing]
+        old_rows = [row for row in params if row['v_id'] in existing]
+        if new_rows:
+            self.session.execute(table.insert().values(values), new_rows)
+        if old_rows:
+            self.session.execute(
+                table.update().where(table.c.id == values['id']).values(self._bulk_updates(values)),
+                old_rows
+            )
+    
     def update_event(self, event_id, event_data):
         """更新事件"""
         if not self.session and not self.connect():
@@ -360,6 +793,7 @@ class DatabaseManager:
             if not event:
                 return False
             
+            previous_date = event.date
             for key, value in event_data.items():
                 if hasattr(event, key):
                     setattr(event, key, value)
@@ -367,6 +801,7 @@ class DatabaseManager:
             event.updated_at = datetime.now()
             self.session.commit()
             print(f"✅ 成功更新事件: {event_id}")
+            self._notify_change([previous_date, event.date])
             return True
         except Exception as e:
             print(f"更新事件失败: {e}")
@@ -392,9 +827,11 @@ class DatabaseManager:
                     except Exception as e:
                         print(f"删除文献文件失败: {e}")
                 
+                event_date = event.date
                 self.session.delete(event)
                 self.session.commit()
                 print(f"✅ 成功删除事件: {event_id}")
+                self._notify_change([event_date])
                 return True
             return False
         except Exception as e:
@@ -403,6 +840,152 @@ class DatabaseManager:
                 self.session.rollback()
             return False
     
+    def get_all_categories(self):
+        """获取所有分类及事件数（只扫描分类索引）"""
+        if not self.session and not self.connect():
+            return []
+        
+        try:
+            return self.query_cache.get_or_load('categories', {}, self._load_categories, all_dates=True)
+        except Exception as e:
+            print(f"获取分类列表失败: {e}")
+            return []
+    
+    def _load_categories(self):
+        rows = self.session.query(
+            EventCategory.category, func.count(EventCategory.event_id)
+        ).group_by(EventCategory.category).order_by(EventCategory.category).all()
+        return [(category, count) for category, count in rows]
+    
+    def get_facet_counts(self, keyword=None, category=None, event_type=None, heat=None, tag=None,
+                         start_date=None, end_date=None, dimensions=FACET_DIMENSIONS):
+        """在当前筛选条件下统计各分类/事件类型/热度区间的事件数：{维度: [(取值, 数量), ...]}
+        
+        所有维度用一条 UNION ALL 语句统计；每个维度不应用自身的条件，
+        数量即为改选该取值后的结果数。结果按筛选条件缓存。
+        """
+        if not self.session and not self.connect():
+            return {dimension: [] for dimension in dimensions}
+        
+        params = dict(
+            self._filter_params(keyword, category, event_type, heat),
+            tag=tag, start=start_date, end=end_date, dimensions=tuple(dimensions)
+        )
+        has_range = start_date is not None and end_date is not None
+        try:
+            facets = self.query_cache.get_or_load(
+                'facets', params,
+                lambda: self._load_facet_counts(keyword, category, event_type, heat, tag,
+                                                start_date, end_date, dimensions),
+                start_date=start_date, end_date=end_date, all_dates=not has_range
+            )
+            # 缓存中的列表不交给调用方修改
+            return {dimension: list(values) for dimension, values in facets.items()}
+        except Exception as e:
+            print(f"统计筛选项数量失败: {e}")
+            return {dimension: [] for dimension in dimensions}
+    
+    def _load_facet_counts(self, keyword, category, event_type, heat, tag, start_date, end_date, dimensions):
+        builder = advanced_search_builder(
+            keyword=keyword, category=None if category == "全部" else category,
+            start_date=start_date, end_date=end_date, event_type=event_type, tag=tag, limit=None
+        ).filter_by_heat_band(heat)
+        return builder.facet_counts(self.session.connection(), dimensions)
+    
+    def get_daily_stats(self, start_date, end_date):
+        """获取日期范围内每天的事件数、最高/平均热度和热度最高的事件 ID（按日期升序）"""
+        if not self.session and not self.connect():
+            return []
+        
+        try:
+            return self.query_cache.get_or_load(
+                'daily_stats', {'start': start_date, 'end': end_date},
+                lambda: self._load_daily_stats(start_date, end_date),
+                start_date=start_date, end_date=end_date
+            )
+        except Exception as e:
+            # 聚合表不可用时直接在事件表上分组统计
+            print(f"读取每日聚合失败，改用实时统计: {e}")
+            self.session.rollback()
+            try:
+                return self.session.execute(
+                    select(
+                        InternetEvent.date,
+                        func.count(InternetEvent.id).label('event_count'),
+                        func.max(InternetEvent.heat_score).label('max_heat'),
+                        func.avg(InternetEvent.heat_score).label('avg_heat'),
+                        null().label('top_event_id')
+                    ).where(
+                        InternetEvent.date >= start_date,
+                        InternetEvent.date <= end_date
+                    ).group_by(InternetEvent.date).order_by(InternetEvent.date)
+                ).all()
+            except Exception as e:
+                print(f"统计每日事件失败: {e}")
+                return []
+    
+    def _load_daily_stats(self, start_date, end_date):
+        return self.session.execute(
+            select(
+                DailyEventStats.date,
+                DailyEventStats.event_count,
+                DailyEventStats.max_heat,
+                DailyEventStats.avg_heat,
+                DailyEventStats.top_event_id
+            ).where(
+                DailyEventStats.date >= start_date,
+                DailyEventStats.date <= end_date
+            ).order_by(DailyEventStats.date)
+        ).all()
+    
+    def rebuild_daily_stats(self):
+        """全量重建每日事件聚合表"""
+        if not self.session and not self.connect():
+            return 0
+        
+        try:
+            days = _rebuild_daily_stats(self.session.connection())
+            self.session.commit()
+            print(f"✅ 已重建 {days} 天的事件聚合")
+            self._notify_change()
+            return days
+        except Exception as e:
+            print(f"重建每日事件聚合失败: {e}")
+            self.session.rollback()
+            return 0
+    
+    def backfill_associations(self):
+        """根据 JSON 列重建分类/关键词关联表"""
+        if not self.session and not self.connect():
+            return 0
+        
+        try:
+            count = backfill_event_associations(self.session.connection())
+            self.session.commit()
+            print(f"✅ 已回填 {count} 个事件的分类/关键词关联")
+            self._notify_change()
+            return count
+        except Exception as e:
+            print(f"回填分类/关键词关联失败: {e}")
+            self.session.rollback()
+            return 0
+    
+    def rebuild_search_index(self):
+        """重建全文检索索引"""
+        if not self.session and not self.connect():
+            return False
+        
+        try:
+            get_search_backend(self.session.connection()).rebuild(self.session.connection())
+            self.session.commit()
+            print("✅ 全文检索索引重建完成")
+            self._notify_change()
+            return True
+        except Exception as e:
+            print(f"重建全文检索索引失败: {e}")
+            self.session.rollback()
+            return False
+    
     def check_database_health(self):
         """检查数据库健康状态"""
         try:
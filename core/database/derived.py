@@ -0,0 +1,41 @@
+"""
+派生数据批量刷新
+
+ORM 写入通过映射器事件同步全文索引、分类/关键词关联表和修订号；
+批量导入等 Core 级写入不会触发映射器事件，需要在写入后调用这里的函数。
+"""
+
+from sqlalchemy import select
+
+from .models import InternetEvent
+from .associations import sync_many_event_associations
+from .daily_stats import refresh_daily_stats
+from .revisions import bump_revision
+from .search_index import get_search_backend
+
+
+def refresh_derived_data(conn, event_ids, previous_dates=()):
+    """按数据库中的最新内容刷新指定事件的派生数据
+
+    previous_dates 为写入前这些事件所在的日期，日期被修改时旧日期的聚合也需要刷新。
+    """
+    if not event_ids:
+        return
+
+    rows = conn.execute(
+        select(
+            InternetEvent.id,
+            InternetEvent.date,
+            InternetEvent.title,
+            InternetEvent.description,
+            InternetEvent.categories,
+            InternetEvent.keywords
+        ).where(InternetEvent.id.in_(list(event_ids)))
+    ).all()
+
+    sync_many_event_associations(conn, [(row.id, row.categories, row.keywords) for row in rows])
+    get_search_backend(conn).index_events(
+        conn, [(row.id, row.title, row.description, row.keywords) for row in rows]
+    )
+    refresh_daily_stats(conn, {row.date for row in rows} | set(previous_dates))
+    bump_revision(conn)
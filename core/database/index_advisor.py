@@ -0,0 +1,220 @@
+"""
+索引建议 - 对 build_advanced_search 能生成的各种查询形状执行 EXPLAIN
+
+枚举 日期/关键词/分类/标签/事件类型/热度 筛选条件的组合与 日期/热度 排序，
+在 MySQL（EXPLAIN）或 SQLite（EXPLAIN QUERY PLAN）上检查 internet_events 是否全表扫描、
+是否需要额外排序（filesort / 临时 B 树），按 等值列 → 排序列 → 范围列 的顺序提出复合索引，
+并可生成使用 create_indexes 的迁移代码。
+"""
+
+from datetime import date
+from itertools import combinations
+
+from sqlalchemy import Index, MetaData, inspect
+
+from .models import InternetEvent
+from .query_builder import advanced_search_builder
+
+# 每种筛选条件对应的 build_advanced_search 参数（EXPLAIN 只关心条件形状，取值不影响计划）
+FILTER_SAMPLES = {
+    "date": {"start_date": date(2024, 1, 1), "end_date": date(2024, 12, 31)},
+    "keyword": {"keyword": "抽象"},
+    "category": {"category": "网络梗"},
+    "tag": {"tag": "抽象"},
+    "event_type": {"event_type": "meme"},
+    "heat": {"min_heat": 50},
+}
+
+ORDER_COLUMNS = {"date": "date", "heat": "heat_score"}
+
+# 筛选条件在 internet_events 上对应的列：等值条件放在索引前部，范围条件放在排序列之后
+EQUALITY_COLUMNS = {"event_type": "event_type"}
+RANGE_COLUMNS = {"date": "date", "heat": "heat_score"}
+# 这些条件是 id IN (子查询)：先走全文索引/关联表索引得到少量事件再按主键查找，排序开销小，不再建议索引
+SUBQUERY_FILTERS = {"keyword", "category", "tag"}
+
+
+def iter_query_shapes(max_filters=None):
+    """枚举 (筛选条件组合, 排序方式)"""
+    names = list(FILTER_SAMPLES)
+    max_filters = len(names) if max_filters is None else max_filters
+    for size in range(max_filters + 1):
+        for filters in combinations(names, size):
+            for order_by in ORDER_COLUMNS:
+                yield filters, order_by
+
+
+def build_shape_statement(conn, filters, order_by, limit=100):
+    """返回 (语句, 绑定参数)"""
+    params = {}
+    for name in filters:
+        params.update(FILTER_SAMPLES[name])
+    return advanced_search_builder(order_by=order_by, limit=limit, **params).build_statement(conn)
+
+
+def explain(conn, statement, params):
+    """执行 EXPLAIN，返回 (计划描述行列表, 是否全表扫描, 是否额外排序)"""
+    # 展开 IN 列表和 LIMIT 等执行时才渲染的参数
+    state = statement.compile(dialect=conn.dialect).construct_expanded_state(params)
+    sql = state.statement
+    if state.positiontup is not None:
+        parameters = tuple(state.parameters[name] for name in state.positiontup)
+    else:
+        parameters = state.parameters
+
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parameters).all()
+        details = [row[-1] for row in rows]
+        full_scan = any(d.startswith("SCAN internet_events") and "INDEX" not in d for d in details)
+        filesort = any("TEMP B-TREE FOR ORDER BY" in d for d in details)
+        return details, full_scan, filesort
+
+    result = conn.exec_driver_sql("EXPLAIN " + sql, parameters)
+    rows = [dict(zip(result.keys(), row)) for row in result]
+    details = [
+        f"{row.get('table')}: type={row.get('type')} key={row.get('key')} "
+        f"rows={row.get('rows')} extra={row.get('Extra') or ''}"
+        for row in rows
+    ]
+    events_rows = [row for row in rows if row.get("table") in ("internet_events", "anon_1")]
+    full_scan = any(row.get("type") == "ALL" for row in events_rows)
+    filesort = any("filesort" in (row.get("Extra") or "") for row in rows)
+    return details, full_scan, filesort
+
+
+def suggest_columns(filters, order_by):
+    """为查询形状提出复合索引列：等值列 → 排序列 → 其余范围列；由子查询条件驱动的形状返回 None"""
+    if SUBQUERY_FILTERS.intersection(filters):
+        return None
+    columns = [EQUALITY_COLUMNS[name] for name in filters if name in EQUALITY_COLUMNS]
+    order_column = ORDER_COLUMNS[order_by]
+    columns.append(order_column)
+    columns += [
+        RANGE_COLUMNS[name] for name in filters
+        if name in RANGE_COLUMNS and RANGE_COLUMNS[name] != order_column
+    ]
+    return tuple(columns)
+
+
+def existing_index_columns(conn, table_name="internet_events"):
+    """表上已有索引（含主键）的列元组"""
+    inspector = inspect(conn)
+    indexes = [tuple(index["column_names"]) for index in inspector.get_indexes(table_name)]
+    primary_key = inspector.get_pk_constraint(table_name).get("constrained_columns")
+    if primary_key:
+        indexes.append(tuple(primary_key))
+    return indexes
+
+
+def _is_covered(columns, indexes):
+    return any(index[:len(columns)] == columns for index in indexes)
+
+
+def analyze(session, max_filters=None):
+    """对所有查询形状执行 EXPLAIN，返回结果列表"""
+    return _analyze(session.connection(), max_filters)
+
+
+def _analyze(conn, max_filters=None):
+    indexes = existing_index_columns(conn)
+    results = []
+    for filters, order_by in iter_query_shapes(max_filters):
+        details, full_scan, filesort = explain(conn, *build_shape_statement(conn, filters, order_by))
+        columns = suggest_columns(filters, order_by)
+        results.append({
+            "filters": filters,
+            "order_by": order_by,
+            "plan": details,
+            "full_scan": full_scan,
+            "filesort": filesort,
+            # 子查询条件已把结果缩小到少量行，对这些行排序不算问题
+            "problem": full_scan or (filesort and not SUBQUERY_FILTERS.intersection(filters)),
+            "suggestion": None if columns is None or _is_covered(columns, indexes) else columns
+        })
+    return results
+
+
+def recommend(results):
+    """汇总有问题的查询形状给出的建议：[(列元组, 受益的查询形状数), ...]，按受益数倒序"""
+    counts = {}
+    for result in results:
+        if result["problem"] and result["suggestion"]:
+            counts[result["suggestion"]] = counts.get(result["suggestion"], 0) + 1
+
+    # 以等值列开头的索引会被优化器优先选用，同一等值条件按其他方式排序的查询也需要对应的索引，
+    # 否则原本沿日期索引顺序读取的查询会退化为额外排序
+    equality = set(EQUALITY_COLUMNS.values())
+    prefixes = {_equality_prefix(columns, equality) for columns in counts} - {()}
+    for result in results:
+        columns = result["suggestion"]
+        if columns and not result["problem"] and _equality_prefix(columns, equality) in prefixes:
+            counts.setdefault(columns, 0)
+
+    # 前缀相同的建议合并到最长的那个索引上
+    merged = {}
+    for columns, count in sorted(counts.items(), key=lambda item: -len(item[0])):
+        target = next((longer for longer in merged if longer[:len(columns)] == columns), columns)
+        merged[target] = merged.get(target, 0) + count
+    return sorted(merged.items(), key=lambda item: item[1], reverse=True)
+
+
+def _equality_prefix(columns, equality):
+    prefix = []
+    for column in columns:
+        if column not in equality:
+            break
+        prefix.append(column)
+    return tuple(prefix)
+
+
+def index_name(columns, table_name="internet_events"):
+    return f"ix_{table_name}_{'_'.join(columns)}"
+
+
+def make_indexes(recommendations, table=None):
+    """把建议转换为 Index 对象；table 默认为 InternetEvent 的表（Index 会加入该表的定义）"""
+    table = InternetEvent.__table__ if table is None else table
+    return [
+        Index(index_name(columns), *[table.c[column] for column in columns])
+        for columns, _ in recommendations
+    ]
+
+
+def migration_snippet(recommendations, version, name="internet_events_filter_indexes"):
+    """生成迁移代码：InternetEvent.__table_args__ 中的索引声明，以及追加到 MIGRATIONS 末尾的步骤"""
+    lines = ["# models.py - InternetEvent.__table_args__"]
+    for columns, _ in recommendations:
+        column_args = ", ".join(f"'{column}'" for column in columns)
+        lines.append(f"        Index('{index_name(columns)}', {column_args}),")
+    lines.append("")
+    lines.append("# migrations.py - MIGRATIONS")
+    lines.append(f'    Migration({version}, "{name}", create_indexes(')
+    for columns, _ in recommendations:
+        lines.append(f"        _model_index(InternetEvent, '{index_name(columns)}'),")
+    lines.append("    )),")
+    return "\n".join(lines)
+
+
+def verify(session, recommendations, max_filters=None):
+    """SQLite：临时创建建议的索引并重新 EXPLAIN，返回 (之前有问题的形状数, 之后的数量)
+
+    在另开的连接上的事务中建索引，检查结束后回滚，不提交也不影响 session 中未提交的修改；
+    索引建在表定义的副本上，InternetEvent 的表定义保持不变。
+    MySQL 上建索引会锁表且耗时较长（DDL 也无法回滚），不在这里验证。
+    """
+    engine = session.get_bind()
+    if engine.dialect.name != "sqlite":
+        raise ValueError("只支持在 SQLite 上验证索引")
+
+    table = InternetEvent.__table__.to_metadata(MetaData())
+    with engine.connect() as conn:
+        # pysqlite 不会在 DDL 前自动开启事务，显式 BEGIN 后 CREATE INDEX 才能回滚
+        conn.exec_driver_sql("BEGIN")
+        try:
+            before = sum(1 for r in _analyze(conn, max_filters) if r["problem"])
+            for index in make_indexes(recommendations, table):
+                index.create(conn, checkfirst=True)
+            after = sum(1 for r in _analyze(conn, max_filters) if r["problem"])
+        finally:
+            conn.rollback()
+    return before, after
@@ -0,0 +1,318 @@
+"""
+查询耗时统计 - 在 Engine 的游标执行事件上计时
+
+每条 SQL 记录耗时和发起查询的 DatabaseManager 方法（不在被跟踪方法中执行的语句，
+如启动和迁移，归属于调用栈上最近的项目函数），进程内按方法汇总；
+超过阈值的语句以 JSON Lines 写入慢查询日志，scripts/query_report.py 读取日志生成报告。
+
+写入语句记录影响的行数（affected_rows）；查询语句记录实际读取的行数（rows_returned），
+用于发现取回过多数据的查询。计时结束时结果还未读取，因此查询语句的统计和日志
+推迟到结果读完或关闭时写入。
+"""
+
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from datetime import datetime
+
+from sqlalchemy import event
+
+from config.settings import QUERY_LOG_CONFIG
+
+# 当前正在执行的 DatabaseManager 方法（最外层调用）
+_current_method = ContextVar('db_method', default=None)
+
+# 可重入：未读完的结果可能在持有锁时被垃圾回收，回收时同样要写入统计和日志
+_stats_lock = threading.RLock()
+_file_lock = threading.RLock()
+_method_stats = {}
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _caller_name():
+    """调用栈上最近的项目代码函数（跳过 SQLAlchemy、第三方包和本模块），找不到时为 unknown"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(_PROJECT_ROOT) and "site-packages" not in filename
+                and os.path.abspath(filename) != os.path.abspath(__file__)):
+            return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def current_method():
+    return _current_method.get() or _caller_name()
+
+
+def track_method(name):
+    """装饰器：方法执行期间发出的 SQL 归属于 name；嵌套调用时保留最外层的方法名"""
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                generator = func(*args, **kwargs)
+                try:
+                    while True:
+                        # 生成器每次恢复执行时设置，暂停时还原
+                        token = _current_method.set(_current_method.get() or name)
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                        finally:
+                            _current_method.reset(token)
+                        yield item
+                finally:
+                    generator.close()
+            return generator_wrapper
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def async_generator_wrapper(*args, **kwargs):
+                generator = func(*args, **kwargs)
+                try:
+                    while True:
+                        token = _current_method.set(_current_method.get() or name)
+                        try:
+                            item = await generator.__anext__()
+                        except StopAsyncIteration:
+                            return
+                        finally:
+                            _current_method.reset(token)
+                        yield item
+                finally:
+                    await generator.aclose()
+            return async_generator_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def coroutine_wrapper(*args, **kwargs):
+                if _current_method.get() is not None:
+                    return await func(*args, **kwargs)
+                token = _current_method.set(name)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _current_method.reset(token)
+            return coroutine_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_method.get() is not None:
+                return func(*args, **kwargs)
+            token = _current_method.set(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _current_method.reset(token)
+        return wrapper
+    return decorator
+
+
+def track_public_methods(cls):
+    """类装饰器：为所有公开方法加上 track_method"""
+    for name, value in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(value):
+            setattr(cls, name, track_method(f"{cls.__name__}.{name}")(value))
+    return cls
+
+
+def install_query_instrumentation(engine):
+    """在 Engine 上注册计时事件（每个 Engine 注册一次）"""
+    if not QUERY_LOG_CONFIG.get("enabled", True):
+        return
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "after_execute", _after_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_start_time")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    # 只有写入语句的 rowcount 可靠（查询结果此时还未读取）
+    affected_rows = None
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            affected_rows = cursor.rowcount
+    method = current_method()
+
+    with _stats_lock:
+        stats = _method_stats.get(method)
+        if stats is None:
+            stats = _method_stats[method] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0, "rows": 0}
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        slow = elapsed_ms >= QUERY_LOG_CONFIG.get("slow_ms", 100)
+        if slow:
+            stats["slow"] += 1
+
+    record = None
+    if slow or QUERY_LOG_CONFIG.get("log_all", False):
+        record = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "method": method,
+            "thread": threading.current_thread().name,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "affected_rows": affected_rows,
+            "rows_returned": None,
+            "slow": slow,
+            "executemany": executemany,
+            "statement": " ".join(statement.split())[:2000],
+            "parameters": repr(parameters)[:500]
+        }
+
+    # 返回结果集的语句：行数在结果读完或关闭时写入（见 _after_execute）；
+    # 结果没有经过 _after_execute 包装（如 exec_driver_sql）时，在执行上下文回收时写入，行数记为未知
+    if context is not None and cursor.description is not None:
+        counter = context._query_row_counter = _RowCounter(method, record)
+        weakref.finalize(context, counter.report)
+    elif record is not None:
+        _write_log(record)
+
+
+def _after_execute(conn, clauseelement, multiparams, params, execution_options, result):
+    counter = getattr(result.context, "_query_row_counter", None)
+    if counter is not None:
+        counter.counted = True
+        result.cursor_strategy = _RowCountingFetchStrategy(result.cursor_strategy, counter)
+
+
+class _RowCounter:
+    """一条查询语句读取的行数，结果读完或关闭时计入方法统计并写入日志（只写一次）"""
+
+    def __init__(self, method, record):
+        self.method = method
+        self.record = record
+        self.rows = 0
+        self.counted = False
+        self.reported = False
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        if self.counted:
+            with _stats_lock:
+                stats = _method_stats.get(self.method)
+                if stats is not None:
+                    stats["rows"] += self.rows
+        if self.record is not None:
+            self.record["rows_returned"] = self.rows if self.counted else None
+            _write_log(self.record)
+
+
+class _RowCountingFetchStrategy:
+    """包装 CursorResult 的取数策略，累计实际读取的行数
+
+    读完最后一行时 SQLAlchemy 在取数调用内部就关闭结果，因此关闭时只做标记，
+    等本次取回的行计入后再上报。yield_per() 会替换内部策略，替换后重新包装。
+    """
+
+    def __init__(self, inner, counter):
+        self._inner = inner
+        self._counter = counter
+        self._fetching = False
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def fetchone(self, result, dbapi_cursor, hard_close=False):
+        self._fetching = True
+        try:
+            row = self._inner.fetchone(result, dbapi_cursor, hard_close)
+            if row is not None:
+                self._counter.rows += 1
+            return row
+        finally:
+            self._fetched()
+
+    def fetchmany(self, result, dbapi_cursor, size=None):
+        self._fetching = True
+        try:
+            rows = self._inner.fetchmany(result, dbapi_cursor, size)
+            self._counter.rows += len(rows)
+            return rows
+        finally:
+            self._fetched()
+
+    def fetchall(self, result, dbapi_cursor):
+        self._fetching = True
+        try:
+            rows = self._inner.fetchall(result, dbapi_cursor)
+            self._counter.rows += len(rows)
+            return rows
+        finally:
+            self._fetched()
+
+    def yield_per(self, result, dbapi_cursor, num):
+        self._inner.yield_per(result, dbapi_cursor, num)
+        if result.cursor_strategy is not self:
+            self._inner = result.cursor_strategy
+            result.cursor_strategy = self
+
+    def soft_close(self, result, dbapi_cursor):
+        self._inner.soft_close(result, dbapi_cursor)
+        self._close()
+
+    def hard_close(self, result, dbapi_cursor):
+        self._inner.hard_close(result, dbapi_cursor)
+        self._close()
+
+    def _close(self):
+        self._closed = True
+        if not self._fetching:
+            self._counter.report()
+
+    def _fetched(self):
+        self._fetching = False
+        if self._closed:
+            self._counter.report()
+
+
+def _write_log(record):
+    path = QUERY_LOG_CONFIG.get("path")
+    if not path:
+        return
+    try:
+        line = json.dumps(record, ensure_ascii=False)
+        with _file_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except Exception as e:
+        print(f"写入慢查询日志失败: {e}")
+
+
+def get_query_stats():
+    """按方法汇总的查询耗时，按总耗时倒序：[(方法, {calls, total_ms, avg_ms, max_ms, slow, rows}), ...]
+
+    rows 为查询语句实际读取的行数之和。
+    """
+    with _stats_lock:
+        items = [(method, dict(stats)) for method, stats in _method_stats.items()]
+    for _, stats in items:
+        stats["avg_ms"] = stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0
+    return sorted(items, key=lambda item: item[1]["total_ms"], reverse=True)
+
+
+def reset_query_stats():
+    with _stats_lock:
+        _method_stats.clear()
@@ -0,0 +1,169 @@
+"""
+数据库迁移 - 基于 schema_version 表的版本化迁移
+
+每个迁移步骤只执行一次，执行后在 schema_version 表中记录版本号。
+表结构已是最新时，启动只需一次主键上的 MAX(version) 查询。
+"""
+
+import threading
+from datetime import datetime
+
+from sqlalchemy import inspect, text, select, insert, func
+
+from .search_index import create_search_index, update_search_schema
+from .associations import create_association_tables
+from .daily_stats import create_daily_stats_table
+from .revisions import create_revisions_table
+from .models import (
+    Base,
+    SchemaVersion,
+    InternetEvent,
+    PantheonFigure,
+    HistoricalArtifact,
+    FigureTimeline,
+    HistoricalEvent
+)
+
+# 已确认为最新版本的数据库（进程内缓存，避免重复检查）
+_current_databases = set()
+_migration_lock = threading.Lock()
+
+
+class Migration:
+    """单个迁移步骤"""
+
+    def __init__(self, version, name, upgrade):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade  # upgrade(connection)
+
+    def __repr__(self):
+        return f"<Migration {self.version}: {self.name}>"
+
+
+def _create_base_tables(conn):
+    """创建五张业务表（已存在则跳过）"""
+    tables = [
+        PantheonFigure.__table__,
+        InternetEvent.__table__,
+        HistoricalArtifact.__table__,
+        FigureTimeline.__table__,
+        HistoricalEvent.__table__
+    ]
+    Base.metadata.create_all(conn, tables=tables, checkfirst=True)
+
+
+def add_missing_columns(table_name):
+    """生成迁移函数：为旧表补齐模型中新增的列"""
+    def upgrade(conn):
+        table = Base.metadata.tables[table_name]
+        existing = {col['name'] for col in inspect(conn).get_columns(table_name)}
+
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            column_type = column.type.compile(dialect=conn.dialect)
+            print(f"➕ 添加缺失列: {table_name}.{column.name}")
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}"))
+
+            # 用模型中的标量默认值回填已有数据
+            default = column.default
+            if default is not None and default.is_scalar:
+                conn.execute(
+                    text(f"UPDATE {table_name} SET {column.name} = :value WHERE {column.name} IS NULL"),
+                    {"value": default.arg}
+                )
+
+    return upgrade
+
+
+def create_indexes(*indexes):
+    """生成迁移函数：创建索引（已存在则跳过）"""
+    def upgrade(conn):
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+
+    return upgrade
+
+
+def _model_index(model, name):
+    """按名称取模型 __table_args__ 中声明的索引"""
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+# 迁移步骤（按版本号顺序执行，新增步骤只能追加在末尾）
+MIGRATIONS = [
+    Migration(1, "create_base_tables", _create_base_tables),
+    Migration(2, "internet_events_columns", add_missing_columns("internet_events")),
+    Migration(3, "pantheon_figures_columns", add_missing_columns("pantheon_figures")),
+    Migration(4, "historical_artifacts_columns", add_missing_columns("historical_artifacts")),
+    Migration(5, "figure_timelines_columns", add_missing_columns("figure_timelines")),
+    Migration(6, "historical_events_columns", add_missing_columns("historical_events")),
+    Migration(7, "internet_events_date_id_index", create_indexes(
+        _model_index(InternetEvent, 'ix_internet_events_date_id')
+    )),
+    Migration(8, "internet_events_search_index", create_search_index),
+    Migration(9, "event_category_keyword_tables", create_association_tables),
+    Migration(10, "daily_event_stats", create_daily_stats_table),
+    Migration(11, "search_index_doc_lookup", update_search_schema),
+    Migration(12, "change_column_indexes", create_indexes(
+        _model_index(InternetEvent, 'ix_internet_events_updated_at_id'),
+        _model_index(PantheonFigure, 'ix_pantheon_figures_updated_at_id'),
+        _model_index(HistoricalArtifact, 'ix_historical_artifacts_created_at_id'),
+        _model_index(FigureTimeline, 'ix_figure_timelines_created_at_id'),
+        _model_index(HistoricalEvent, 'ix_historical_events_updated_at_id'),
+    )),
+    Migration(13, "table_revisions", create_revisions_table),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn):
+    """读取当前版本号；schema_version 表不存在时返回 None"""
+    try:
+        version = conn.execute(select(func.max(SchemaVersion.version))).scalar()
+        return version or 0
+    except Exception:
+        return None
+
+
+def run_migrations(engine, force=False):
+    """执行所有未应用的迁移，返回最终版本号"""
+    database_key = str(engine.url)
+    if not force and database_key in _current_databases:
+        return LATEST_VERSION
+
+    with _migration_lock:
+        if not force and database_key in _current_databases:
+            return LATEST_VERSION
+
+        # 快速路径：一次主键查询确认版本
+        with engine.connect() as conn:
+            version = get_schema_version(conn)
+
+        if version is not None and version >= LATEST_VERSION:
+            _current_databases.add(database_key)
+            return version
+
+        with engine.begin() as conn:
+            SchemaVersion.__table__.create(conn, checkfirst=True)
+            version = get_schema_version(conn) or 0
+
+        pending = [m for m in MIGRATIONS if m.version > version]
+        print(f"🔄 数据库版本 {version}，待执行迁移 {len(pending)} 个")
+
+        for migration in pending:
+            # 每个迁移单独提交（MySQL 的 DDL 会隐式提交）
+            with engine.begin() as conn:
+                migration.upgrade(conn)
+                conn.execute(insert(SchemaVersion).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now()
+                ))
+            print(f"✅ 已应用迁移 {migration.version}: {migration.name}")
+
+        _current_databases.add(database_key)
+        return LATEST_VERSION
@@ -0,0 +1,208 @@
+"""
+本地 SQLite 镜像 - 从 MySQL 增量同步五张业务表
+
+每张表在镜像库的 mirror_watermarks 中记录已同步到的 (变更时间, id)；
+每次只按 (updated_at, id) 顺序读取水位之后的行（没有 updated_at 的表按 created_at），
+分批 upsert 到镜像库并在每批提交后推进水位，中断后再次同步会从断点继续。
+上次同步时可能尚未提交的行（变更时间在上次读取前 overlap 秒内）会在下次同步开始时重新读取
+（upsert 可重复执行），避免遗漏时间戳较早、提交较晚的行。
+事件表同步后在镜像库中刷新分类/关键词关联、全文索引和每日聚合。
+
+源库中删除的行不会被同步（没有变更记录可读），需要时用 reset 清空镜像表和水位后全量重同步。
+源库上的 (updated_at, id) / (created_at, id) 索引（迁移 12）使每批读取只做索引范围扫描。
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import MetaData, Table, Column, String, DateTime, select, func, and_, or_
+from sqlalchemy.dialects.sqlite import insert
+
+from .models import (
+    InternetEvent, PantheonFigure, HistoricalArtifact, FigureTimeline, HistoricalEvent,
+    EventCategory, EventKeyword, DailyEventStats, get_engine
+)
+from .migrations import run_migrations
+from .derived import refresh_derived_data
+from .search_index import get_search_backend
+
+# 同步顺序：被外键引用的人物表在前
+MIRROR_MODELS = (PantheonFigure, InternetEvent, HistoricalArtifact, FigureTimeline, HistoricalEvent)
+
+# 水位表只存在于镜像库中，不属于业务表结构
+_metadata = MetaData()
+mirror_watermarks = Table(
+    "mirror_watermarks", _metadata,
+    Column("table_name", String(64), primary_key=True),
+    Column("changed_at", DateTime),  # 已同步的最后一行的变更时间
+    Column("last_id", String(64)),  # 同一变更时间内已同步的最后一个 id
+    Column("synced_at", DateTime)  # 读取这一批时的本地时间
+)
+
+
+def change_column(table):
+    """表的变更时间列：优先 updated_at，没有时用 created_at"""
+    return table.c.updated_at if "updated_at" in table.c else table.c.created_at
+
+
+def get_watermark(conn, table_name):
+    """返回 (变更时间, id, 同步时间)；从未同步过时返回 None"""
+    row = conn.execute(
+        select(mirror_watermarks.c.changed_at, mirror_watermarks.c.last_id, mirror_watermarks.c.synced_at)
+        .where(mirror_watermarks.c.table_name == table_name)
+    ).first()
+    return tuple(row) if row else None
+
+
+def set_watermark(conn, table_name, changed_at, last_id, synced_at):
+    statement = insert(mirror_watermarks).values(
+        table_name=table_name, changed_at=changed_at, last_id=last_id, synced_at=synced_at
+    )
+    conn.execute(statement.on_conflict_do_update(
+        index_elements=[mirror_watermarks.c.table_name],
+        set_={
+            "changed_at": statement.excluded.changed_at,
+            "last_id": statement.excluded.last_id,
+            "synced_at": statement.excluded.synced_at
+        }
+    ))
+
+
+def _after_watermark(table, watermark):
+    """水位之后的行：(变更时间, id) 严格大于水位；变更时间为空的行排在最前"""
+    changed, key = change_column(table), table.c.id
+    changed_at, last_id = watermark[:2]
+    if changed_at is None:
+        return or_(and_(changed.is_(None), key > last_id), changed.isnot(None))
+    return or_(changed > changed_at, and_(changed == changed_at, key > last_id))
+
+
+def _upsert_statement(table):
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key.columns],
+        set_={column.name: statement.excluded[column.name] for column in table.columns if not column.primary_key}
+    )
+
+
+class MirrorSync:
+    """把源库（MySQL）的业务表增量同步到 SQLite 镜像库"""
+
+    def __init__(self, source_url, mirror_url, batch_size=1000, overlap_seconds=5):
+        if not mirror_url.startswith("sqlite"):
+            raise ValueError("镜像库必须是 SQLite")
+        self.source_engine = get_engine(source_url)
+        self.mirror_engine = get_engine(mirror_url)
+        self.batch_size = batch_size
+        self.overlap = timedelta(seconds=overlap_seconds)
+
+    @classmethod
+    def from_config(cls, source_url=None, mirror_url=None):
+        """按 settings.MIRROR_CONFIG 创建；源库默认为 MySQL"""
+        from config.settings import DATABASE_URL, MIRROR_CONFIG
+        return cls(
+            source_url or DATABASE_URL,
+            mirror_url or MIRROR_CONFIG["url"],
+            batch_size=MIRROR_CONFIG.get("batch_size", 1000),
+            overlap_seconds=MIRROR_CONFIG.get("overlap_seconds", 5)
+        )
+
+    def prepare(self):
+        """在镜像库中创建业务表（含派生表和全文索引）和水位表"""
+        run_migrations(self.mirror_engine)
+        _metadata.create_all(self.mirror_engine, checkfirst=True)
+
+    def reset(self, tables=None):
+        """清空镜像中的表（事件表连同派生数据）和水位，下次同步时全量复制，源库中已删除的行不再残留"""
+        self.prepare()
+        with self.mirror_engine.begin() as conn:
+            # 按同步顺序的逆序删除：引用人物表的子表在前
+            for model in reversed(MIRROR_MODELS):
+                if tables and model.__tablename__ not in tables:
+                    continue
+                conn.execute(model.__table__.delete())
+                if model is InternetEvent:
+                    for derived in (EventCategory, EventKeyword, DailyEventStats):
+                        conn.execute(derived.__table__.delete())
+                    # 事件表已清空，重建即清空全文索引
+                    get_search_backend(conn).rebuild(conn)
+
+            statement = mirror_watermarks.delete()
+            if tables:
+                statement = statement.where(mirror_watermarks.c.table_name.in_(list(tables)))
+            conn.execute(statement)
+
+    def sync(self, tables=None):
+        """同步所有（或指定的）表，返回 {表名: 同步的行数}"""
+        self.prepare()
+        stats = {}
+        for model in MIRROR_MODELS:
+            table = model.__table__
+            if tables and table.name not in tables:
+                continue
+            stats[table.name] = self.sync_table(table)
+        return stats
+
+    def sync_table(self, table):
+        """分批同步一张表中水位之后的行，返回行数"""
+        changed = change_column(table)
+        upsert = _upsert_statement(table)
+        total = 0
+
+        with self.mirror_engine.connect() as mirror:
+            watermark = get_watermark(mirror, table.name)
+        since = self._recheck_since(watermark)
+
+        while True:
+            query = select(table).order_by(changed, table.c.id).limit(self.batch_size)
+            if since is not None:
+                query = query.where(changed >= since)
+                since = None
+            elif watermark is not None:
+                query = query.where(_after_watermark(table, watermark))
+            read_at = datetime.now()
+            with self.source_engine.connect() as source:
+                rows = [dict(row._mapping) for row in source.execute(query)]
+            if not rows:
+                break
+
+            with self.mirror_engine.begin() as mirror:
+                ids = [row["id"] for row in rows]
+                previous_dates = []
+                if table is InternetEvent.__table__:
+                    previous_dates = mirror.execute(
+                        select(table.c.date).where(table.c.id.in_(ids))
+                    ).scalars().all()
+
+                mirror.execute(upsert, rows)
+                if table is InternetEvent.__table__:
+                    refresh_derived_data(mirror, ids, previous_dates)
+
+                last = rows[-1]
+                watermark = (last[changed.name], last["id"], read_at)
+                set_watermark(mirror, table.name, *watermark)
+
+            total += len(rows)
+            print(f"🔄 {table.name}: 已同步 {total} 行")
+            if len(rows) < self.batch_size:
+                break
+        return total
+
+    def _recheck_since(self, watermark):
+        """上次读取时可能还未提交的行的最早变更时间；不需要重新读取时返回 None"""
+        if not watermark or watermark[0] is None or watermark[2] is None:
+            return None
+        changed_at, _, synced_at = watermark
+        since = synced_at - self.overlap
+        return since if since <= changed_at else None
+
+    def status(self):
+        """各表的水位和镜像行数"""
+        self.prepare()
+        result = {}
+        with self.mirror_engine.connect() as conn:
+            for model in MIRROR_MODELS:
+                table = model.__table__
+                watermark = get_watermark(conn, table.name)
+                count = conn.execute(select(func.count()).select_from(table)).scalar()
+                result[table.name] = {"watermark": watermark, "rows": count}
+        return result
@@ -2,11 +2,13 @@
 数据模型定义 - MySQL 适配版本 (扩展版)
 """
 
-from sqlalchemy import create_engine, Column, String, Integer, Date, Text, JSON, DateTime, Boolean, ForeignKey, Float
+from sqlalchemy import create_engine, event, Column, String, Integer, Date, Text, JSON, DateTime, Boolean, ForeignKey, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship
 from datetime import datetime
 import os
+import threading
 from config.settings import DATABASE_URL, SQLITE_URL, USE_MYSQL
 
 Base = declarative_base()
@@ -43,6 +45,13 @@ class InternetEvent(Base):
     # 关联关系
     figure = relationship("PantheonFigure", back_populates="events")
 
+    __table_args__ = (
+        # 游标分页按 (date, id) 排序和定位
+        Index('ix_internet_events_date_id', 'date', 'id'),
+        # 镜像增量同步按 (updated_at, id) 读取水位之后的行
+        Index('ix_internet_events_updated_at_id', 'updated_at', 'id'),
+    )
+
     def get_literature_content(self):
         """获取文献内容"""
         if not self.has_literature or not self.literature_path:
@@ -118,6 +127,10 @@ class PantheonFigure(Base):
     artifacts = relationship("HistoricalArtifact", back_populates="figure")
     timelines = relationship("FigureTimeline", back_populates="figure")
 
+    __table_args__ = (
+        Index('ix_pantheon_figures_updated_at_id', 'updated_at', 'id'),
+    )
+
 
 class HistoricalArtifact(Base):
     __tablename__ = "historical_artifacts"
@@ -149,6 +162,10 @@ class HistoricalArtifact(Base):
     # 关联关系
     figure = relationship("PantheonFigure", back_populates="artifacts")
 
+    __table_args__ = (
+        Index('ix_historical_artifacts_created_at_id', 'created_at', 'id'),
+    )
+
 
 class FigureTimeline(Base):
     __tablename__ = "figure_timelines"
@@ -172,6 +189,10 @@ class FigureTimeline(Base):
     # 关联关系
     figure = relationship("PantheonFigure", back_populates="timelines")
 
+    __table_args__ = (
+        Index('ix_figure_timelines_created_at_id', 'created_at', 'id'),
+    )
+
 
 class HistoricalEvent(Base):
     __tablename__ = "historical_events"
@@ -203,43 +224,265 @@ class HistoricalEvent(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
+    __table_args__ = (
+        Index('ix_historical_events_updated_at_id', 'updated_at', 'id'),
+    )
 
-# 独立的数据库初始化函数
-def init_database():
-    """初始化数据库"""
-    from config.settings import DATABASE_URL, SQLITE_URL, USE_MYSQL
+
+class EventCategory(Base):
+    __tablename__ = "event_categories"
     
-    # 根据配置选择数据库
-    if USE_MYSQL:
-        database_url = DATABASE_URL
-        print("🚀 使用 MySQL 数据库")
-    else:
-        database_url = SQLITE_URL
-        print("💾 使用 SQLite 数据库")
+    # 与 InternetEvent.categories JSON 列同步的规范化分类表
+    event_id = Column(String(64), ForeignKey('internet_events.id', ondelete='CASCADE'), primary_key=True)
+    category = Column(String(100), primary_key=True)
+    
+    __table_args__ = (
+        # 按分类筛选事件：索引查找后直接得到事件ID
+        Index('ix_event_categories_category_event', 'category', 'event_id'),
+    )
+
+
+class EventKeyword(Base):
+    __tablename__ = "event_keywords"
     
-    engine = create_engine(database_url)
+    # 与 InternetEvent.keywords JSON 列同步的规范化关键词表
+    event_id = Column(String(64), ForeignKey('internet_events.id', ondelete='CASCADE'), primary_key=True)
+    keyword = Column(String(100), primary_key=True)
     
-    # 创建所有表
-    try:
-        Base.metadata.create_all(engine)
-        print("✅ 数据库表创建成功")
-        
-        # 输出创建的表信息
-        table_names = Base.metadata.tables.keys()
-        print(f"📊 已创建表: {', '.join(table_names)}")
-        
-    except Exception as e:
-        print(f"❌ 数据库表创建失败: {e}")
-        # 如果 MySQL 失败，回退到 SQLite
-        if USE_MYSQL:
-            print("🔄 回退到 SQLite 数据库")
-            engine = create_engine(SQLITE_URL)
-            Base.metadata.create_all(engine)
+    __table_args__ = (
+        Index('ix_event_keywords_keyword_event', 'keyword', 'event_id'),
+    )
+
+
+class DailyEventStats(Base):
+    __tablename__ = "daily_event_stats"
+    
+    # 每日事件聚合，供日历格子和年历热力图着色使用
+    date = Column(Date, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    max_heat = Column(Integer, default=0)
+    avg_heat = Column(Float, default=0)
+    top_event_id = Column(String(64))  # 当天热度最高的事件
+
+
+class TableRevision(Base):
+    __tablename__ = "table_revisions"
+    
+    # 每张表一个修订号，任何写入后递增（Web 层据此生成 ETag）
+    table_name = Column(String(64), primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
     
+    version = Column(Integer, primary_key=True)  # 迁移版本号，按顺序递增
+    name = Column(String(100), nullable=False)  # 迁移名称
+    applied_at = Column(DateTime, default=datetime.now)
+
+
+# 进程级引擎缓存：每个数据库 URL 只创建一次 Engine
+_engines = {}
+_session_registries = {}
+_bootstrapped_urls = set()
+_engine_lock = threading.RLock()
+_active_database_url = None
+
+
+def _engine_options(database_url):
+    """根据数据库类型生成连接池参数"""
+    from config.settings import DB_POOL_CONFIG
+
+    options = {"pool_pre_ping": DB_POOL_CONFIG.get("pool_pre_ping", True)}
+    if database_url.startswith("sqlite"):
+        # SQLite 连接会在 UI 线程和后台线程之间复用
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options.update(
+            pool_size=DB_POOL_CONFIG.get("pool_size", 5),
+            max_overflow=DB_POOL_CONFIG.get("max_overflow", 10),
+            pool_recycle=DB_POOL_CONFIG.get("pool_recycle", 3600),
+            pool_timeout=DB_POOL_CONFIG.get("pool_timeout", 30),
+        )
+    return options
+
+
+def apply_sqlite_pragmas(engine, pragmas, read_only=False):
+    """在 Engine 的每个新连接上执行 PRAGMA；只读连接不切换日志模式，并以 query_only 禁止写入"""
+    pragmas = dict(pragmas)
+    if read_only:
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _readonly_url(database_url):
+    """SQLite 文件库的只读 URL（mode=ro）；内存库和其他数据库返回 None"""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    query = dict(url.query, mode="ro", uri="true")
+    return url.set(database=f"file:{url.database}", query=query).render_as_string(hide_password=False)
+
+
+def get_engine(database_url=None, read_only=False):
+    """获取（必要时惰性创建）指定 URL 的共享 Engine"""
+    if database_url is None:
+        database_url = get_database_url()
+
+    engine = _engines.get(database_url)
+    if engine is None:
+        with _engine_lock:
+            engine = _engines.get(database_url)
+            if engine is None:
+                engine = create_engine(database_url, **_engine_options(database_url))
+                if database_url.startswith("sqlite"):
+                    from config.settings import SQLITE_PRAGMAS
+                    apply_sqlite_pragmas(engine, SQLITE_PRAGMAS, read_only)
+                from .instrumentation import install_query_instrumentation
+                install_query_instrumentation(engine)
+                _engines[database_url] = engine
     return engine
 
-def get_db_session():
-    """获取数据库会话"""
+
+def get_readonly_engine():
+    """只读 Engine：SQLite 文件库以 mode=ro 另开连接池，供只查询的后台线程使用；
+    MySQL 等其他数据库直接返回共享 Engine"""
+    init_database()
+    database_url = get_database_url()
+    readonly_url = _readonly_url(database_url)
+    if readonly_url is None:
+        return get_engine(database_url)
+    return get_engine(readonly_url, read_only=True)
+
+
+def get_database_url():
+    """获取当前生效的数据库 URL（考虑 MySQL 失败后的 SQLite 回退）"""
+    if _active_database_url:
+        return _active_database_url
+    return DATABASE_URL if USE_MYSQL else SQLITE_URL
+
+
+# 独立的数据库初始化函数
+def init_database():
+    """初始化数据库 - 每个进程只执行一次建表"""
+    global _active_database_url
+
+    database_url = get_database_url()
+    if database_url in _bootstrapped_urls:
+        return get_engine(database_url)
+
+    with _engine_lock:
+        database_url = get_database_url()
+        if database_url in _bootstrapped_urls:
+            return get_engine(database_url)
+
+        # 根据配置选择数据库
+        if database_url == DATABASE_URL:
+            print("🚀 使用 MySQL 数据库")
+        else:
+            print("💾 使用 SQLite 数据库")
+
+        engine = get_engine(database_url)
+
+        # 按版本执行迁移（表结构已是最新时只做一次版本查询）
+        from .migrations import run_migrations
+        try:
+            run_migrations(engine)
+        except Exception as e:
+            print(f"❌ 数据库表创建失败: {e}")
+            # 如果 MySQL 失败，回退到 SQLite
+            if database_url != SQLITE_URL:
+                print("🔄 回退到 SQLite 数据库")
+                database_url = SQLITE_URL
+                engine = get_engine(database_url)
+                run_migrations(engine)
+
+        _active_database_url = database_url
+        _bootstrapped_urls.add(database_url)
+        return engine
+
+
+def get_session_registry():
+    """获取线程安全的 scoped_session 注册表"""
     engine = init_database()
-    Session = sessionmaker(bind=engine)
-    return Session()
\ No newline at end of file
+    database_url = get_database_url()
+
+    registry = _session_registries.get(database_url)
+    if registry is None:
+        with _engine_lock:
+            registry = _session_registries.get(database_url)
+            if registry is None:
+                registry = scoped_session(sessionmaker(bind=engine))
+                _session_registries[database_url] = registry
+    return registry
+
+
+def get_readonly_session_registry():
+    """只读连接的 scoped_session 注册表（数据库不支持只读连接时与 get_session_registry 相同）"""
+    init_database()
+    database_url = _readonly_url(get_database_url())
+    if database_url is None:
+        return get_session_registry()
+    engine = get_engine(database_url, read_only=True)
+
+    registry = _session_registries.get(database_url)
+    if registry is None:
+        with _engine_lock:
+            registry = _session_registries.get(database_url)
+            if registry is None:
+                registry = scoped_session(sessionmaker(bind=engine))
+                _session_registries[database_url] = registry
+    return registry
+
+
+def get_db_session():
+    """获取数据库会话 - 从连接池借出连接，不再重复初始化"""
+    return get_session_registry()()
+
+
+def get_readonly_db_session():
+    """获取当前线程的只读会话"""
+    return get_readonly_session_registry()()
+
+
+def new_db_session():
+    """创建不与当前线程绑定的独立会话（流式读取期间不占用线程会话），用完需 close()"""
+    return get_session_registry().session_factory()
+
+
+def is_scoped_session(session):
+    """session 是否是某个 scoped_session 注册表中当前线程的共享会话"""
+    return any(
+        registry.registry.has() and registry.registry() is session
+        for registry in list(_session_registries.values())
+    )
+
+
+def remove_db_session():
+    """释放当前线程的会话，连接归还连接池"""
+    for registry in list(_session_registries.values()):
+        registry.remove()
+
+
+def dispose_engines():
+    """关闭所有缓存的 Engine（进程退出或测试清理时使用）"""
+    global _active_database_url
+
+    with _engine_lock:
+        for registry in _session_registries.values():
+            registry.remove()
+        for engine in _engines.values():
+            engine.dispose()
+        _session_registries.clear()
+        _engines.clear()
+        _bootstrapped_urls.clear()
+        _active_database_url = None
@@ -0,0 +1,79 @@
+"""
+游标分页 - 基于 (date, id) 的 keyset 分页
+
+与 OFFSET 不同，翻到任意深度的页面都只需在 (date, id) 索引上做一次范围查找。
+"""
+
+import base64
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import and_, or_
+
+# 一页结果：items 为当前页事件，next_cursor 为下一页游标（没有更多数据时为 None）
+EventPage = namedtuple('EventPage', ['items', 'next_cursor'])
+
+
+def encode_cursor(event_date, event_id):
+    """把 (date, id) 编码为 URL 安全的游标字符串"""
+    raw = f"{event_date.isoformat()}|{event_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """解析游标字符串，返回 (date, id)；格式错误时抛出 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        date_part, event_id = raw.split('|', 1)
+        return date.fromisoformat(date_part), event_id
+    except Exception:
+        raise ValueError(f"无效的分页游标: {cursor}")
+
+
+def cursor_for(event):
+    """根据一条事件生成指向它之后位置的游标"""
+    return encode_cursor(event.date, event.id)
+
+
+def keyset_filter(model, cursor, descending=True):
+    """生成 keyset 过滤条件：严格位于游标之后的记录"""
+    cursor_date, cursor_id = decode_cursor(cursor) if isinstance(cursor, str) else cursor
+    if descending:
+        return or_(
+            model.date < cursor_date,
+            and_(model.date == cursor_date, model.id < cursor_id)
+        )
+    return or_(
+        model.date > cursor_date,
+        and_(model.date == cursor_date, model.id > cursor_id)
+    )
+
+
+def keyset_order(model, descending=True):
+    """与 keyset 过滤条件配套的排序"""
+    if descending:
+        return (model.date.desc(), model.id.desc())
+    return (model.date.asc(), model.id.asc())
+
+
+def locate_position(day_counts, position):
+    """在按日期倒序的 [(日期, 事件数), ...] 中定位第 position 条事件之前的位置
+
+    返回 (日期, 当天已跳过的条数)；超出末尾时返回 None。
+    """
+    skipped = 0
+    for day, event_count in day_counts:
+        if skipped + event_count > position:
+            return day, position - skipped
+        skipped += event_count
+    return None
+
+
+def make_page(rows, page_size):
+    """从多取一条的查询结果中切出当前页并计算下一页游标"""
+    rows = list(rows)
+    if len(rows) > page_size:
+        items = rows[:page_size]
+        return EventPage(items, cursor_for(items[-1]))
+    return EventPage(rows, None)
@@ -1,69 +1,231 @@
 """
 查询构建器 - 构建复杂的数据库查询
+
+筛选条件的取值全部作为绑定参数传入。生成的 SELECT 语句只取决于启用了哪些条件和排序方式
+（查询形状），按形状缓存为语句模板：同一形状的查询直接复用模板，
+不再每次重建表达式树，SQLAlchemy 的编译缓存也总是命中。
+分面统计（每个分类/类型/热度区间各有多少事件）同样按形状缓存，用一条 UNION ALL 语句完成。
+按日期排序时以 id 作为第二排序键，after_cursor 在同一模板上做 (date, id) 游标分页。
 """
 
-from sqlalchemy import and_, or_
+import threading
+from datetime import date
+
+from sqlalchemy import and_, or_, select, bindparam, Integer, case, func, literal_column, union_all
+
+# 启用条件在形状中的固定顺序（同一组条件无论调用顺序如何都得到同一个模板）
+_FILTER_ORDER = ('date', 'keyword', 'category', 'tag', 'event_type', 'min_heat', 'max_heat', 'cursor')
+
+# 热度区间：(键, 显示名称, 最低分, 最高分)，与日历格子的着色阈值一致
+HEAT_BANDS = (
+    ("high", "高 (80+)", 80, None),
+    ("medium", "中 (60-79)", 60, 79),
+    ("low", "低 (<60)", None, 59),
+)
+
+# 分面维度及其对应的筛选条件：统计某个维度时不应用该维度自身的条件，
+# 这样各选项的数量就是选中它之后会得到的结果数
+FACET_DIMENSIONS = ('category', 'event_type', 'heat')
+_FACET_FILTERS = {
+    'category': ('category',),
+    'event_type': ('event_type',),
+    'heat': ('min_heat', 'max_heat'),
+}
+
+# 按查询形状缓存的语句模板：{形状: (语句, 关键词参数名)}
+_statement_templates = {}
+_templates_lock = threading.Lock()
+
+
+def heat_band_range(band):
+    """热度区间键对应的 (最低分, 最高分)；未知的键返回 (None, None)"""
+    for key, _, min_score, max_score in HEAT_BANDS:
+        if key == band:
+            return min_score, max_score
+    return None, None
+
+
+def _build_conditions(model, filters, keyword_mode, search_backend):
+    """按启用的条件生成带绑定参数的 WHERE 条件列表，返回 (条件列表, 关键词参数名)"""
+    conditions = []
+    keyword_param = None
+    
+    for name in filters:
+        if name == 'date':
+            conditions.append(model.date.between(bindparam('start_date'), bindparam('end_date')))
+        elif name == 'keyword':
+            if keyword_mode == 'match':
+                clause, keyword_param = search_backend.match_template(model)
+                conditions.append(clause)
+            else:
+                conditions.append(or_(
+                    model.title.contains(bindparam('keyword')),
+                    model.description.contains(bindparam('keyword'))
+                ))
+        elif name == 'category':
+            from .associations import category_clause
+            conditions.append(category_clause(model, bindparam('category')))
+        elif name == 'tag':
+            from .associations import tag_clause
+            conditions.append(tag_clause(model, bindparam('tag')))
+        elif name == 'event_type':
+            conditions.append(model.event_type == bindparam('event_type'))
+        elif name == 'min_heat':
+            conditions.append(model.heat_score >= bindparam('min_heat'))
+        elif name == 'max_heat':
+            conditions.append(model.heat_score <= bindparam('max_heat'))
+    return conditions, keyword_param
+
+
+def _order_clauses(model, order):
+    """排序子句：按日期排序时以 id 作为第二排序键（与游标分页一致）"""
+    from .pagination import keyset_order
+    
+    column_name, descending = order
+    if column_name == 'date':
+        return keyset_order(model, descending)
+    column = getattr(model, column_name)
+    return (column.desc() if descending else column.asc(),)
+
+
+def _build_template(model, shape, search_backend):
+    """按查询形状构建带绑定参数的 SELECT 语句"""
+    from .pagination import keyset_filter
+    
+    filters, keyword_mode, order, has_limit = shape
+    conditions, keyword_param = _build_conditions(model, filters, keyword_mode, search_backend)
+    if 'cursor' in filters:
+        # 游标条件的方向取决于排序方向，build_statement 已保证此时按日期排序
+        cursor = (bindparam('cursor_date'), bindparam('cursor_id'))
+        conditions.append(keyset_filter(model, cursor, order[1]))
+    
+    statement = select(model)
+    if conditions:
+        statement = statement.where(and_(*conditions))
+    if order is not None:
+        statement = statement.order_by(*_order_clauses(model, order))
+    if has_limit:
+        statement = statement.limit(bindparam('limit', type_=Integer, literal_execute=True))
+    return statement, keyword_param
+
+
+def _build_facet_template(model, shape, search_backend):
+    """按查询形状构建分面统计语句：每个维度一段 GROUP BY，用 UNION ALL 合并为一次查询"""
+    from .models import EventCategory
+    
+    filters, keyword_mode, dimensions = shape
+    keyword_param = None
+    parts = []
+    for dimension in dimensions:
+        own_filters = _FACET_FILTERS[dimension]
+        conditions, param = _build_conditions(
+            model, [name for name in filters if name not in own_filters], keyword_mode, search_backend
+        )
+        keyword_param = param or keyword_param
+        facet = literal_column(f"'{dimension}'")
+        
+        if dimension == 'category':
+            value = EventCategory.category
+            part = select(facet.label('facet'), value.label('value'), func.count().label('count')).select_from(
+                EventCategory.__table__.join(model.__table__, model.id == EventCategory.event_id)
+            )
+        elif dimension == 'event_type':
+            value = model.event_type
+            part = select(facet.label('facet'), value.label('value'), func.count().label('count'))
+        else:
+            # 热度区间按从高到低的顺序判断
+            value = case(
+                *[(model.heat_score >= literal_column(str(min_score)), literal_column(f"'{key}'"))
+                  for key, _, min_score, _ in HEAT_BANDS if min_score is not None],
+                else_=literal_column(f"'{HEAT_BANDS[-1][0]}'")
+            )
+            part = select(facet.label('facet'), value.label('value'), func.count().label('count'))
+        
+        if conditions:
+            part = part.where(and_(*conditions))
+        parts.append(part.group_by(value))
+    return union_all(*parts), keyword_param
+
+
+def template_count():
+    """已缓存的语句模板数量"""
+    return len(_statement_templates)
+
+
+def clear_statement_templates():
+    with _templates_lock:
+        _statement_templates.clear()
+
 
 class QueryBuilder:
     """查询构建器类"""
     
     def __init__(self, model_class):
         self.model_class = model_class
-        self.filters = []
-        self.order_by = None
+        self.params = {}  # 启用的条件名 -> 取值
+        self.order_by = None  # (列名, 是否倒序)
         self.limit_value = None
     
     def filter_by_date_range(self, start_date, end_date):
-        """按日期范围过滤"""
-        if start_date and end_date:
-            self.filters.append(self.model_class.date.between(start_date, end_date))
+        """按日期范围过滤（闭区间）；只给出一端时另一端不限"""
+        if start_date or end_date:
+            self.params['date'] = (start_date or date.min, end_date or date.max)
         return self
     
     def filter_by_keyword(self, keyword):
-        """按关键词过滤"""
+        """按关键词过滤（全文索引）"""
         if keyword and keyword.strip():
-            self.filters.append(
-                or_(
-                    self.model_class.title.contains(keyword),
-                    self.model_class.description.contains(keyword)
-                )
-            )
+            self.params['keyword'] = keyword.strip()
         return self
     
     def filter_by_category(self, category):
-        """按分类过滤"""
+        """按分类过滤（event_categories 索引）"""
         if category and category.strip():
-            self.filters.append(self.model_class.categories.contains([category]))
+            self.params['category'] = category.strip()
+        return self
+    
+    def filter_by_tag(self, tag):
+        """按关键词标签精确过滤（event_keywords 索引）"""
+        if tag and tag.strip():
+            self.params['tag'] = tag.strip()
         return self
     
     def filter_by_event_type(self, event_type):
         """按事件类型过滤"""
         if event_type and event_type.strip():
-            self.filters.append(self.model_class.event_type == event_type)
+            self.params['event_type'] = event_type.strip()
+        return self
+    
+    def filter_by_heat_band(self, band):
+        """按热度区间（HEAT_BANDS 中的键）过滤"""
+        if band:
+            self.filter_by_heat_score(*heat_band_range(band))
         return self
     
     def filter_by_heat_score(self, min_score=None, max_score=None):
         """按热度分数过滤"""
         if min_score is not None:
-            self.filters.append(self.model_class.heat_score >= min_score)
+            self.params['min_heat'] = min_score
         if max_score is not None:
-            self.filters.append(self.model_class.heat_score <= max_score)
+            self.params['max_heat'] = max_score
         return self
     
     def order_by_date(self, descending=True):
         """按日期排序"""
-        if descending:
-            self.order_by = self.model_class.date.desc()
-        else:
-            self.order_by = self.model_class.date.asc()
+        self.order_by = ('date', descending)
         return self
     
     def order_by_heat_score(self, descending=True):
         """按热度排序"""
-        if descending:
-            self.order_by = self.model_class.heat_score.desc()
-        else:
-            self.order_by = self.model_class.heat_score.asc()
+        self.order_by = ('heat_score', descending)
+        return self
+    
+    def after_cursor(self, cursor):
+        """只取游标（上一页的 next_cursor）之后的记录，需按日期排序；游标无效时抛出 ValueError"""
+        from .pagination import decode_cursor
+        
+        if cursor:
+            self.params['cursor'] = decode_cursor(cursor)
         return self
     
     def limit(self, limit_value):
@@ -71,25 +233,114 @@ class QueryBuilder:
         self.limit_value = limit_value
         return self
     
-    def build(self, session):
-        """构建查询"""
-        query = session.query(self.model_class)
+    def _keyword_mode(self, conn):
+        """返回 (全文检索后端, 关键词模式)；输入无法分词时退回 LIKE"""
+        from .search_index import get_search_backend, tokenize
         
-        # 应用过滤器
-        if self.filters:
-            query = query.filter(and_(*self.filters))
+        keyword = self.params.get('keyword')
+        if not keyword:
+            return None, None
+        backend = get_search_backend(conn)
+        return backend, 'match' if tokenize(keyword, for_query=True) else 'like'
+    
+    def _template(self, kind, shape, backend, build):
+        key = (kind, self.model_class, backend.name if backend else None, shape)
+        template = _statement_templates.get(key)
+        if template is None:
+            with _templates_lock:
+                template = _statement_templates.get(key)
+                if template is None:
+                    template = build(self.model_class, shape, backend)
+                    _statement_templates[key] = template
+        return template
+    
+    def _filters(self, include_cursor=True):
+        """启用的条件名（按 _FILTER_ORDER 排列）"""
+        return tuple(
+            name for name in _FILTER_ORDER
+            if name in self.params and (include_cursor or name != 'cursor')
+        )
+    
+    def build_statement(self, conn):
+        """返回 (语句模板, 绑定参数)；同一查询形状的语句只构建一次"""
+        if 'cursor' in self.params and (self.order_by or (None,))[0] != 'date':
+            raise ValueError("游标分页只支持按日期排序")
         
-        # 应用排序
-        if self.order_by:
-            query = query.order_by(self.order_by)
+        backend, keyword_mode = self._keyword_mode(conn)
+        filters = self._filters()
+        shape = (filters, keyword_mode, self.order_by, bool(self.limit_value))
+        statement, keyword_param = self._template('select', shape, backend, _build_template)
         
-        # 应用限制
+        params = self._bind_params(conn, filters, backend, keyword_mode, keyword_param)
         if self.limit_value:
-            query = query.limit(self.limit_value)
+            params['limit'] = self.limit_value
+        return statement, params
+    
+    def build_facet_statement(self, conn, dimensions=FACET_DIMENSIONS):
+        """返回分面统计的 (语句模板, 绑定参数)，结果行为 (维度, 取值, 数量)"""
+        backend, keyword_mode = self._keyword_mode(conn)
+        filters = self._filters(include_cursor=False)
+        shape = (filters, keyword_mode, tuple(dimensions))
+        statement, keyword_param = self._template('facets', shape, backend, _build_facet_template)
         
-        return query
+        # 每段都不含自身维度的条件，但同名参数取值相同，一次传入即可
+        return statement, self._bind_params(conn, filters, backend, keyword_mode, keyword_param)
+    
+    def facet_counts(self, conn, dimensions=FACET_DIMENSIONS):
+        """一次查询统计各维度每个取值的事件数：{维度: [(取值, 数量), ...]}，按数量倒序"""
+        statement, params = self.build_facet_statement(conn, dimensions)
+        facets = {dimension: [] for dimension in dimensions}
+        for dimension, value, count in conn.execute(statement, params):
+            if value is not None:
+                facets[dimension].append((value, count))
+        for dimension, values in facets.items():
+            if dimension == 'heat':
+                order = [key for key, _, _, _ in HEAT_BANDS]
+                values.sort(key=lambda item: order.index(item[0]))
+            else:
+                values.sort(key=lambda item: (-item[1], item[0]))
+        return facets
+    
+    def _bind_params(self, conn, filters, backend, keyword_mode, keyword_param):
+        params = {}
+        for name in filters:
+            value = self.params[name]
+            if name == 'date':
+                params['start_date'], params['end_date'] = value
+            elif name == 'cursor':
+                params['cursor_date'], params['cursor_id'] = value
+            elif name == 'keyword':
+                if keyword_mode == 'match':
+                    params[keyword_param] = backend.match_param(value, conn)
+                else:
+                    params['keyword'] = value
+            else:
+                params[name] = value
+        return params
+    
+    def execute(self, session):
+        """执行查询，返回模型对象列表"""
+        statement, params = self.build_statement(session.connection())
+        return session.execute(statement, params).scalars().all()
     
-    def build_search_query(self, keyword=None, category=None, start_date=None, end_date=None, 
+    def build(self, session):
+        """构建查询：返回绑定了参数的普通 Query，可继续 filter()/count()/all()
+
+        WHERE 条件直接取自缓存的语句模板；需要最快路径时使用 execute() / build_statement()。
+        """
+        statement, params = self.build_statement(session.connection())
+        params.pop('limit', None)
+        
+        query = session.query(self.model_class)
+        if statement.whereclause is not None:
+            query = query.filter(statement.whereclause)
+        if self.order_by is not None:
+            query = query.order_by(*_order_clauses(self.model_class, self.order_by))
+        if self.limit_value:
+            query = query.limit(self.limit_value)
+        return query.params(params)
+    
+    def build_search_query(self, keyword=None, category=None, start_date=None, end_date=None,
                           event_type=None, min_heat=None, max_heat=None, limit=100):
         """构建完整的搜索查询"""
         self.filter_by_keyword(keyword)
@@ -107,15 +358,16 @@ def create_event_query_builder():
     from .models import InternetEvent
     return QueryBuilder(InternetEvent)
 
-def build_advanced_search(session, keyword=None, category=None, start_date=None, 
-                         end_date=None, event_type=None, min_heat=None, max_heat=None, 
-                         limit=100, order_by='date', descending=True):
-    """构建高级搜索查询"""
+def advanced_search_builder(keyword=None, category=None, start_date=None, end_date=None,
+                            event_type=None, min_heat=None, max_heat=None,
+                            limit=100, order_by='date', descending=True, tag=None):
+    """按高级搜索参数配置好的查询构建器"""
     from .models import InternetEvent
     
     query_builder = QueryBuilder(InternetEvent)
     query_builder.filter_by_keyword(keyword)
     query_builder.filter_by_category(category)
+    query_builder.filter_by_tag(tag)
     query_builder.filter_by_date_range(start_date, end_date)
     query_builder.filter_by_event_type(event_type)
     query_builder.filter_by_heat_score(min_heat, max_heat)
@@ -127,5 +379,30 @@ def build_advanced_search(session, keyword=None, category=None, start_date=None,
         query_builder.order_by_heat_score(descending)
     
     query_builder.limit(limit)
+    return query_builder
+
+def event_list_builder(start_date=None, end_date=None, keyword=None, category=None, event_type=None,
+                       heat=None, cursor=None, page_size=None, descending=True):
+    """事件列表（按 (date, id) 游标分页）的查询构建器；page_size 给出时多取一条用于判断是否还有下一页"""
+    from .models import InternetEvent
     
-    return query_builder.build(session)
\ No newline at end of file
+    query_builder = QueryBuilder(InternetEvent)
+    query_builder.filter_by_date_range(start_date, end_date)
+    query_builder.filter_by_keyword(keyword)
+    query_builder.filter_by_category(None if category == "全部" else category)
+    query_builder.filter_by_event_type(event_type)
+    query_builder.filter_by_heat_band(heat)
+    query_builder.order_by_date(descending)
+    query_builder.after_cursor(cursor)
+    if page_size:
+        query_builder.limit(page_size + 1)
+    return query_builder
+
+def build_advanced_search(session, keyword=None, category=None, start_date=None,
+                         end_date=None, event_type=None, min_heat=None, max_heat=None,
+                         limit=100, order_by='date', descending=True, tag=None):
+    """构建高级搜索查询"""
+    return advanced_search_builder(
+        keyword, category, start_date, end_date, event_type, min_heat, max_heat,
+        limit, order_by, descending, tag
+    ).build(session)
@@ -0,0 +1,234 @@
+"""
+查询结果缓存 - DatabaseManager 的只读查询结果按规范化参数缓存
+
+默认使用进程内带过期时间的 LRU，也可以换成 SQLite 文件存储（多个进程共享）。
+每条缓存记录它依赖的日期范围：写入事件后按受影响的日期精确失效，
+不限日期的查询（总数、分页、分类）在任何写入后失效。
+只缓存普通数据（计数、元组、EventListRow），不缓存绑定会话的 ORM 对象。
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+
+def _iso(value):
+    """日期参数统一为 ISO 字符串；None 表示不限"""
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return str(value)[:10]
+
+
+def make_key(namespace, params):
+    """由查询名和参数生成缓存键：去掉空参数、去除首尾空白、日期转为 ISO 字符串"""
+    normalized = {}
+    for name, value in (params or {}).items():
+        if isinstance(value, str):
+            value = value.strip()
+        elif isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        if value is None or value == "":
+            continue
+        normalized[name] = value
+    return f"{namespace}:{json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)}"
+
+
+def _overlaps(span, dates):
+    """缓存项的日期范围是否包含任一日期；span 为 None 表示依赖全部日期"""
+    if span is None:
+        return True
+    start, end = span
+    return any((start is None or start <= d) and (end is None or d <= end) for d in dates)
+
+
+class MemoryCacheStore:
+    """进程内 LRU 存储"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max(1, int(max_entries))
+        self._data = OrderedDict()
+
+    def get(self, key):
+        """返回 (value, expires_at)；不存在时返回 None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        self._data.move_to_end(key)
+        return entry[0], entry[1]
+
+    def set(self, key, value, expires_at, span):
+        self._data[key] = (value, expires_at, span)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def invalidate_dates(self, dates):
+        stale = [key for key, (_, _, span) in self._data.items() if _overlaps(span, dates)]
+        for key in stale:
+            del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCacheStore:
+    """SQLite 文件存储：值用 pickle 序列化，日期范围存为 ISO 字符串以便按日期删除"""
+
+    def __init__(self, path, max_entries=5000):
+        self.max_entries = max(1, int(max_entries))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 调用方（QueryCache）负责加锁
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, "
+            "all_dates INTEGER NOT NULL, start_date TEXT, end_date TEXT, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_query_cache_used_at ON query_cache (used_at)")
+
+    def get(self, key):
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM query_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE query_cache SET used_at = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, expires_at, span):
+        start, end = span if span is not None else (None, None)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at,
+             1 if span is None else 0, start, end, time.time())
+        )
+        count = self._conn.execute("SELECT COUNT(*) FROM query_cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM query_cache WHERE key IN "
+                "(SELECT key FROM query_cache ORDER BY used_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def delete(self, key):
+        self._conn.execute("DELETE FROM query_cache WHERE key = ?", (key,))
+
+    def invalidate_dates(self, dates):
+        removed = self._conn.execute("DELETE FROM query_cache WHERE all_dates = 1").rowcount
+        for d in dates:
+            removed += self._conn.execute(
+                "DELETE FROM query_cache WHERE (start_date IS NULL OR start_date <= ?) "
+                "AND (end_date IS NULL OR end_date >= ?)",
+                (d, d)
+            ).rowcount
+        return removed
+
+    def clear(self):
+        self._conn.execute("DELETE FROM query_cache")
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM query_cache").fetchone()[0]
+
+
+class QueryCache:
+    """带过期时间和按日期失效的查询结果缓存"""
+
+    def __init__(self, store=None, ttl=60, enabled=True):
+        self.store = store if store is not None else MemoryCacheStore()
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # 失效时递增：查询期间发生过失效的结果不写回缓存
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """根据 QUERY_CACHE_CONFIG 创建缓存；disk_path 不为空时使用 SQLite 文件存储"""
+        max_entries = config.get("max_entries", 256)
+        disk_path = config.get("disk_path")
+        store = SQLiteCacheStore(disk_path, max_entries) if disk_path else MemoryCacheStore(max_entries)
+        return cls(store, ttl=config.get("ttl", 60), enabled=config.get("enabled", True))
+
+    def get_or_load(self, namespace, params, loader, start_date=None, end_date=None, all_dates=False):
+        """命中时返回缓存值，否则调用 loader() 并缓存结果（loader 抛出的异常不缓存）
+
+        start_date / end_date 为结果依赖的日期范围；all_dates 为 True 表示依赖全部数据。
+        """
+        if not self.enabled:
+            return loader()
+
+        key = make_key(namespace, params)
+        now = time.time()
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return self._copy(entry[0])
+            if entry is not None:
+                self.store.delete(key)
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        span = None if all_dates else (_iso(start_date), _iso(end_date))
+        with self._lock:
+            if generation == self._generation:
+                self.store.set(key, value, time.time() + self.ttl, span)
+        return self._copy(value)
+
+    @staticmethod
+    def _copy(value):
+        """返回缓存值的副本：列表、字典逐层复制，具名元组（EventPage、EventListRow）按字段复制，
+        调用方修改结果（包括行内的分类列表）不会影响缓存；不可变的叶子值直接共享"""
+        if isinstance(value, list):
+            return [QueryCache._copy(item) for item in value]
+        if isinstance(value, dict):
+            return {key: QueryCache._copy(item) for key, item in value.items()}
+        if isinstance(value, tuple) and hasattr(value, '_fields'):
+            return type(value)(*(QueryCache._copy(item) for item in value))
+        if isinstance(value, tuple):
+            return tuple(QueryCache._copy(item) for item in value)
+        return value
+
+    def invalidate_dates(self, dates=None):
+        """失效依赖这些日期的缓存项；dates 为 None 时清空全部（可直接作为变更监听器）"""
+        with self._lock:
+            self._generation += 1
+            if dates is None:
+                self.store.clear()
+                return None
+            return self.store.invalidate_dates({_iso(d) for d in dates})
+
+    def clear(self):
+        self.invalidate_dates(None)
+
+    def stats(self):
+        """命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self.store)
+            }
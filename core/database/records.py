@@ -0,0 +1,99 @@
+"""
+轻量事件记录 - 列表界面只需要的字段
+
+列表、日历格子等只显示少数几列，直接按列投影查询，
+不创建 ORM 对象，也不读取描述、概述和来源等大字段。
+EventRecord 是 ORM 查询失败时原始 SQL 回退路径和示例数据共用的只读事件对象。
+"""
+
+import json
+from collections import namedtuple
+
+from .models import InternetEvent
+
+# 列表行：字段顺序与 LIST_COLUMNS 一致
+EventListRow = namedtuple('EventListRow', [
+    'id', 'date', 'title', 'event_type', 'categories', 'heat_score', 'has_literature'
+])
+
+LIST_COLUMNS = (
+    InternetEvent.id,
+    InternetEvent.date,
+    InternetEvent.title,
+    InternetEvent.event_type,
+    InternetEvent.categories,
+    InternetEvent.heat_score,
+    InternetEvent.has_literature
+)
+
+# ORM 列表查询中延迟加载的大字段（详情页访问时才读取）
+DEFERRED_LIST_COLUMNS = (
+    InternetEvent.detailed_overview,
+    InternetEvent.sources,
+    InternetEvent.media_urls
+)
+
+
+def make_list_row(row):
+    """把投影查询的结果行转换为 EventListRow，并补齐空值"""
+    event_id, event_date, title, event_type, categories, heat_score, has_literature = row
+    return EventListRow(
+        str(event_id),
+        event_date,
+        title,
+        event_type or 'meme',
+        categories or [],
+        heat_score or 0,
+        bool(has_literature)
+    )
+
+
+def _json_list(value):
+    """把 JSON 列（原始 SQL 查询返回字符串）解析为列表"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
+class EventRecord:
+    """只读事件记录：属性与 InternetEvent 同名，使用 __slots__ 不带实例字典"""
+
+    __slots__ = (
+        'id', 'date', 'title', 'description', 'event_type', 'categories', 'keywords',
+        'heat_level', 'heat_score', 'sources', 'media_urls', 'has_literature', 'literature_path'
+    )
+
+    def __init__(self, id, date, title, description="", event_type="meme", categories=None,
+                 keywords=None, heat_level="medium", heat_score=50, sources=None, media_urls=None,
+                 has_literature=False, literature_path=None):
+        values = (
+            id, date, title, description or "", event_type or "meme",
+            _json_list(categories), _json_list(keywords), heat_level,
+            heat_score if heat_score is not None else 50,
+            _json_list(sources), _json_list(media_urls), bool(has_literature), literature_path
+        )
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_row(cls, row):
+        """由 (id, date, title, description, heat_score, categories, keywords) 结果行创建"""
+        event_id, event_date, title, description, heat_score, categories, keywords = row[:7]
+        return cls(
+            event_id, event_date, title, description,
+            heat_score=heat_score, categories=categories, keywords=keywords
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"EventRecord 是只读的，不能修改 {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"EventRecord 是只读的，不能删除 {name}")
+
+    def __repr__(self):
+        return f"EventRecord(id={self.id!r}, date={self.date!r}, title={self.title!r})"
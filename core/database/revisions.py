@@ -0,0 +1,57 @@
+"""
+数据修订号 - 每张表一个随写入单调递增的整数
+
+InternetEvent 的任何写入（ORM 增删改、批量导入、镜像同步）都使 internet_events 的修订号加一，
+与写入在同一事务中提交。Web 层用修订号生成 ETag：判断数据是否变化只需一次主键查找，
+与表的大小和筛选条件无关，也不受 DATETIME 秒级精度的影响。
+"""
+
+from sqlalchemy import event, select, update, insert
+
+from .models import InternetEvent, TableRevision
+
+EVENTS_TABLE = InternetEvent.__tablename__
+
+
+def bump_revision(conn, table_name=EVENTS_TABLE):
+    """修订号加一（在调用方的事务中执行）"""
+    result = conn.execute(
+        update(TableRevision.__table__)
+        .where(TableRevision.table_name == table_name)
+        .values(revision=TableRevision.revision + 1)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(TableRevision.__table__).values(table_name=table_name, revision=1))
+
+
+def get_revision(conn, table_name=EVENTS_TABLE):
+    """当前修订号；从未写入过时为 0"""
+    revision = conn.execute(
+        select(TableRevision.revision).where(TableRevision.table_name == table_name)
+    ).scalar()
+    return revision or 0
+
+
+def create_revisions_table(conn):
+    """迁移步骤：创建修订号表，已有数据的表从 1 开始"""
+    TableRevision.__table__.create(conn, checkfirst=True)
+    if not get_revision(conn):
+        bump_revision(conn)
+
+
+# ==================== 与 InternetEvent 写入保持同步 ====================
+# 批量导入和镜像同步是 Core 级写入，由 derived.refresh_derived_data 递增
+
+@event.listens_for(InternetEvent, 'after_insert')
+def _revision_after_insert(mapper, connection, target):
+    bump_revision(connection)
+
+
+@event.listens_for(InternetEvent, 'after_update')
+def _revision_after_update(mapper, connection, target):
+    bump_revision(connection)
+
+
+@event.listens_for(InternetEvent, 'after_delete')
+def _revision_after_delete(mapper, connection, target):
+    bump_revision(connection)
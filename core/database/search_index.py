@@ -0,0 +1,656 @@
+"""
+全文检索 - 事件标题、描述、关键词的全文索引
+
+根据数据库类型选择后端：
+- SQLite: FTS5 虚拟表，中文按单字 + 二元组切分后入库，bm25() 排序
+- MySQL: 独立检索表上的 FULLTEXT 索引（ngram 解析器），按相关度排序
+- 其他: 纯 Python 倒排索引，内存中按 BM25 打分
+
+索引通过 InternetEvent 的映射器事件与 add_event/update_event/delete_event 保持同步。
+"""
+
+import json
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from sqlalchemy import event, inspect, text, column, or_, bindparam
+
+from .models import InternetEvent
+
+# 中日韩统一表意文字（含扩展 A 区与兼容区）
+_CJK_CHARS = '㐀-䶿一-鿿豈-﫿'
+_CJK_RE = re.compile(f'[{_CJK_CHARS}]+')
+_TOKEN_RE = re.compile(f'[{_CJK_CHARS}]+|[^\\W{_CJK_CHARS}]+')
+
+
+def tokenize(text_value, for_query=False):
+    """分词：拉丁字母/数字按词切分，中文连续片段切成二元组
+
+    建索引时额外保留单字，使单字查询也能命中；
+    查询时长度 >= 2 的中文片段只用二元组（相当于子串匹配）。
+    """
+    tokens = []
+    for chunk in _TOKEN_RE.findall((text_value or '').lower()):
+        if not _CJK_RE.fullmatch(chunk):
+            tokens.append(chunk)
+            continue
+
+        if len(chunk) == 1:
+            tokens.append(chunk)
+            continue
+
+        if not for_query:
+            tokens.extend(chunk)
+        tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+    return tokens
+
+
+def query_tokens(query):
+    """查询分词：返回 (词列表, 最后一个词是否按前缀匹配)
+
+    最后一个词是拉丁字母/数字时视为可能尚未输完（边输边搜），按前缀匹配；
+    中文查询本身按二元组做子串匹配，不需要前缀。
+    """
+    tokens = tokenize(query, for_query=True)
+    return tokens, bool(tokens) and not _CJK_RE.fullmatch(tokens[-1])
+
+
+def _keywords_text(keywords):
+    """关键词字段可能是列表或 JSON 字符串"""
+    if not keywords:
+        return ''
+    if isinstance(keywords, str):
+        try:
+            keywords = json.loads(keywords)
+        except ValueError:
+            return keywords
+    return ' '.join(str(k) for k in keywords)
+
+
+def _document_fields(title, description, keywords):
+    """返回 (标题, 正文)；正文包含描述和关键词"""
+    body = f"{description or ''} {_keywords_text(keywords)}".strip()
+    return title or '', body
+
+
+def _iter_source_rows(conn, batch_size=1000):
+    """分批读取需要建索引的字段"""
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+        text("SELECT id, title, description, keywords FROM internet_events")
+    )
+    for row in result:
+        yield row
+
+
+class SearchBackend:
+    """全文检索后端接口"""
+
+    name = "base"
+
+    def ensure_schema(self, conn):
+        """创建索引所需的表"""
+
+    def index_event(self, conn, event_id, title, description, keywords):
+        """写入或更新一条事件的索引"""
+        raise NotImplementedError
+
+    def remove_event(self, conn, event_id):
+        """删除一条事件的索引"""
+        raise NotImplementedError
+
+    def index_events(self, conn, rows):
+        """批量写入索引，rows 为 (event_id, title, description, keywords) 序列"""
+        for event_id, title, description, keywords in rows:
+            self.index_event(conn, event_id, title, description, keywords)
+
+    def search(self, conn, query, limit=None):
+        """返回按相关度降序排列的 [(event_id, score), ...]"""
+        raise NotImplementedError
+
+    def match_clause(self, model, query, conn=None):
+        """返回可直接用于 filter() 的条件：事件 ID 属于命中集合"""
+        raise NotImplementedError
+
+    def match_template(self, model):
+        """与 match_clause 相同但检索内容为绑定参数，供语句模板复用：返回 (条件, 参数名)"""
+        raise NotImplementedError
+
+    def match_param(self, query, conn=None):
+        """match_template 中绑定参数的取值"""
+        raise NotImplementedError
+
+    def ranked_subquery(self, query):
+        """返回 (event_id, score) 子查询供联表排序，score 越大越相关；不支持在 SQL 中打分时返回 None"""
+        return None
+
+    def rebuild(self, conn):
+        """根据 internet_events 重建整个索引"""
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """SQLite FTS5 后端
+
+    FTS5 自带的 unicode61 分词器不切分中文，因此文本先在 Python 中切成
+    单字 + 二元组再写入，查询也按同样规则切分。internet_events_fts_map
+    记录事件 ID 与 FTS 行号的对应关系，删除和更新只需主键查找。
+    """
+
+    name = "sqlite_fts5"
+
+    def ensure_schema(self, conn):
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS internet_events_fts "
+            "USING fts5(title, body, tokenize='unicode61')"
+        ))
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS internet_events_fts_map ("
+            "event_id VARCHAR(64) PRIMARY KEY, doc_id INTEGER NOT NULL)"
+        ))
+        # MATCH 命中的是 FTS 行号，按 doc_id 反查事件 ID 需要索引
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_internet_events_fts_map_doc "
+            "ON internet_events_fts_map (doc_id)"
+        ))
+
+    def index_event(self, conn, event_id, title, description, keywords):
+        self.remove_event(conn, event_id)
+        title, body = _document_fields(title, description, keywords)
+        result = conn.execute(
+            text("INSERT INTO internet_events_fts (title, body) VALUES (:title, :body)"),
+            {"title": ' '.join(tokenize(title)), "body": ' '.join(tokenize(body))}
+        )
+        conn.execute(
+            text("INSERT INTO internet_events_fts_map (event_id, doc_id) VALUES (:event_id, :doc_id)"),
+            {"event_id": event_id, "doc_id": result.lastrowid}
+        )
+
+    def remove_event(self, conn, event_id):
+        doc_id = conn.execute(
+            text("SELECT doc_id FROM internet_events_fts_map WHERE event_id = :event_id"),
+            {"event_id": event_id}
+        ).scalar()
+        if doc_id is None:
+            return
+        conn.execute(text("DELETE FROM internet_events_fts WHERE rowid = :doc_id"), {"doc_id": doc_id})
+        conn.execute(text("DELETE FROM internet_events_fts_map WHERE event_id = :event_id"), {"event_id": event_id})
+
+    def index_events(self, conn, rows):
+        rows = list(rows)
+        if not rows:
+            return
+
+        event_ids = [row[0] for row in rows]
+        doc_ids = conn.execute(
+            text("SELECT doc_id FROM internet_events_fts_map WHERE event_id IN :event_ids")
+            .bindparams(bindparam('event_ids', expanding=True)),
+            {"event_ids": event_ids}
+        ).scalars().all()
+        if doc_ids:
+            conn.execute(
+                text("DELETE FROM internet_events_fts WHERE rowid IN :doc_ids")
+                .bindparams(bindparam('doc_ids', expanding=True)),
+                {"doc_ids": doc_ids}
+            )
+            conn.execute(
+                text("DELETE FROM internet_events_fts_map WHERE event_id IN :event_ids")
+                .bindparams(bindparam('event_ids', expanding=True)),
+                {"event_ids": event_ids}
+            )
+
+        # 写入在同一事务内进行，可以直接分配连续的 rowid 后批量插入
+        next_doc_id = conn.execute(text("SELECT COALESCE(MAX(rowid), 0) FROM internet_events_fts")).scalar() + 1
+        documents, mappings = [], []
+        for offset, (event_id, title, description, keywords) in enumerate(rows):
+            title, body = _document_fields(title, description, keywords)
+            doc_id = next_doc_id + offset
+            documents.append({"doc_id": doc_id, "title": ' '.join(tokenize(title)), "body": ' '.join(tokenize(body))})
+            mappings.append({"event_id": event_id, "doc_id": doc_id})
+
+        conn.execute(text("INSERT INTO internet_events_fts (rowid, title, body) VALUES (:doc_id, :title, :body)"), documents)
+        conn.execute(text("INSERT INTO internet_events_fts_map (event_id, doc_id) VALUES (:event_id, :doc_id)"), mappings)
+
+    @staticmethod
+    def build_match_query(query):
+        """把用户输入转换为 FTS5 MATCH 表达式（所有词都必须出现，最后一个拉丁词按前缀匹配）"""
+        tokens, prefix = query_tokens(query)
+        terms = ['"{}"'.format(token.replace('"', '""')) for token in tokens]
+        if prefix:
+            terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, conn, query, limit=None):
+        match_query = self.build_match_query(query)
+        if not match_query:
+            return []
+
+        sql = (
+            "SELECT m.event_id, bm25(internet_events_fts, 3.0, 1.0) AS score "
+            "FROM internet_events_fts "
+            "JOIN internet_events_fts_map m ON m.doc_id = internet_events_fts.rowid "
+            "WHERE internet_events_fts MATCH :query ORDER BY score"
+        )
+        params = {"query": match_query}
+        if limit:
+            sql += " LIMIT :limit"
+            params["limit"] = limit
+
+        # FTS5 的 bm25() 越小越相关，这里取反后按降序返回
+        return [(row[0], -row[1]) for row in conn.execute(text(sql), params)]
+
+    def match_clause(self, model, query, conn=None):
+        match_query = self.build_match_query(query)
+        subquery = text(
+            "SELECT m.event_id FROM internet_events_fts "
+            "JOIN internet_events_fts_map m ON m.doc_id = internet_events_fts.rowid "
+            "WHERE internet_events_fts MATCH :fts_query"
+        ).bindparams(fts_query=match_query).columns(column('event_id'))
+        return model.id.in_(subquery)
+
+    def match_template(self, model):
+        subquery = text(
+            "SELECT m.event_id FROM internet_events_fts "
+            "JOIN internet_events_fts_map m ON m.doc_id = internet_events_fts.rowid "
+            "WHERE internet_events_fts MATCH :fts_query"
+        ).bindparams(bindparam('fts_query')).columns(column('event_id'))
+        return model.id.in_(subquery), 'fts_query'
+
+    def match_param(self, query, conn=None):
+        return self.build_match_query(query)
+
+    def ranked_subquery(self, query):
+        # bm25() 越小越相关，取反后与其他后端一致按降序排列
+        return text(
+            "SELECT m.event_id, -bm25(internet_events_fts, 3.0, 1.0) AS score FROM internet_events_fts "
+            "JOIN internet_events_fts_map m ON m.doc_id = internet_events_fts.rowid "
+            "WHERE internet_events_fts MATCH :fts_query"
+        ).bindparams(fts_query=self.build_match_query(query)).columns(
+            column('event_id'), column('score')
+        ).subquery('search_rank')
+
+    def rebuild(self, conn):
+        conn.execute(text("DELETE FROM internet_events_fts"))
+        conn.execute(text("DELETE FROM internet_events_fts_map"))
+        batch = []
+        for row in _iter_source_rows(conn):
+            batch.append(tuple(row))
+            if len(batch) >= 1000:
+                self.index_events(conn, batch)
+                batch = []
+        self.index_events(conn, batch)
+
+
+class MySQLFulltextBackend(SearchBackend):
+    """MySQL FULLTEXT 后端（ngram 解析器，默认按两个字切分中文）"""
+
+    name = "mysql_ngram"
+
+    def ensure_schema(self, conn):
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS internet_events_search ("
+            "event_id VARCHAR(64) NOT NULL PRIMARY KEY, "
+            "title VARCHAR(200), "
+            "body MEDIUMTEXT, "
+            "FULLTEXT KEY ft_internet_events_search (title, body) WITH PARSER ngram"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+        ))
+
+    def index_event(self, conn, event_id, title, description, keywords):
+        title, body = _document_fields(title, description, keywords)
+        conn.execute(
+            text(
+                "INSERT INTO internet_events_search (event_id, title, body) "
+                "VALUES (:event_id, :title, :body) "
+                "ON DUPLICATE KEY UPDATE title = VALUES(title), body = VALUES(body)"
+            ),
+            {"event_id": event_id, "title": title, "body": body}
+        )
+
+    def index_events(self, conn, rows):
+        params = []
+        for event_id, title, description, keywords in rows:
+            title, body = _document_fields(title, description, keywords)
+            params.append({"event_id": event_id, "title": title, "body": body})
+        if params:
+            conn.execute(
+                text(
+                    "INSERT INTO internet_events_search (event_id, title, body) "
+                    "VALUES (:event_id, :title, :body) "
+                    "ON DUPLICATE KEY UPDATE title = VALUES(title), body = VALUES(body)"
+                ),
+                params
+            )
+
+    def remove_event(self, conn, event_id):
+        conn.execute(
+            text("DELETE FROM internet_events_search WHERE event_id = :event_id"),
+            {"event_id": event_id}
+        )
+
+    @staticmethod
+    def build_match_query(query):
+        """布尔模式：每个词都必须出现，词内按 ngram 短语匹配；最后一个拉丁词按前缀匹配"""
+        terms = [term for term in _TOKEN_RE.findall((query or '').lower()) if term.strip()]
+        clauses = [f'+"{term}"' for term in terms]
+        if terms and not _CJK_RE.fullmatch(terms[-1]):
+            clauses[-1] = f'+{terms[-1]}*'
+        return ' '.join(clauses)
+
+    def search(self, conn, query, limit=None):
+        match_query = self.build_match_query(query)
+        if not match_query:
+            return []
+
+        sql = (
+            "SELECT event_id, MATCH(title, body) AGAINST(:query IN BOOLEAN MODE) AS score "
+            "FROM internet_events_search "
+            "WHERE MATCH(title, body) AGAINST(:query IN BOOLEAN MODE) "
+            "ORDER BY score DESC"
+        )
+        params = {"query": match_query}
+        if limit:
+            sql += " LIMIT :limit"
+            params["limit"] = limit
+
+        return [(row[0], row[1]) for row in conn.execute(text(sql), params)]
+
+    def match_clause(self, model, query, conn=None):
+        subquery = text(
+            "SELECT event_id FROM internet_events_search "
+            "WHERE MATCH(title, body) AGAINST(:ft_query IN BOOLEAN MODE)"
+        ).bindparams(ft_query=self.build_match_query(query)).columns(column('event_id'))
+        return model.id.in_(subquery)
+
+    def match_template(self, model):
+        subquery = text(
+            "SELECT event_id FROM internet_events_search "
+            "WHERE MATCH(title, body) AGAINST(:ft_query IN BOOLEAN MODE)"
+        ).bindparams(bindparam('ft_query')).columns(column('event_id'))
+        return model.id.in_(subquery), 'ft_query'
+
+    def match_param(self, query, conn=None):
+        return self.build_match_query(query)
+
+    def ranked_subquery(self, query):
+        return text(
+            "SELECT event_id, MATCH(title, body) AGAINST(:ft_query IN BOOLEAN MODE) AS score "
+            "FROM internet_events_search "
+            "WHERE MATCH(title, body) AGAINST(:ft_query IN BOOLEAN MODE)"
+        ).bindparams(ft_query=self.build_match_query(query)).columns(
+            column('event_id'), column('score')
+        ).subquery('search_rank')
+
+    def rebuild(self, conn):
+        conn.execute(text("DELETE FROM internet_events_search"))
+        batch = []
+        for row in _iter_source_rows(conn):
+            batch.append(tuple(row))
+            if len(batch) >= 1000:
+                self.index_events(conn, batch)
+                batch = []
+        self.index_events(conn, batch)
+
+
+class InvertedIndexBackend(SearchBackend):
+    """纯 Python 倒排索引（无 FTS 支持时的回退方案）
+
+    首次查询时从数据库加载，之后随写入增量更新；按 BM25 打分。
+    """
+
+    name = "python_bm25"
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)  # token -> {event_id: 词频}
+        self._doc_tokens = {}  # event_id -> 出现过的词，删除时只需访问这些倒排表
+        self._doc_lengths = {}
+        self._total_length = 0
+        self._sorted_tokens = None  # 前缀查询用的有序词表，词表变化时置空、下次查询时重建
+        self._loaded = False
+
+    def _add(self, event_id, title, description, keywords):
+        title, body = _document_fields(title, description, keywords)
+        # 标题权重更高：标题中的词重复计入
+        tokens = tokenize(title) * 3 + tokenize(body)
+        for token in tokens:
+            if token not in self._postings:
+                self._sorted_tokens = None
+            postings = self._postings[token]
+            postings[event_id] = postings.get(event_id, 0) + 1
+        self._doc_tokens[event_id] = set(tokens)
+        self._doc_lengths[event_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def _discard(self, event_id):
+        length = self._doc_lengths.pop(event_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for token in self._doc_tokens.pop(event_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[token]
+                    self._sorted_tokens = None
+
+    def _prefix_postings(self, prefix):
+        """以 prefix 开头的所有词的倒排表合并为一个（词频相加），在有序词表上二分定位"""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        merged = {}
+        for position in range(bisect_left(self._sorted_tokens, prefix), len(self._sorted_tokens)):
+            token = self._sorted_tokens[position]
+            if not token.startswith(prefix):
+                break
+            for event_id, tf in self._postings[token].items():
+                merged[event_id] = merged.get(event_id, 0) + tf
+        return merged
+
+    def _ensure_loaded(self, conn):
+        if not self._loaded:
+            self.rebuild(conn)
+
+    def index_event(self, conn, event_id, title, description, keywords):
+        with self._lock:
+            if not self._loaded:
+                return  # 尚未加载，首次查询时会整体构建
+            self._discard(event_id)
+            self._add(event_id, title, description, keywords)
+
+    def remove_event(self, conn, event_id):
+        with self._lock:
+            if self._loaded:
+                self._discard(event_id)
+
+    def search(self, conn, query, limit=None):
+        tokens, prefix = query_tokens(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            self._ensure_loaded(conn)
+
+            doc_count = len(self._doc_lengths)
+            if not doc_count:
+                return []
+            avg_length = self._total_length / doc_count
+
+            # 所有词都必须出现（与 SQL 后端语义一致），最后一个拉丁词按前缀匹配
+            exact_tokens = set(tokens[:-1] if prefix else tokens)
+            postings_list = [self._postings.get(token, {}) for token in exact_tokens]
+            if prefix:
+                postings_list.append(self._prefix_postings(tokens[-1]))
+            postings_list.sort(key=len)
+            candidates = set(postings_list[0])
+            for postings in postings_list[1:]:
+                candidates &= postings.keys()
+
+            scores = {}
+            for postings in postings_list:
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for event_id in candidates:
+                    tf = postings[event_id]
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._doc_lengths[event_id] / avg_length)
+                    scores[event_id] = scores.get(event_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def match_clause(self, model, query, conn=None):
+        return model.id.in_([event_id for event_id, _ in self.search(conn, query)])
+
+    def match_template(self, model):
+        return model.id.in_(bindparam('match_ids', expanding=True)), 'match_ids'
+
+    def match_param(self, query, conn=None):
+        return [event_id for event_id, _ in self.search(conn, query)]
+
+    def rebuild(self, conn):
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_tokens = {}
+            self._doc_lengths = {}
+            self._total_length = 0
+            self._sorted_tokens = None
+            for row in _iter_source_rows(conn):
+                self._add(row[0], row[1], row[2], row[3])
+            self._loaded = True
+
+
+# 内存倒排索引按 ID 回表时每批的 ID 数（远低于 SQLite 的绑定参数上限）
+_ID_BATCH_SIZE = 500
+
+# 每个数据库一个后端实例
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def _sqlite_has_fts5(conn):
+    """检测 SQLite 是否编译了 FTS5（只读连接无法创建探测表，先查编译选项）"""
+    try:
+        options = {row[0] for row in conn.execute(text("PRAGMA compile_options"))}
+        if "ENABLE_FTS5" in options:
+            return True
+    except Exception:
+        pass
+    try:
+        conn.execute(text("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)"))
+        conn.execute(text("DROP TABLE IF EXISTS temp._fts5_probe"))
+        return True
+    except Exception:
+        return False
+
+
+def get_search_backend(conn):
+    """按连接所属数据库选择（并缓存）全文检索后端"""
+    engine = conn.engine
+    key = str(engine.url)
+    backend = _backends.get(key)
+    if backend is not None:
+        return backend
+
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            dialect = engine.dialect.name
+            if dialect == 'sqlite' and _sqlite_has_fts5(conn):
+                backend = SQLiteFTSBackend()
+            elif dialect == 'mysql':
+                backend = MySQLFulltextBackend()
+            else:
+                backend = InvertedIndexBackend()
+            print(f"🔎 全文检索后端: {backend.name}")
+            _backends[key] = backend
+    return backend
+
+
+def keyword_clause(conn, model, keyword):
+    """关键词过滤条件：优先走全文索引，输入无法分词时退回 LIKE"""
+    if tokenize(keyword, for_query=True):
+        return get_search_backend(conn).match_clause(model, keyword, conn)
+    return or_(model.title.contains(keyword), model.description.contains(keyword))
+
+
+def ranked_search(session, keyword, clauses=(), limit=None):
+    """按相关度返回命中关键词且满足 clauses 的事件，最多 limit 条；输入无法分词时返回 None
+
+    SQL 后端把打分子查询与事件表联表，排序和 LIMIT 都在数据库中完成；
+    内存倒排索引按相关度分批取 ID 查询，避免把全部命中绑定成一个巨大的 IN 列表。
+    """
+    if not tokenize(keyword, for_query=True):
+        return None
+
+    conn = session.connection()
+    backend = get_search_backend(conn)
+    query = session.query(InternetEvent).filter(*clauses)
+    rank = backend.ranked_subquery(keyword)
+    if rank is not None:
+        query = query.join(rank, rank.c.event_id == InternetEvent.id).order_by(
+            rank.c.score.desc(), InternetEvent.date.desc(), InternetEvent.id
+        )
+        return query.limit(limit).all()
+
+    ranked_ids = [event_id for event_id, _ in backend.search(conn, keyword)]
+    results = []
+    for start in range(0, len(ranked_ids), _ID_BATCH_SIZE):
+        batch = ranked_ids[start:start + _ID_BATCH_SIZE]
+        found = {event.id: event for event in query.filter(InternetEvent.id.in_(batch))}
+        results.extend(found[event_id] for event_id in batch if event_id in found)
+        if limit and len(results) >= limit:
+            return results[:limit]
+    return results
+
+
+def create_search_index(conn):
+    """迁移步骤：创建全文索引表并为已有事件建立索引"""
+    backend = get_search_backend(conn)
+    backend.ensure_schema(conn)
+    backend.rebuild(conn)
+
+
+def update_search_schema(conn):
+    """迁移步骤：补齐已有全文索引表上新增的索引（不重建索引内容）"""
+    get_search_backend(conn).ensure_schema(conn)
+
+
+# ==================== 与 InternetEvent 写入保持同步 ====================
+
+_INDEXED_FIELDS = ('title', 'description', 'keywords')
+
+
+@event.listens_for(InternetEvent, 'after_insert')
+def _index_after_insert(mapper, connection, target):
+    try:
+        get_search_backend(connection).index_event(
+            connection, target.id, target.title, target.description, target.keywords
+        )
+    except Exception as e:
+        print(f"⚠️ 更新全文索引失败: {e}")
+
+
+@event.listens_for(InternetEvent, 'after_update')
+def _index_after_update(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in _INDEXED_FIELDS):
+        return
+    try:
+        get_search_backend(connection).index_event(
+            connection, target.id, target.title, target.description, target.keywords
+        )
+    except Exception as e:
+        print(f"⚠️ 更新全文索引失败: {e}")
+
+
+@event.listens_for(InternetEvent, 'after_delete')
+def _index_after_delete(mapper, connection, target):
+    try:
+        get_search_backend(connection).remove_event(connection, target.id)
+    except Exception as e:
+        print(f"⚠️ 删除全文索引失败: {e}")
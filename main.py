@@ -78,6 +78,14 @@ def show_error_dialog(error_msg):
     )
     root.destroy()
 
+def release_database():
+    """程序退出时释放各线程共享的数据库会话"""
+    try:
+        from core.database.models import remove_db_session
+        remove_db_session()
+    except Exception as e:
+        print(f"⚠️ 释放数据库会话失败: {e}")
+
 def main():
     """主函数"""
     try:
@@ -118,6 +126,7 @@ def main():
         print(f"❌ {error_msg}")
         show_error_dialog(error_msg)
     finally:
+        release_database()
         print("🔚 程序退出")
 
 if __name__ == "__main__":
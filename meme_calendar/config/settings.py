@@ -40,3 +40,6 @@ UI_CONFIG = {
     "language": "zh-CN",
     "page_size": 20
 }
+
+# 流式读取（分析、导出）时每批取回的行数
+STREAM_BATCH_SIZE = 1000
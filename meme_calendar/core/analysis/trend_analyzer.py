@@ -1,13 +1,24 @@
 """
 趋势分析器
+
+查询结果通过服务端游标分批读取（yield_per），分析整个归档时内存占用与事件总数无关。
 """
 
 from datetime import datetime, timedelta
 from collections import Counter
 
+from sqlalchemy import select
+
+from config.settings import STREAM_BATCH_SIZE
+
 class TrendAnalyzer:
-    def __init__(self, db_session):
+    def __init__(self, db_session, batch_size=STREAM_BATCH_SIZE):
         self.db_session = db_session
+        self.batch_size = batch_size
+    
+    def _stream(self, statement):
+        """分批流式执行查询，逐行产出"""
+        return self.db_session.execute(statement.execution_options(yield_per=self.batch_size))
     
     def get_daily_trends(self, days=7):
         """获取每日趋势"""
@@ -15,32 +26,33 @@ class TrendAnalyzer:
         start_date = end_date - timedelta(days=days)
         
         from core.database.models import InternetEvent
-        events = self.db_session.query(InternetEvent).filter(
-            InternetEvent.date.between(start_date, end_date)
-        ).all()
+        rows = self._stream(
+            select(InternetEvent.keywords).where(InternetEvent.date.between(start_date, end_date))
+        )
         
-        # 分析关键词频率
-        all_keywords = []
-        for event in events:
-            all_keywords.extend(event.keywords or [])
+        # 分析关键词频率（逐行累加，不保存事件列表）
+        keyword_counts = Counter()
+        for keywords, in rows:
+            keyword_counts.update(keywords or [])
         
-        keyword_counts = Counter(all_keywords)
         return keyword_counts.most_common(10)
     
-    def get_heat_trend(self, start_date, end_date):
-        """获取热度趋势"""
+    def iter_heat_trend(self, start_date, end_date):
+        """逐条产出热度趋势数据点"""
         from core.database.models import InternetEvent
         
-        events = self.db_session.query(InternetEvent).filter(
-            InternetEvent.date.between(start_date, end_date)
-        ).order_by(InternetEvent.date).all()
-        
-        trend_data = []
-        for event in events:
-            trend_data.append({
-                'date': event.date.isoformat(),
-                'heat_score': event.heat_score,
-                'title': event.title
-            })
-        
-        return trend_data
+        rows = self._stream(
+            select(InternetEvent.date, InternetEvent.heat_score, InternetEvent.title)
+            .where(InternetEvent.date.between(start_date, end_date))
+            .order_by(InternetEvent.date)
+        )
+        for event_date, heat_score, title in rows:
+            yield {
+                'date': event_date.isoformat(),
+                'heat_score': heat_score,
+                'title': title
+            }
+    
+    def get_heat_trend(self, start_date, end_date):
+        """获取热度趋势"""
+        return list(self.iter_heat_trend(start_date, end_date))
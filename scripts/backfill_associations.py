@@ -0,0 +1,18 @@
+# scripts/backfill_associations.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from core.database.database_manager import db_manager
+
+def backfill_associations():
+    """根据 internet_events 的 JSON 列一次性重建分类/关键词关联表"""
+    print("🔄 开始回填 event_categories / event_keywords ...")
+    count = db_manager.backfill_associations()
+    categories = db_manager.get_all_categories()
+    print(f"📊 共处理 {count} 个事件，{len(categories)} 个分类")
+    for category, event_count in categories[:20]:
+        print(f"   - {category}: {event_count}")
+
+if __name__ == "__main__":
+    backfill_associations()
@@ -0,0 +1,58 @@
+# scripts/benchmark_query_builder.py
+import sys
+import os
+import time
+import argparse
+from datetime import date
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from core.database.database_manager import db_manager
+from core.database.query_builder import advanced_search_builder, clear_statement_templates, template_count
+
+# 模拟 Web 后端的几种常见请求
+REQUESTS = [
+    {"start_date": date(2024, 1, 1), "end_date": date(2024, 1, 31)},
+    {"event_type": "meme", "order_by": "heat"},
+    {"category": "网络梗", "min_heat": 50},
+    {"start_date": date(2024, 3, 1), "end_date": date(2024, 6, 30), "event_type": "meme", "min_heat": 30},
+    {"tag": "抽象", "order_by": "heat", "descending": False},
+]
+
+def run(session, iterations, execute, cached):
+    """按轮次发出所有请求，返回每次查询的平均耗时（微秒）"""
+    conn = session.connection()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for params in REQUESTS:
+            if not cached:
+                # 每次重新构建表达式树（等同于不缓存模板的旧实现）
+                clear_statement_templates()
+            statement, values = advanced_search_builder(limit=20, **params).build_statement(conn)
+            if execute:
+                session.execute(statement, values).scalars().all()
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(REQUESTS)) * 1e6
+
+def benchmark_query_builder(iterations):
+    """对比每次重建语句与复用语句模板的单次查询开销"""
+    if not db_manager.connect():
+        print("❌ 无法连接数据库")
+        return
+
+    session = db_manager.session
+    # 预热：建立连接、选择全文检索后端、填充编译缓存
+    run(session, 5, execute=True, cached=True)
+
+    print(f"⏱️ 每轮 {len(REQUESTS)} 种请求，共 {iterations} 轮")
+    for label, execute in (("只构建语句", False), ("构建并执行", True)):
+        rebuilt = run(session, iterations, execute, cached=False)
+        cached = run(session, iterations, execute, cached=True)
+        print(f"📊 {label}: 每次重建 {rebuilt:.1f}µs | 复用模板 {cached:.1f}µs | "
+              f"节省 {(1 - cached / rebuilt) * 100:.0f}%（约 {1e6 / cached:.0f} 次/秒）")
+    print(f"📦 缓存的语句模板: {template_count()} 个")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="查询构建器语句模板的性能测试")
+    parser.add_argument("--iterations", type=int, default=500, help="测试轮数")
+    args = parser.parse_args()
+    benchmark_query_builder(args.iterations)
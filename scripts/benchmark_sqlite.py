@@ -0,0 +1,145 @@
+# scripts/benchmark_sqlite.py
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+import threading
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import SQLITE_PRAGMAS
+from core.database.models import InternetEvent, apply_sqlite_pragmas
+from core.database.migrations import run_migrations
+from core.database.database_manager import DatabaseManager
+from core.database.query_cache import QueryCache
+
+# 默认参数（回滚日志、synchronous=FULL、无 mmap）与 settings.SQLITE_PRAGMAS
+PROFILES = {
+    "默认": {},
+    "调优": SQLITE_PRAGMAS,
+}
+
+START_DATE = date(2023, 1, 1)
+DAYS = 730
+
+def make_events(count, seed):
+    """生成测试事件，日期分布在两年内"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "id": f"bench_{seed}_{i}",
+            "date": START_DATE + timedelta(days=rng.randrange(DAYS)),
+            "title": f"测试事件 {i}",
+            "description": "性能测试数据 " * 10,
+            "categories": [rng.choice(["网络梗", "社会事件", "科技趋势"])],
+            "keywords": [f"标签{rng.randrange(50)}"],
+            "heat_score": rng.randrange(100)
+        }
+
+def random_range(rng, days=30):
+    start = START_DATE + timedelta(days=rng.randrange(DAYS - days))
+    return start, start + timedelta(days=days)
+
+def run_profile(pragmas, path, import_count, commit_count, query_count):
+    """在一个新数据库上依次执行各项负载，返回 {负载: 耗时描述}"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if pragmas:
+        apply_sqlite_pragmas(engine, pragmas)
+    run_migrations(engine)
+    session_factory = sessionmaker(bind=engine)
+    # 不使用结果缓存，会话按线程设置（DatabaseManager.session 是线程局部的）
+    manager = DatabaseManager()
+    manager.set_query_cache(QueryCache(enabled=False))
+    manager.session = session_factory()
+    results = {}
+
+    start = time.perf_counter()
+    manager.bulk_upsert_events(make_events(import_count, 1), batch_size=500)
+    elapsed = time.perf_counter() - start
+    results["批量导入"] = f"{elapsed:.2f}s（{import_count / elapsed:.0f} 条/秒）"
+
+    start = time.perf_counter()
+    manager.bulk_upsert_events(make_events(commit_count, 2), batch_size=1)
+    elapsed = time.perf_counter() - start
+    results["逐条提交"] = f"{elapsed:.2f}s（{elapsed / commit_count * 1000:.2f}ms/条）"
+
+    # 单行更新各自提交：几乎只剩事务提交（日志写入和磁盘同步）的开销
+    rng = random.Random(6)
+    start = time.perf_counter()
+    for _ in range(commit_count):
+        manager.session.execute(
+            update(InternetEvent)
+            .where(InternetEvent.id == f"bench_1_{rng.randrange(import_count)}")
+            .values(heat_score=rng.randrange(100))
+        )
+        manager.session.commit()
+    elapsed = time.perf_counter() - start
+    results["单行事务"] = f"{elapsed / commit_count * 1000:.3f}ms/次"
+
+    rng = random.Random(3)
+    start = time.perf_counter()
+    for _ in range(query_count):
+        manager.get_event_rows_by_date_range(*random_range(rng))
+    elapsed = time.perf_counter() - start
+    results["日期范围查询"] = f"{elapsed / query_count * 1000:.2f}ms/次"
+
+    # 写入期间另一个线程持续读取：统计读取延迟
+    latencies = []
+    writing = threading.Event()
+    writing.set()
+
+    def reader():
+        manager.session = session_factory()
+        reader_rng = random.Random(4)
+        while writing.is_set():
+            query_start = time.perf_counter()
+            manager.get_event_rows_by_date_range(*random_range(reader_rng))
+            latencies.append(time.perf_counter() - query_start)
+        manager.session.close()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        manager.bulk_upsert_events(make_events(commit_count, 5), batch_size=10)
+    finally:
+        writing.clear()
+        thread.join()
+    latencies.sort()
+    if latencies:
+        results["写入时读取"] = (
+            f"{len(latencies)} 次，中位数 {latencies[len(latencies) // 2] * 1000:.2f}ms，"
+            f"最慢 {latencies[-1] * 1000:.1f}ms"
+        )
+
+    manager.session.close()
+    engine.dispose()
+    return results
+
+def benchmark_sqlite(import_count, commit_count, query_count):
+    """在临时目录中分别用默认参数和调优参数建库，对比导入与查询耗时"""
+    print(f"⏱️ 批量导入 {import_count} 条，逐条提交 {commit_count} 条，日期范围查询 {query_count} 次")
+    all_results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, pragmas in PROFILES.items():
+            print(f"🔄 测试 {name} 参数: {pragmas or 'SQLite 默认值'}")
+            path = os.path.join(directory, f"bench_{len(all_results)}.db")
+            all_results[name] = run_profile(pragmas, path, import_count, commit_count, query_count)
+
+    print("\n📊 结果:")
+    for workload in next(iter(all_results.values())):
+        print(f"   {workload}")
+        for name, results in all_results.items():
+            print(f"      {name}: {results.get(workload, '-')}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="对比 SQLite 默认参数与 SQLITE_PRAGMAS 的导入和查询性能")
+    parser.add_argument("--import-count", type=int, default=20000, help="批量导入的事件数")
+    parser.add_argument("--commit-count", type=int, default=300, help="逐条提交的事件数")
+    parser.add_argument("--queries", type=int, default=200, help="日期范围查询次数")
+    args = parser.parse_args()
+    benchmark_sqlite(args.import_count, args.commit_count, args.queries)
@@ -4,6 +4,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from core.database.models import get_db_session, InternetEvent
+from config.settings import STREAM_BATCH_SIZE
 
 def check_data():
     """检查数据库中的数据"""
@@ -14,8 +15,10 @@ def check_data():
         event_count = session.query(InternetEvent).count()
         print(f"📊 数据库中的事件总数: {event_count}")
         
-        # 检查具体事件
-        events = session.query(InternetEvent).all()
+        # 检查具体事件（只取需要的列，分批流式读取）
+        events = session.query(
+            InternetEvent.id, InternetEvent.date, InternetEvent.title
+        ).order_by(InternetEvent.date, InternetEvent.id).yield_per(STREAM_BATCH_SIZE)
         for event in events:
             print(f"📅 事件: {event.title} | 日期: {event.date} | ID: {event.id}")
             
@@ -0,0 +1,41 @@
+# scripts/import_events.py
+import sys
+import os
+import json
+import csv
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from core.database.database_manager import db_manager
+
+def iter_events(file_path):
+    """逐行读取事件文件（.jsonl / .csv），不一次性载入内存"""
+    if file_path.endswith('.csv'):
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                # CSV 中的列表字段用 | 分隔
+                for field in ('categories', 'keywords', 'sources', 'media_urls'):
+                    if row.get(field):
+                        row[field] = [v.strip() for v in row[field].split('|') if v.strip()]
+                yield row
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+def import_events(file_path, batch_size):
+    """批量导入事件文件"""
+    print(f"📥 开始导入: {file_path}")
+    stats = db_manager.bulk_upsert_events(iter_events(file_path), batch_size=batch_size)
+    print(f"🎉 导入完成: 新增 {stats['inserted']} | 更新 {stats['updated']} | 跳过 {stats['skipped']}")
+    if stats['failed_ids']:
+        print(f"❌ 写入失败的事件 ID: {', '.join(stats['failed_ids'])}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="批量导入/更新事件")
+    parser.add_argument("file", help="事件文件路径（JSON Lines 或 CSV）")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批提交的行数")
+    args = parser.parse_args()
+    import_events(args.file, args.batch_size)
@@ -0,0 +1,61 @@
+# scripts/index_advisor.py
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from core.database.database_manager import db_manager
+from core.database.index_advisor import analyze, recommend, migration_snippet, verify
+from core.database.migrations import LATEST_VERSION
+
+def index_advisor(show_all=False, emit_migration=False, check=False, max_filters=None):
+    """对查询构建器的各种筛选/排序组合执行 EXPLAIN 并给出索引建议"""
+    if not db_manager.connect():
+        print("❌ 无法连接数据库")
+        return
+
+    session = db_manager.session
+    print(f"🔍 数据库: {session.get_bind().dialect.name}")
+    results = analyze(session, max_filters)
+
+    problems = [r for r in results if r["problem"]]
+    print(f"📊 共检查 {len(results)} 种查询形状，{len(problems)} 种存在全表扫描或额外排序")
+    for result in (results if show_all else problems):
+        flags = []
+        if result["full_scan"]:
+            flags.append("全表扫描")
+        if result["filesort"]:
+            flags.append("额外排序")
+        filters = ", ".join(result["filters"]) or "无筛选"
+        print(f"\n{'⚠️' if result['problem'] else '✅'} [{filters}] 按 {result['order_by']} 排序 {' / '.join(flags)}")
+        for line in result["plan"]:
+            print(f"     {line}")
+        if result["problem"] and result["suggestion"]:
+            print(f"     💡 建议索引: ({', '.join(result['suggestion'])})")
+
+    recommendations = recommend(results)
+    if not recommendations:
+        print("\n✅ 没有需要新增的索引")
+        return
+
+    print("\n💡 建议新增的复合索引:")
+    for columns, count in recommendations:
+        note = f"受益查询形状 {count} 种" if count else "避免同一等值条件的其他排序退化"
+        print(f"   - ({', '.join(columns)})  {note}")
+
+    if check:
+        before, after = verify(session, recommendations, max_filters)
+        print(f"\n🔬 临时创建索引后有问题的查询形状: {before} → {after}")
+
+    if emit_migration:
+        print("\n📝 迁移代码:\n")
+        print(migration_snippet(recommendations, LATEST_VERSION + 1))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN 查询构建器生成的查询并给出索引建议")
+    parser.add_argument("--all", action="store_true", help="列出所有查询形状的执行计划")
+    parser.add_argument("--max-filters", type=int, help="组合中最多包含的筛选条件数")
+    parser.add_argument("--verify", action="store_true", help="（SQLite）临时创建建议的索引并重新检查")
+    parser.add_argument("--emit-migration", action="store_true", help="输出建议索引的迁移代码")
+    args = parser.parse_args()
+    index_advisor(args.all, args.emit_migration, args.verify, args.max_filters)
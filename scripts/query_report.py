@@ -0,0 +1,79 @@
+# scripts/query_report.py
+import sys
+import os
+import json
+import argparse
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config.settings import QUERY_LOG_CONFIG
+
+def load_records(path, since=None):
+    """逐行读取查询日志，跳过无法解析的行"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if since and record.get("time", "") < since:
+                continue
+            yield record
+
+def query_report(path, top, since=None):
+    """按 DatabaseManager 方法汇总查询日志，并列出最慢的语句"""
+    if not os.path.exists(path):
+        print(f"❌ 日志文件不存在: {path}")
+        return
+
+    methods = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0, "rows": 0})
+    statements = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "max_rows": 0, "method": None})
+    total_ms = 0.0
+    for record in load_records(path, since):
+        elapsed = record.get("elapsed_ms", 0.0)
+        total_ms += elapsed
+
+        stats = methods[record.get("method", "unknown")]
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed
+        stats["max_ms"] = max(stats["max_ms"], elapsed)
+        stats["slow"] += 1 if record.get("slow") else 0
+        # rows_returned 为查询读取的行数，写入语句为 None
+        rows = record.get("rows_returned") or 0
+        stats["rows"] += rows
+
+        statement = statements[record.get("statement", "")]
+        statement["calls"] += 1
+        statement["total_ms"] += elapsed
+        statement["max_ms"] = max(statement["max_ms"], elapsed)
+        statement["max_rows"] = max(statement["max_rows"], rows)
+        statement["method"] = record.get("method")
+
+    if not methods:
+        print("📭 日志中没有记录")
+        return
+
+    print(f"📊 共 {sum(s['calls'] for s in methods.values())} 条语句，总耗时 {total_ms:.1f}ms")
+    print(f"{'方法':<45}{'次数':>8}{'总耗时ms':>12}{'平均ms':>10}{'最大ms':>10}{'慢查询':>8}{'读取行数':>10}")
+    for method, stats in sorted(methods.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        print(
+            f"{method:<45}{stats['calls']:>8}{stats['total_ms']:>12.1f}"
+            f"{stats['total_ms'] / stats['calls']:>10.2f}{stats['max_ms']:>10.1f}{stats['slow']:>8}{stats['rows']:>10}"
+        )
+
+    print(f"\n🐢 总耗时最高的 {top} 条语句:")
+    ranked = sorted(statements.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:top]
+    for statement, stats in ranked:
+        print(
+            f"   - {stats['total_ms']:.1f}ms / {stats['calls']} 次（最大 {stats['max_ms']:.1f}ms，"
+            f"最多读取 {stats['max_rows']} 行）[{stats['method']}]"
+        )
+        print(f"     {statement[:200]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="汇总慢查询日志")
+    parser.add_argument("--log", default=QUERY_LOG_CONFIG["path"], help="日志文件路径")
+    parser.add_argument("--top", type=int, default=10, help="列出的语句数")
+    parser.add_argument("--since", help="只统计此时间之后的记录，如 2025-01-01T00:00")
+    args = parser.parse_args()
+    query_report(args.log, args.top, args.since)
@@ -0,0 +1,20 @@
+# scripts/rebuild_daily_stats.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from datetime import date
+from core.database.database_manager import db_manager
+
+def rebuild_daily_stats():
+    """根据 internet_events 全量重建 daily_event_stats 聚合表"""
+    print("🔄 开始重建 daily_event_stats ...")
+    days = db_manager.rebuild_daily_stats()
+    stats = db_manager.get_daily_stats(date.min, date.max)
+    total = sum(row.event_count for row in stats)
+    print(f"📊 共 {days} 天，{total} 个事件")
+    for row in sorted(stats, key=lambda r: r.event_count, reverse=True)[:10]:
+        print(f"   - {row.date}: {row.event_count} 个事件，最高热度 {row.max_heat}")
+
+if __name__ == "__main__":
+    rebuild_daily_stats()
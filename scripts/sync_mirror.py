@@ -0,0 +1,63 @@
+# scripts/sync_mirror.py
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from core.database.mirror import MirrorSync, MIRROR_MODELS
+
+def sync_mirror(source_url=None, mirror_url=None, tables=None, reset=False, batch_size=None):
+    """把 MySQL 中水位之后变更的行同步到本地 SQLite 镜像"""
+    try:
+        mirror = MirrorSync.from_config(source_url, mirror_url)
+    except Exception as e:
+        print(f"❌ 无法创建同步任务: {e}")
+        return
+
+    if batch_size:
+        mirror.batch_size = batch_size
+    if reset:
+        mirror.reset(tables)
+        print("🔄 已清空镜像表和水位，将全量同步")
+
+    start = time.perf_counter()
+    try:
+        stats = mirror.sync(tables)
+    except Exception as e:
+        print(f"❌ 同步失败（已提交的批次保留，下次从断点继续）: {e}")
+        return
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ 同步完成，用时 {elapsed:.1f}s")
+    for table_name, count in stats.items():
+        print(f"   - {table_name}: {count} 行")
+    print("⚠️ 源库中删除的行不会同步到镜像，需要时使用 --reset 全量重同步")
+
+def show_status(source_url=None, mirror_url=None):
+    """显示镜像中各表的水位和行数"""
+    mirror = MirrorSync.from_config(source_url, mirror_url)
+    for table_name, info in mirror.status().items():
+        watermark = info["watermark"]
+        if watermark:
+            changed_at, last_id, synced_at = watermark
+            position = f"{changed_at} / {last_id}（同步于 {synced_at:%Y-%m-%d %H:%M:%S}）"
+        else:
+            position = "未同步"
+        print(f"📊 {table_name}: {info['rows']} 行，水位 {position}")
+
+if __name__ == "__main__":
+    table_names = [model.__tablename__ for model in MIRROR_MODELS]
+    parser = argparse.ArgumentParser(description="从 MySQL 增量同步本地 SQLite 镜像")
+    parser.add_argument("--source", help="源库 URL（默认 settings.DATABASE_URL）")
+    parser.add_argument("--mirror", help="镜像库 URL（默认 settings.MIRROR_CONFIG['url']）")
+    parser.add_argument("--tables", nargs="+", choices=table_names, help="只同步这些表")
+    parser.add_argument("--batch-size", type=int, help="每批读取的行数")
+    parser.add_argument("--reset", action="store_true", help="清空镜像表和水位后全量同步")
+    parser.add_argument("--status", action="store_true", help="只显示同步状态")
+    args = parser.parse_args()
+
+    if args.status:
+        show_status(args.source, args.mirror)
+    else:
+        sync_mirror(args.source, args.mirror, args.tables, args.reset, args.batch_size)
@@ -3,9 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from core.database.models import Base, init_database
+from core.database.models import Base, get_engine
+from core.database.migrations import run_migrations
 from config.settings import DATABASE_URL, SQLITE_URL, USE_MYSQL
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
 def update_database():
     """更新数据库表结构"""
@@ -18,15 +19,15 @@ def update_database():
         database_url = SQLITE_URL
         print("💾 使用 SQLite 数据库")
     
-    engine = create_engine(database_url)
+    engine = get_engine(database_url)
     
     try:
         # 删除所有表（注意：这会清空所有数据！）
         Base.metadata.drop_all(engine)
         print("🗑️ 旧表删除完成")
         
-        # 重新创建所有表（使用新的表结构）
-        Base.metadata.create_all(engine)
+        # 重新创建所有表（按迁移版本依次执行）
+        run_migrations(engine, force=True)
         print("✅ 新表创建成功")
         
         # 输出创建的表信息
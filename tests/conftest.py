@@ -0,0 +1,55 @@
+"""
+测试公共夹具 - 每个测试使用临时目录中的独立 SQLite 数据库
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database.models import get_engine
+from core.database.migrations import run_migrations
+from core.database.database_manager import DatabaseManager
+from core.database.query_cache import QueryCache
+
+
+def make_event(index, event_date=None, **fields):
+    """生成一条测试事件的字典"""
+    event = {
+        "id": f"test_{index:05d}",
+        "date": event_date or date(2024, 1, 1) + timedelta(days=index % 60),
+        "title": f"测试事件 {index}",
+        "description": "测试描述",
+        "categories": ["网络梗"],
+        "keywords": [],
+        "heat_score": index % 100
+    }
+    event.update(fields)
+    return event
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'events.db'}"
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = get_engine(database_url)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def manager(engine):
+    """绑定临时数据库、不使用结果缓存的 DatabaseManager"""
+    manager = DatabaseManager()
+    manager.set_query_cache(QueryCache(enabled=False))
+    manager.session = sessionmaker(bind=engine)()
+    yield manager
+    manager.session.close()
@@ -1,5 +1,103 @@
 """
-模块文档
+Web API 测试 - /events 的筛选、游标分页与 ETag 条件请求
 """
 
-# 待实现
+from datetime import date
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from core.database.async_repository import get_async_sessionmaker
+from ui.web.backend import main
+from ui.web.backend.dependencies import get_session
+from tests.conftest import make_event
+
+
+@pytest.fixture
+def client(manager, database_url, monkeypatch):
+    manager.bulk_upsert_events(
+        make_event(i, categories=["网络梗" if i % 2 else "社会事件"]) for i in range(30)
+    )
+
+    async def init_test_database():
+        return database_url
+
+    async def test_session():
+        async with get_async_sessionmaker(database_url)() as session:
+            yield session
+
+    # 临时数据库已由 engine 夹具完成迁移，启动时不再初始化配置中的数据库
+    monkeypatch.setattr(main, "init_async_database", init_test_database)
+    main.app.dependency_overrides[get_session] = test_session
+    with TestClient(main.app) as client:
+        yield client
+    main.app.dependency_overrides.clear()
+
+
+def test_events_filters_and_cursor_pages(client):
+    params = {"start_date": "2024-01-05", "end_date": "2024-01-20", "category": "网络梗", "limit": 3}
+    ids, cursor = [], None
+    while True:
+        response = client.get("/events", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        ids += [event["id"] for event in body["events"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    expected = [
+        event["id"] for event in sorted(
+            (make_event(i) for i in range(30) if i % 2),
+            key=lambda event: (event["date"], event["id"]), reverse=True
+        )
+        if date(2024, 1, 5) <= event["date"] <= date(2024, 1, 20)
+    ]
+    assert ids == expected
+
+
+def test_invalid_cursor_and_heat_band_rejected(client):
+    assert client.get("/events", params={"cursor": "不是游标"}).status_code == 400
+    assert client.get("/events", params={"heat": "extreme"}).status_code == 400
+
+
+def test_events_conditional_get(client, manager):
+    first = client.get("/events", params={"limit": 5})
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    cached = client.get("/events", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag and cached.content == b""
+
+    assert client.get("/events", params={"limit": 5}, headers={"If-None-Match": f'W/{etag}'}).status_code == 304
+    other = client.get("/events", params={"limit": 6}, headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+    assert manager.update_event("test_00003", {"title": "已修改"})
+    changed = client.get("/events", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    assert manager.delete_event("test_00004")
+    deleted = client.get("/events", params={"limit": 5}, headers={"If-None-Match": changed.headers["etag"]})
+    assert deleted.status_code == 200
+
+
+def test_bulk_import_changes_etag(client, manager):
+    etag = client.get("/events").headers["etag"]
+    manager.bulk_upsert_events([make_event(100)])
+    assert client.get("/events", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_facets_and_sample(client):
+    facets = client.get("/events/facets", params={"category": "网络梗"}).json()
+    assert {item["value"]: item["count"] for item in facets["category"]} == {"网络梗": 15, "社会事件": 15}
+    assert sum(item["count"] for item in facets["heat"]) == 15
+
+    sample = client.get("/events/sample", params={"limit": 4}).json()
+    assert len(sample["events"]) == 4
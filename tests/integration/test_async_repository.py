@@ -0,0 +1,72 @@
+"""
+异步数据访问测试 - AsyncEventRepository 与 DatabaseManager 的结果一致
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+
+from core.database.async_repository import AsyncEventRepository, get_async_sessionmaker
+from tests.conftest import make_event
+
+
+def run(database_url, operation, notify=None):
+    """在独立的事件循环中以新的 AsyncSession 执行 operation(repository)"""
+    async def main():
+        async with get_async_sessionmaker(database_url)() as session:
+            return await operation(AsyncEventRepository(session, notify))
+    return asyncio.run(main())
+
+
+def test_bulk_upsert_notifies_and_streams_in_page_order(engine, database_url):
+    changed = []
+    stats = run(
+        database_url,
+        lambda repository: repository.bulk_upsert_events((make_event(i) for i in range(25)), batch_size=10),
+        changed.append
+    )
+    assert stats == {'inserted': 25, 'updated': 0, 'skipped': 0, 'failed_ids': []}
+    assert changed and all(changed)
+
+    async def stream(repository):
+        return [event.id async for event in repository.iter_events(batch_size=7)]
+
+    expected = sorted((make_event(i) for i in range(25)), key=lambda event: (event["date"], event["id"]), reverse=True)
+    assert run(database_url, stream) == [event["id"] for event in expected]
+
+
+def test_cursor_at_matches_sync_manager(engine, database_url, manager):
+    manager.bulk_upsert_events(make_event(i) for i in range(40))
+
+    async def cursors(repository):
+        return [await repository.get_cursor_at(position) for position in (0, 1, 7, 20, 39, 40, 100)]
+
+    assert run(database_url, cursors) == [manager.get_cursor_at(position) for position in (0, 1, 7, 20, 39, 40, 100)]
+
+
+def test_rebuild_derived_data(engine, database_url, manager):
+    manager.bulk_upsert_events(make_event(i, keywords=["重建"]) for i in range(10))
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM daily_event_stats"))
+
+    async def rebuild(repository):
+        return (
+            await repository.rebuild_daily_stats(),
+            await repository.backfill_associations(),
+            await repository.rebuild_search_index(),
+            len(await repository.search_events(keyword="重建")),
+        )
+
+    assert run(database_url, rebuild) == (10, 10, True, 10)
+
+
+def test_page_errors_propagate(engine, database_url):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE internet_events"))
+
+    with pytest.raises(Exception):
+        run(database_url, lambda repository: repository.get_events_page(page_size=5))
@@ -0,0 +1,58 @@
+"""
+本地镜像同步测试 - 增量同步与 reset 全量重同步
+"""
+
+from datetime import date
+
+from sqlalchemy import select, func, text
+
+from core.database.mirror import MirrorSync
+from core.database.models import InternetEvent, EventCategory, DailyEventStats
+from tests.conftest import make_event
+
+
+def count(engine, model):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+
+
+def test_sync_is_incremental_and_reset_drops_deleted_rows(manager, tmp_path, database_url):
+    manager.bulk_upsert_events(make_event(i) for i in range(20))
+    # 不重读刚写入的行（默认会重新读取上次同步前 5 秒内变更的行）
+    mirror = MirrorSync(database_url, f"sqlite:///{tmp_path / 'mirror.db'}", batch_size=7, overlap_seconds=0)
+
+    assert mirror.sync()["internet_events"] == 20
+    assert mirror.sync()["internet_events"] == 0
+    assert count(mirror.mirror_engine, InternetEvent) == 20
+
+    assert manager.delete_event("test_00000")
+    assert mirror.sync()["internet_events"] == 0
+    assert count(mirror.mirror_engine, InternetEvent) == 20  # 删除不会增量同步
+
+    mirror.reset(["internet_events"])
+    assert count(mirror.mirror_engine, InternetEvent) == 0
+    assert count(mirror.mirror_engine, EventCategory) == 0
+    assert count(mirror.mirror_engine, DailyEventStats) == 0
+
+    assert mirror.sync()["internet_events"] == 19
+    with mirror.mirror_engine.connect() as conn:
+        ids = set(conn.execute(select(InternetEvent.id)).scalars())
+        stats_total = conn.execute(select(func.sum(DailyEventStats.event_count))).scalar()
+    assert "test_00000" not in ids and len(ids) == 19
+    assert stats_total == 19
+
+
+def test_incremental_batches_use_change_index(manager, database_url):
+    manager.bulk_upsert_events([make_event(1)])
+    mirror = MirrorSync(database_url, "sqlite://", batch_size=10)
+    query = (
+        select(InternetEvent.__table__)
+        .where(InternetEvent.updated_at >= date(2024, 1, 1))
+        .order_by(InternetEvent.updated_at, InternetEvent.id)
+        .limit(10)
+    )
+    with mirror.source_engine.connect() as conn:
+        sql = str(query.compile(conn, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql)))
+    assert "ix_internet_events_updated_at_id" in plan
+    assert "TEMP B-TREE" not in plan
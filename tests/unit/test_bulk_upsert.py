@@ -0,0 +1,98 @@
+"""
+批量写入测试 - 新增/更新/跳过计数与派生数据同步
+"""
+
+from datetime import date
+
+from core.database.models import DailyEventStats, EventCategory, InternetEvent
+from core.database.revisions import get_revision
+from tests.conftest import make_event
+
+
+def daily_count(manager, day):
+    stats = manager.session.get(DailyEventStats, day)
+    return stats.event_count if stats else 0
+
+
+def test_counts_inserted_updated_and_skipped(manager):
+    assert manager.bulk_upsert_events(make_event(i) for i in range(10)) == {
+        'inserted': 10, 'updated': 0, 'skipped': 0, 'failed_ids': []
+    }
+
+    rows = [make_event(i, title=f"新标题 {i}") for i in range(5, 15)]
+    rows.append({'id': 'no_title', 'date': date(2024, 1, 1)})
+    rows.append({'id': 'no_date', 'title': '没有日期'})
+    rows.append(make_event(14, title="重复 ID 以最后一条为准"))
+    assert manager.bulk_upsert_events(iter(rows), batch_size=4) == {
+        'inserted': 5, 'updated': 5, 'skipped': 3, 'failed_ids': []
+    }
+
+    assert manager.session.query(InternetEvent).count() == 15
+    assert manager.session.get(InternetEvent, make_event(7)['id']).title == "新标题 7"
+    assert manager.session.get(InternetEvent, make_event(14)['id']).title == "重复 ID 以最后一条为准"
+
+
+def test_update_keeps_missing_fields(manager):
+    event = make_event(1, description="原始描述")
+    manager.bulk_upsert_events([event])
+
+    manager.bulk_upsert_events([{'id': event['id'], 'date': event['date'], 'title': "只改标题"}])
+
+    manager.session.expire_all()
+    stored = manager.session.get(InternetEvent, event['id'])
+    assert stored.title == "只改标题"
+    assert stored.description == "原始描述"
+    assert stored.heat_score == event['heat_score']
+
+
+def test_moving_date_refreshes_both_days(manager):
+    old_day, new_day = date(2024, 1, 2), date(2024, 2, 20)
+    manager.bulk_upsert_events([make_event(1, old_day), make_event(2, old_day)])
+    assert daily_count(manager, old_day) == 2
+    revision = get_revision(manager.session.connection())
+
+    moved = make_event(1, new_day, categories=["社会事件"])
+    assert manager.bulk_upsert_events([moved])['updated'] == 1
+
+    manager.session.expire_all()
+    assert daily_count(manager, old_day) == 1
+    assert daily_count(manager, new_day) == 1
+    assert manager.session.get(DailyEventStats, new_day).top_event_id == moved['id']
+    assert [row.category for row in manager.session.query(EventCategory).filter_by(event_id=moved['id'])] == ["社会事件"]
+    assert get_revision(manager.session.connection()) > revision
+
+
+def test_moving_last_event_clears_old_day(manager):
+    old_day, new_day = date(2024, 1, 3), date(2024, 1, 4)
+    manager.bulk_upsert_events([make_event(1, old_day)])
+    manager.bulk_upsert_events([make_event(1, new_day)])
+
+    manager.session.expire_all()
+    assert daily_count(manager, old_day) == 0
+    assert daily_count(manager, new_day) == 1
+
+
+def test_failed_row_only_skips_itself(manager):
+    rows = [make_event(i) for i in range(6)]
+    rows[3]['heat_score'] = {'不是': '整数'}  # 驱动无法绑定，整批执行失败
+
+    stats = manager.bulk_upsert_events(rows, batch_size=4)
+
+    assert stats == {'inserted': 5, 'updated': 0, 'skipped': 1, 'failed_ids': [make_event(3)['id']]}
+    assert manager.session.query(InternetEvent).count() == 5
+
+
+def test_insert_then_update_without_native_upsert(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_build_upsert_statement", lambda: None)
+    manager.bulk_upsert_events([make_event(1, description="原始描述"), make_event(2)])
+
+    stats = manager.bulk_upsert_events([
+        {'id': make_event(1)['id'], 'date': make_event(1)['date'], 'title': "只改标题"},
+        make_event(3)
+    ])
+
+    assert stats == {'inserted': 1, 'updated': 1, 'skipped': 0, 'failed_ids': []}
+    manager.session.expire_all()
+    stored = manager.session.get(InternetEvent, make_event(1)['id'])
+    assert (stored.title, stored.description) == ("只改标题", "原始描述")
+    assert manager.session.query(InternetEvent).count() == 3
@@ -0,0 +1,30 @@
+"""
+查询统计测试 - 查询语句读取的行数
+"""
+
+import json
+
+from sqlalchemy import text
+
+from core.database import instrumentation
+from core.database.instrumentation import get_query_stats, reset_query_stats
+from tests.conftest import make_event
+
+
+def test_rows_returned_counted_when_result_consumed(manager, tmp_path, monkeypatch):
+    log_path = tmp_path / "queries.jsonl"
+    monkeypatch.setitem(instrumentation.QUERY_LOG_CONFIG, "log_all", True)
+    monkeypatch.setitem(instrumentation.QUERY_LOG_CONFIG, "path", str(log_path))
+    manager.bulk_upsert_events(make_event(i) for i in range(30))
+    reset_query_stats()
+
+    assert len(manager.get_events_page(None, 10).items) == 10
+    result = manager.session.execute(text("SELECT id FROM internet_events"))
+    result.fetchone()
+    result.close()
+
+    stats = dict(get_query_stats())
+    assert stats["DatabaseManager.get_events_page"]["rows"] == 11  # 多取一条判断是否还有下一页
+    records = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    rows = {record["statement"]: record["rows_returned"] for record in records}
+    assert rows["SELECT id FROM internet_events"] == 1
@@ -0,0 +1,71 @@
+"""
+游标分页测试 - keyset 分页与 OFFSET 结果一致
+"""
+
+import pytest
+
+from core.database.models import InternetEvent
+from core.database.pagination import decode_cursor, encode_cursor
+from tests.conftest import make_event
+
+EVENT_COUNT = 200  # 分布在 60 天内，每天 3-4 条，覆盖同一天内按 id 排序
+
+
+@pytest.fixture
+def events(manager):
+    events = [make_event(i, categories=["网络梗" if i % 3 else "社会事件"]) for i in range(EVENT_COUNT)]
+    manager.session.add_all(InternetEvent(**event) for event in events)
+    manager.session.commit()
+    return events
+
+
+def offset_ids(manager, events, offset, limit, category=None, descending=True):
+    """直接用 OFFSET 查询作为对照结果"""
+    query = manager.session.query(InternetEvent.id)
+    if category:
+        query = query.filter(InternetEvent.id.in_([event["id"] for event in events if category in event["categories"]]))
+    order = (InternetEvent.date.desc(), InternetEvent.id.desc()) if descending else (InternetEvent.date, InternetEvent.id)
+    return [row.id for row in query.order_by(*order).offset(offset).limit(limit)]
+
+
+def walk(fetch_page, page_size):
+    ids, cursor = [], None
+    while True:
+        page = fetch_page(cursor, page_size)
+        assert len(page.items) <= page_size
+        ids += [item.id for item in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(make_event(1)["date"], "event|含竖线")
+    assert decode_cursor(cursor) == (make_event(1)["date"], "event|含竖线")
+    with pytest.raises(ValueError):
+        decode_cursor("不是游标")
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("category", [None, "社会事件"])
+def test_walking_pages_matches_offset(manager, events, descending, category):
+    expected = offset_ids(manager, events, 0, EVENT_COUNT, category, descending)
+    fetch = lambda cursor, size: manager.get_events_page(cursor, size, category=category, descending=descending)
+    assert walk(fetch, 17) == expected
+
+    fetch_rows = lambda cursor, size: manager.get_event_rows_page(cursor, size, category=category, descending=descending)
+    assert walk(fetch_rows, 23) == expected
+
+
+@pytest.mark.parametrize("category", [None, "社会事件"])
+def test_cursor_at_position_matches_offset(manager, events, category):
+    total = len(offset_ids(manager, events, 0, EVENT_COUNT, category))
+    for position in list(range(0, 12)) + list(range(12, total + 5, 7)):
+        cursor = manager.get_cursor_at(position, category=category)
+        page = manager.get_events_page(cursor, 10, category=category)
+        assert [event.id for event in page.items] == offset_ids(manager, events, position, 10, category), position
+
+
+def test_invalid_cursor_raises(manager, events):
+    with pytest.raises(ValueError):
+        manager.get_events_page("不是游标", 10)
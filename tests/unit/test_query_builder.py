@@ -0,0 +1,60 @@
+"""
+查询构建器测试 - 语句模板与 build() 返回的 Query
+"""
+
+from datetime import date
+
+from core.database.models import InternetEvent
+from core.database.query_builder import advanced_search_builder, build_advanced_search
+from tests.conftest import make_event
+
+
+def seed(manager):
+    manager.bulk_upsert_events(
+        make_event(i, categories=["网络梗" if i % 2 else "社会事件"]) for i in range(40)
+    )
+
+
+def test_build_returns_composable_query(manager):
+    seed(manager)
+    session = manager.session
+
+    query = build_advanced_search(session, category="网络梗", min_heat=10, limit=None)
+    expected = advanced_search_builder(category="网络梗", min_heat=10, limit=None).execute(session)
+    assert [event.id for event in query.all()] == [event.id for event in expected]
+    assert query.count() == len(expected)
+    assert query.filter(InternetEvent.heat_score >= 30).count() == sum(
+        1 for event in expected if event.heat_score >= 30
+    )
+
+
+def test_build_applies_order_and_limit(manager):
+    seed(manager)
+    query = build_advanced_search(manager.session, order_by="heat", limit=5)
+    scores = [event.heat_score for event in query]
+    assert scores == sorted(scores, reverse=True) and len(scores) == 5
+    assert query.count() == 5
+
+
+def test_templates_are_reused_across_values(manager):
+    seed(manager)
+    session = manager.session
+    first, _ = advanced_search_builder(start_date=date(2024, 1, 1), end_date=date(2024, 1, 10)).build_statement(
+        session.connection()
+    )
+    second, params = advanced_search_builder(start_date=date(2024, 2, 1), end_date=date(2024, 2, 10)).build_statement(
+        session.connection()
+    )
+    assert first is second
+    assert params["start_date"] == date(2024, 2, 1)
+
+
+def test_text_filters_are_stripped(manager):
+    manager.bulk_upsert_events(make_event(i, event_type="meme" if i % 2 else "news") for i in range(10))
+    session = manager.session
+
+    padded = advanced_search_builder(event_type=" meme ", category=" 网络梗 ", limit=None)
+    plain = advanced_search_builder(event_type="meme", category="网络梗", limit=None)
+    assert padded.params == plain.params
+    assert [event.id for event in padded.execute(session)] == [event.id for event in plain.execute(session)]
+    assert len(plain.execute(session)) == 5
@@ -0,0 +1,88 @@
+"""
+查询结果缓存测试 - 副本隔离与按日期失效
+"""
+
+from datetime import date
+
+import pytest
+
+from core.database.pagination import EventPage
+from core.database.query_cache import QueryCache
+from core.database.records import EventListRow
+from tests.conftest import make_event
+
+
+def make_row(event_id, categories):
+    return EventListRow(event_id, date(2024, 1, 1), "标题", "meme", categories, 50, False)
+
+
+def test_cached_values_are_isolated_from_callers():
+    cache = QueryCache()
+    loader = lambda: EventPage([make_row("a", ["网络梗"])], "cursor")
+
+    first = cache.get_or_load("page", {}, loader, all_dates=True)
+    first.items[0].categories.append("被修改")
+    first.items.append(make_row("b", []))
+
+    second = cache.get_or_load("page", {}, loader, all_dates=True)
+    assert second == EventPage([make_row("a", ["网络梗"])], "cursor")
+    second.items[0].categories.clear()
+    assert cache.get_or_load("page", {}, loader, all_dates=True).items[0].categories == ["网络梗"]
+    assert cache.stats()["hits"] == 2
+
+
+def test_invalidate_dates_only_drops_overlapping_spans():
+    cache = QueryCache()
+    calls = []
+
+    def load(name):
+        calls.append(name)
+        return name
+
+    january = lambda: cache.get_or_load("rows", {"m": 1}, lambda: load("jan"), date(2024, 1, 1), date(2024, 1, 31))
+    march = lambda: cache.get_or_load("rows", {"m": 3}, lambda: load("mar"), date(2024, 3, 1), date(2024, 3, 31))
+    total = lambda: cache.get_or_load("count", {}, lambda: load("total"), all_dates=True)
+    for query in (january, march, total):
+        query()
+
+    cache.invalidate_dates({date(2024, 1, 15)})
+    for query in (january, march, total):
+        query()
+    assert calls == ["jan", "mar", "total", "jan", "total"]
+
+
+@pytest.fixture
+def cached_manager(manager):
+    manager.set_query_cache(QueryCache())
+    manager.bulk_upsert_events(make_event(i, date(2024, 1, 1 + i)) for i in range(10))
+    return manager
+
+
+def test_write_inside_cached_span_invalidates(cached_manager):
+    start, end = date(2024, 1, 1), date(2024, 1, 5)
+    assert len(cached_manager.get_event_rows_by_date_range(start, end)) == 5
+
+    ok, _ = cached_manager.add_event({"date": date(2024, 1, 3), "title": "新事件"})
+    assert ok
+    assert len(cached_manager.get_event_rows_by_date_range(start, end)) == 6
+
+
+def test_write_outside_cached_span_keeps_entry(cached_manager):
+    start, end = date(2024, 1, 1), date(2024, 1, 5)
+    cached_manager.get_event_rows_by_date_range(start, end)
+    hits = cached_manager.get_cache_stats()["hits"]
+
+    cached_manager.add_event({"date": date(2024, 2, 1), "title": "范围外事件"})
+    cached_manager.get_event_rows_by_date_range(start, end)
+    assert cached_manager.get_cache_stats()["hits"] == hits + 1
+
+
+def test_moving_event_date_invalidates_old_and_new_span(cached_manager):
+    january = (date(2024, 1, 1), date(2024, 1, 5))
+    february = (date(2024, 2, 1), date(2024, 2, 28))
+    assert "test_00000" in {row.id for row in cached_manager.get_event_rows_by_date_range(*january)}
+    assert cached_manager.get_event_rows_by_date_range(*february) == []
+
+    assert cached_manager.update_event("test_00000", {"date": date(2024, 2, 10)})
+    assert "test_00000" not in {row.id for row in cached_manager.get_event_rows_by_date_range(*january)}
+    assert [row.id for row in cached_manager.get_event_rows_by_date_range(*february)] == ["test_00000"]
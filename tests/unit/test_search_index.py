@@ -0,0 +1,102 @@
+"""
+全文检索测试 - 中文二元组与拉丁词前缀匹配
+"""
+
+import pytest
+
+from core.database import search_index
+from core.database.search_index import (
+    SQLiteFTSBackend, MySQLFulltextBackend, InvertedIndexBackend, get_search_backend, query_tokens, tokenize
+)
+from tests.conftest import make_event
+
+EVENTS = [
+    make_event(1, title="Python 发布新版本", description="编程语言更新"),
+    make_event(2, title="抽象梗日历上线", description="简中互联网大事件"),
+    make_event(3, title="Pytest 插件", description="测试框架"),
+    make_event(4, title="日历应用", description="Rust 重写"),
+]
+
+
+@pytest.fixture
+def seeded(manager):
+    manager.bulk_upsert_events(EVENTS)
+    return manager
+
+
+def test_tokenize_cjk_bigrams():
+    assert tokenize("抽象梗", for_query=True) == ["抽象", "象梗"]
+    assert tokenize("抽象梗") == ["抽", "象", "梗", "抽象", "象梗"]
+
+
+def test_query_tokens_marks_trailing_latin_word_as_prefix():
+    assert query_tokens("pyth") == (["pyth"], True)
+    assert query_tokens("日历 py") == (["日历", "py"], True)
+    assert query_tokens("py 日历") == (["py", "日历"], False)
+
+
+def test_match_query_syntax():
+    assert SQLiteFTSBackend.build_match_query("pyth") == '"pyth"*'
+    assert SQLiteFTSBackend.build_match_query("抽象梗") == '"抽象" "象梗"'
+    assert MySQLFulltextBackend.build_match_query("日历 pyth") == '+"日历" +pyth*'
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("pyth", {"test_00001"}),
+    ("PY", {"test_00001", "test_00003"}),
+    ("python", {"test_00001"}),
+    ("pytho 版本", set()),
+    ("版本 pytho", {"test_00001"}),
+    ("抽象", {"test_00002"}),
+    ("象梗日", {"test_00002"}),
+    ("日历", {"test_00002", "test_00004"}),
+    ("日历 ru", {"test_00004"}),
+])
+def test_search_events_partial_words(seeded, keyword, expected):
+    assert {event.id for event in seeded.search_events(keyword)} == expected
+
+
+def test_inverted_index_prefix_matches_sqlite_backend(seeded):
+    conn = seeded.session.connection()
+    assert get_search_backend(conn).name == "sqlite_fts5"
+
+    fallback = InvertedIndexBackend()
+    for keyword in ("pyth", "py", "日历", "日历 ru", "版本 pytho", "rust"):
+        expected = {event_id for event_id, _ in get_search_backend(conn).search(conn, keyword)}
+        assert {event_id for event_id, _ in fallback.search(conn, keyword)} == expected, keyword
+
+
+def test_inverted_index_prefix_sees_new_tokens(seeded):
+    conn = seeded.session.connection()
+    fallback = InvertedIndexBackend()
+    assert fallback.search(conn, "kotl") == []
+
+    fallback.index_event(conn, "test_00009", "Kotlin", "", [])
+    assert [event_id for event_id, _ in fallback.search(conn, "kotl")] == ["test_00009"]
+    fallback.remove_event(conn, "test_00009")
+    assert fallback.search(conn, "kotl") == []
+
+
+@pytest.fixture(params=["sqlite_fts5", "python_bm25"])
+def crowded(request, manager, monkeypatch):
+    """大量命中同一个词的事件：标题命中的排在只有描述命中的前面"""
+    manager.bulk_upsert_events(
+        make_event(i, title=f"热搜 {i}" if i % 10 == 0 else f"事件 {i}", description="热搜话题",
+                   categories=["网络梗" if i % 2 else "社会事件"])
+        for i in range(3000)
+    )
+    if request.param == "python_bm25":
+        conn = manager.session.connection()
+        monkeypatch.setitem(search_index._backends, str(conn.engine.url), InvertedIndexBackend())
+    return manager
+
+
+def test_search_ranks_and_limits_in_database(crowded):
+    results = crowded.search_events("热搜", limit=50)
+    assert len(results) == 50
+    assert all(event.title.startswith("热搜") for event in results)
+
+    results = crowded.search_events("热搜", category="网络梗", limit=400)
+    assert len(results) == 400
+    assert all("网络梗" in event.categories for event in results)
+    assert all(event.title.startswith("事件") for event in results)  # 标题命中的都是偶数 ID（社会事件）
@@ -0,0 +1,129 @@
+"""
+后台数据加载 - 在线程池中执行数据库查询，避免阻塞 Tk 主循环
+
+Tk 组件只能在主线程中操作：工作线程把结果放入队列，
+主线程通过 after() 轮询队列并调用回调。
+每个通道（如 "month"、"day"）只保留最新一次请求的结果，
+用户快速切换月份时，过期请求尚未开始的直接取消，已完成的结果被丢弃。
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundLoader:
+    """按通道管理的后台加载器"""
+
+    def __init__(self, widget, max_workers=2, poll_interval=30, initializer=None, finalizer=None):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        # initializer 在每个工作线程启动时执行一次（如让线程使用只读数据库连接）
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="db-loader", initializer=initializer
+        )
+        # finalizer 在每个任务结束后于同一工作线程执行（如结束数据库事务，下一个任务读到最新数据）
+        self.finalizer = finalizer
+        self.results = queue.Queue()
+        self.generations = {}
+        self.futures = {}
+        self.outstanding = 0
+        self._poll_id = None
+        self._closed = False
+
+    def submit(self, channel, func, *args, on_success=None, on_error=None):
+        """在后台执行 func(*args)，完成后在主线程调用 on_success(result) 或 on_error(exc)
+
+        同一通道的新请求会使旧请求失效。
+        """
+        if self._closed:
+            return None
+
+        generation = self.generations.get(channel, 0) + 1
+        self.generations[channel] = generation
+
+        previous = self.futures.get(channel)
+        if previous is not None:
+            previous.cancel()
+
+        future = self.executor.submit(self._run, func, args)
+        self.futures[channel] = future
+        self.outstanding += 1
+        future.add_done_callback(
+            lambda f: self.results.put((channel, generation, f, on_success, on_error))
+        )
+        self._schedule_poll()
+        return generation
+
+    def cancel(self, channel):
+        """使通道中尚未交付的请求失效"""
+        self.generations[channel] = self.generations.get(channel, 0) + 1
+        future = self.futures.pop(channel, None)
+        if future is not None:
+            future.cancel()
+
+    def is_loading(self, channel):
+        """通道中是否有尚未完成的最新请求"""
+        future = self.futures.get(channel)
+        return future is not None and not future.done()
+
+    def shutdown(self):
+        """停止轮询并关闭线程池（不等待正在执行的查询）"""
+        self._closed = True
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        # 各通道只有最新请求可能仍在排队（旧请求提交新请求时已取消），逐个取消即可；
+        # 不使用 shutdown(cancel_futures=True)，它需要 Python 3.9
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=False)
+
+    def _run(self, func, args):
+        """工作线程：执行任务，无论成败都调用 finalizer"""
+        try:
+            return func(*args)
+        finally:
+            if self.finalizer is not None:
+                try:
+                    self.finalizer()
+                except Exception as e:
+                    print(f"后台任务清理失败: {e}")
+
+    def _schedule_poll(self):
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.widget.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        """主线程：交付已完成的结果"""
+        self._poll_id = None
+        while True:
+            try:
+                channel, generation, future, on_success, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.outstanding -= 1
+            # 已被同一通道的新请求取代
+            if future.cancelled() or generation != self.generations.get(channel):
+                continue
+            if self.futures.get(channel) is future:
+                del self.futures[channel]
+
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_success:
+                        on_success(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"后台加载失败 [{channel}]: {error}")
+            except Exception as e:
+                print(f"处理后台加载结果失败 [{channel}]: {e}")
+
+        if self.outstanding > 0:
+            self._schedule_poll()
@@ -12,6 +12,8 @@ from datetime import datetime, date, timedelta
 import calendar
 import os
 import sys
+import threading
+import time
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -19,11 +21,17 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 try:
     from core.database.database_manager import db_manager
     from core.database.models import InternetEvent
+    from core.database.records import EventRecord
     DATABASE_AVAILABLE = True
 except ImportError as e:
     print(f"数据库导入错误: {e}")
     DATABASE_AVAILABLE = False
 
+from ui.desktop.ttk_app.background import BackgroundLoader
+from ui.desktop.ttk_app.month_cache import MonthCache
+from ui.desktop.ttk_app.year_heatmap import YearHeatmap
+from config.settings import UI_CONFIG
+
 class CalendarView:
     def __init__(self, parent):
         self.parent = parent
@@ -46,8 +54,27 @@ class CalendarView:
         if DATABASE_AVAILABLE:
             self.db_connected = db_manager.connect()
         
-        # 事件数据缓存
-        self.events_data = {}
+        # 当月每日聚合（事件数、最高热度），选中某天时再加载当天的事件
+        self.day_stats = {}
+        self.stats_month = None  # day_stats 对应的 (年, 月)
+        
+        # 最近访问月份的每日聚合缓存，数据变更时按月份失效
+        self.month_cache = MonthCache(UI_CONFIG.get("month_cache_size", 12))
+        if self.db_connected:
+            db_manager.add_change_listener(self.on_data_changed)
+        
+        # 数据库查询在后台线程执行，结果通过 after() 交回主线程；工作线程只读，使用只读连接，
+        # 每个任务结束后归还连接（下一个任务开启新事务，能读到其他连接提交的修改）
+        self.loader = BackgroundLoader(
+            self.window,
+            initializer=(lambda: db_manager.connect(read_only=True)) if self.db_connected else None,
+            finalizer=db_manager.release_connection if self.db_connected else None
+        )
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # 每次重绘月历后调用 render_hook(年, 月, 毫秒)；默认不设置，调试时可开启打印耗时
+        self.render_hook = self.report_render_time if UI_CONFIG.get("report_render_time") else None
+        self.last_render_ms = None
         
         self.setup_ui()
         self.load_events_data()
@@ -167,6 +194,8 @@ class CalendarView:
             self.calendar_grid.columnconfigure(i, weight=1)
         for i in range(7):  # 6行（标题+最多6周）
             self.calendar_grid.rowconfigure(i, weight=1)
+        
+        self.create_day_cells()
     
     def create_event_details(self, parent):
         """创建事件详情区域"""
@@ -233,175 +262,271 @@ class CalendarView:
         self.status_label.pack(side=tk.LEFT)
     
     def load_events_data(self):
-        """只加载当前月的事件数据（显著节省内存）"""
+        """加载当前月的每日聚合：优先读缓存，未命中时在后台查询"""
         if not self.db_connected:
             self.load_sample_events()
             return
 
-        try:
-            # 计算当前月的起止日期
-            start_date = date(self.current_year, self.current_month, 1)
-            # 下月1号减一天得到本月末
-            if self.current_month == 12:
-                end_date = date(self.current_year + 1, 1, 1) - timedelta(days=1)
-            else:
-                end_date = date(self.current_year, self.current_month + 1, 1) - timedelta(days=1)
+        key = (self.current_year, self.current_month)
+        cached = self.month_cache.get(key)
+        if cached is not None:
+            self.loader.cancel("month")
+            self.day_stats = cached
+            self.stats_month = key
+            self.set_loading(False)
+            self.prefetch_neighbours()
+            return
 
-            # 从数据库获取本月事件
-            events = db_manager.get_events_by_date_range(start_date, end_date)
+        # 先清空旧月份的数据，格子以无事件状态绘制，结果到达后再重绘
+        self.day_stats = {}
+        self.stats_month = None
+        self.set_loading(True)
+        token = self.month_cache.token(key)
+        self.loader.submit(
+            "month", self.fetch_month_stats, *key,
+            on_success=lambda stats: self.on_month_loaded(key, stats, token),
+            on_error=self.on_load_error
+        )
 
-            # 按日期组织数据
-            self.events_data = {}
-            for event in events:
-                if hasattr(event, 'date') and event.date:
-                    event_date = event.date.strftime("%Y-%m-%d")
-                    if event_date not in self.events_data:
-                        self.events_data[event_date] = []
-                    self.events_data[event_date].append(event)
+    @staticmethod
+    def month_range(year, month):
+        """返回某月的起止日期"""
+        start_date = date(year, month, 1)
+        # 下月1号减一天得到本月末
+        if month == 12:
+            end_date = date(year + 1, 1, 1) - timedelta(days=1)
+        else:
+            end_date = date(year, month + 1, 1) - timedelta(days=1)
+        return start_date, end_date
 
-            print(f"📊 成功加载 {len(events)} 个事件，范围：{start_date} ~ {end_date}")
+    @classmethod
+    def fetch_month_stats(cls, year, month):
+        """工作线程：查询某月的每日聚合，返回 {日期字符串: 聚合行}"""
+        stats = db_manager.get_daily_stats(*cls.month_range(year, month))
+        return {row.date.strftime("%Y-%m-%d"): row for row in stats}
 
-        except Exception as e:
-            print(f"加载事件数据失败: {e}")
-            self.load_sample_events()
+    def on_month_loaded(self, key, day_stats, token):
+        """主线程：月度聚合加载完成"""
+        self.month_cache.put(key, day_stats, token)
+        if key != (self.current_year, self.current_month):
+            return
+
+        self.day_stats = day_stats
+        self.stats_month = key
+        self.set_loading(False)
+        self.update_calendar()
+        self.prefetch_neighbours()
+
+        total = sum(row.event_count for row in day_stats.values())
+        print(f"📊 成功加载 {len(day_stats)} 天共 {total} 个事件的统计：{key[0]}年{key[1]}月")
+
+    def prefetch_neighbours(self):
+        """在后台预取上个月和下个月的聚合"""
+        year, month = self.current_year, self.current_month
+        neighbours = [
+            (year - 1, 12) if month == 1 else (year, month - 1),
+            (year + 1, 1) if month == 12 else (year, month + 1)
+        ]
+        pending = [(key, self.month_cache.token(key)) for key in neighbours if key not in self.month_cache]
+        if not pending:
+            return
+
+        def fetch():
+            return [(key, token, self.fetch_month_stats(*key)) for key, token in pending]
+
+        def store(results):
+            for key, token, day_stats in results:
+                self.month_cache.put(key, day_stats, token)
+
+        self.loader.submit("prefetch", fetch, on_success=store)
+
+    def on_data_changed(self, dates):
+        """DatabaseManager 变更通知：失效对应月份，当前月受影响时重新加载"""
+        keys = self.month_cache.invalidate_dates(dates)
+        if keys is not None and (self.current_year, self.current_month) not in keys:
+            return
+
+        # 通知可能来自其他线程（批量导入、镜像同步），Tk 组件只能在主线程刷新，交给主循环执行
+        if threading.current_thread() is not threading.main_thread():
+            try:
+                self.window.after(0, lambda: self.reload_changed(dates))
+            except (RuntimeError, tk.TclError) as e:
+                print(f"窗口已关闭，跳过刷新: {e}")
+            return
+        self.reload_changed(dates)
+
+    def reload_changed(self, dates):
+        """主线程：数据变更后重新加载当前月，选中的日期受影响时刷新当天事件"""
+        self.load_events_data()
+        self.update_calendar()
+        if self.selected_date and (dates is None or self.selected_date in dates):
+            self.show_date_events(self.selected_date)
+
+    def on_load_error(self, error):
+        """主线程：后台加载失败"""
+        print(f"加载事件数据失败: {error}")
+        self.set_loading(False)
+        self.status_label.config(text=f"加载事件数据失败: {error}")
+
+    def set_loading(self, loading):
+        """显示/清除加载状态"""
+        month_text = f"{self.current_year}年{self.current_month}月"
+        if loading:
+            self.month_label.config(text=f"{month_text} ⏳")
+            self.status_label.config(text=f"⏳ 正在加载 {month_text} 的事件...")
+        else:
+            self.month_label.config(text=month_text)
+            self.status_label.config(text=f"已加载 {month_text}")
 
     
     def load_sample_events(self):
         """加载示例事件数据 - 返回空数据"""
         # 直接返回空字典，不创建任何示例事件
-        self.events_data = {}
+        self.day_stats = {}
 
     def create_sample_event(self, event_date, title, heat_score, event_type, description):
         """创建示例事件对象"""
-        event = type('Event', (), {})()
-        event.date = event_date
-        event.title = title
-        event.heat_score = heat_score
-        event.event_type = event_type
-        event.description = description
-        event.id = f"sample_{event_date.strftime('%Y%m%d')}"
-        return event
+        return EventRecord(
+            f"sample_{event_date.strftime('%Y%m%d')}", event_date, title, description,
+            event_type=event_type, heat_score=heat_score
+        )
 
+    def create_day_cells(self):
+        """创建固定的 6×7 日期单元格池，切换月份时只更新内容"""
+        self.day_cells = []
+        for week_row in range(1, 7):
+            row_cells = []
+            for week_col in range(7):
+                cell_frame = tk.Frame(
+                    self.calendar_grid,
+                    bg='white',
+                    relief='raised',
+                    bd=1
+                )
+                cell_frame.grid(row=week_row, column=week_col, sticky="nsew", padx=1, pady=1)
+                cell_frame.cell_date = None
+                
+                # 日期标签
+                cell_frame.day_label = tk.Label(
+                    cell_frame,
+                    font=("微软雅黑", 12, "bold"),
+                    bg='white',
+                    fg='#2c3e50'
+                )
+                cell_frame.day_label.pack(anchor="nw", padx=5, pady=5)
+                
+                # 事件信息 / "未来" 提示
+                cell_frame.info_label = tk.Label(
+                    cell_frame,
+                    font=("微软雅黑", 8),
+                    bg='white'
+                )
+                cell_frame.info_label.pack(side=tk.BOTTOM, anchor="sw", padx=5, pady=2)
+                
+                # 点击时读取单元格当前绑定的日期，绑定只需建立一次
+                for widget in (cell_frame, cell_frame.day_label, cell_frame.info_label):
+                    widget.bind('<Button-1>', lambda e, cell=cell_frame: self.on_cell_click(cell))
+                row_cells.append(cell_frame)
+            self.day_cells.append(row_cells)
+    
     def update_calendar(self):
-        """更新日历显示 - 完整显示所有日期"""
-        # 更新月份标签
-        self.month_label.config(text=f"{self.current_year}年{self.current_month}月")
+        """更新日历显示 - 完整显示所有日期（复用单元格，不重建组件）"""
+        start_time = time.perf_counter()
         
-        # 清空现有日期单元格
-        for widget in self.calendar_grid.winfo_children():
-            if hasattr(widget, 'is_day_cell') or isinstance(widget, tk.Frame):
-                grid_info = widget.grid_info()
-                if grid_info and grid_info['row'] > 0:
-                    widget.destroy()
+        # 更新月份标签（加载中保留提示）
+        month_text = f"{self.current_year}年{self.current_month}月"
+        if self.loader.is_loading("month"):
+            month_text += " ⏳"
+        self.month_label.config(text=month_text)
         
         # 使用monthdatescalendar获取完整日期（包含相邻月份）
         cal = calendar.Calendar(firstweekday=0)  # 0=Monday
         month_weeks = cal.monthdatescalendar(self.current_year, self.current_month)
         
-        # 填充日期单元格
-        for week_num, week_dates in enumerate(month_weeks, 1):
-            for day_num, cell_date in enumerate(week_dates):
-                self.create_day_cell(week_num, day_num, cell_date)
+        # 填充日期单元格，不足 6 周的月份隐藏多余的行
+        self.selected_cell = None
+        for week_num, row_cells in enumerate(self.day_cells):
+            if week_num < len(month_weeks):
+                for cell_frame, cell_date in zip(row_cells, month_weeks[week_num]):
+                    cell_frame.cell_date = cell_date
+                    self.configure_day_cell(cell_frame)
+                    cell_frame.grid()
+            else:
+                for cell_frame in row_cells:
+                    cell_frame.cell_date = None
+                    cell_frame.grid_remove()
+        
+        # 计时包含 Tk 的布局和重绘
+        self.calendar_grid.update_idletasks()
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.last_render_ms = elapsed_ms
+        if self.render_hook:
+            self.render_hook(self.current_year, self.current_month, elapsed_ms)
     
-    def create_day_cell(self, week_row, week_col, cell_date):
-        """创建日期单元格"""
-        try:
-            date_str = cell_date.strftime("%Y-%m-%d")
-            today = date.today()
-            
-            # 检查是否属于当前月份
-            is_current_month = (cell_date.month == self.current_month)
-            is_future_date = (cell_date > today)
-            
-            # 创建日期单元格框架
-            cell_frame = tk.Frame(
-                self.calendar_grid,
-                bg='white',
-                relief='raised',
-                bd=1
-            )
-            cell_frame.grid(row=week_row, column=week_col, sticky="nsew", padx=1, pady=1)
-            cell_frame.is_day_cell = True
-            cell_frame.cell_date = cell_date
-            
-            # 日期标签
-            day_label = tk.Label(
-                cell_frame,
-                text=str(cell_date.day),
-                font=("微软雅黑", 12, "bold"),
-                bg='white',
-                fg='#2c3e50'
-            )
-            day_label.pack(anchor="nw", padx=5, pady=5)
-            
-            # 处理非当前月份日期
-            if not is_current_month:
-                cell_frame.configure(bg='#f8f9fa')
-                day_label.configure(bg='#f8f9fa', fg='#bdbdbd')
+    def report_render_time(self, year, month, elapsed_ms):
+        """调试用的渲染计时回调（UI_CONFIG["report_render_time"] 为 True 时启用）"""
+        print(f"🗓️ 渲染 {year}年{month}月 用时 {elapsed_ms:.1f}ms")
+    
+    def configure_day_cell(self, cell_frame):
+        """按单元格绑定的日期设置文字和颜色"""
+        cell_date = cell_frame.cell_date
+        date_str = cell_date.strftime("%Y-%m-%d")
+        today = date.today()
+        
+        # 检查是否属于当前月份
+        is_current_month = (cell_date.month == self.current_month)
+        is_future_date = (cell_date > today)
+        
+        cell_bg, day_fg, info_fg = 'white', '#2c3e50', '#2c3e50'
+        relief, border = 'raised', 1
+        info_text = ""
+        
+        # 处理非当前月份日期
+        if not is_current_month:
+            cell_bg, day_fg = '#f8f9fa', '#bdbdbd'
+        
+        # 处理未来日期
+        elif is_future_date:
+            cell_bg, day_fg = '#f5f5f5', '#9e9e9e'
+            info_text, info_fg = "未来", '#757575'
+        
+        # 处理当前月份且有事件的日期
+        else:
+            stats_today = self.day_stats.get(date_str)
             
-            # 处理未来日期
-            elif is_future_date:
-                cell_frame.configure(bg='#f5f5f5')
-                day_label.configure(bg='#f5f5f5', fg='#9e9e9e')
+            if stats_today and stats_today.event_count:
+                max_heat = stats_today.max_heat or 0
                 
-                future_info = tk.Label(
-                    cell_frame,
-                    text="未来",
-                    font=("微软雅黑", 8),
-                    bg='#f5f5f5',
-                    fg='#757575'
-                )
-                future_info.pack(side=tk.BOTTOM, anchor="sw", padx=5, pady=2)
-            
-            # 处理当前月份且有事件的日期
-            elif is_current_month and not is_future_date:
-                events_today = self.events_data.get(date_str, [])
+                # 根据热度设置颜色
+                if max_heat >= 80:
+                    cell_bg, day_fg = "#ffebee", "#c62828"
+                elif max_heat >= 60:
+                    cell_bg, day_fg = "#fff3e0", "#ef6c00"
+                else:
+                    cell_bg, day_fg = "#f3e5f5", "#7b1fa2"
                 
-                if events_today:
-                    max_heat = max(event.heat_score for event in events_today)
-                    
-                    # 根据热度设置颜色
-                    if max_heat >= 80:
-                        cell_color = "#ffebee"
-                        text_color = "#c62828"
-                    elif max_heat >= 60:
-                        cell_color = "#fff3e0" 
-                        text_color = "#ef6c00"
-                    else:
-                        cell_color = "#f3e5f5"
-                        text_color = "#7b1fa2"
-                    
-                    cell_frame.configure(bg=cell_color)
-                    day_label.configure(bg=cell_color, fg=text_color)
-                    
-                    # 显示事件信息
-                    event_count = len(events_today)
-                    event_info = tk.Label(
-                        cell_frame,
-                        text=f"📅{event_count} 🔥{max_heat}",
-                        font=("微软雅黑", 8),
-                        bg=cell_color,
-                        fg=text_color
-                    )
-                    event_info.pack(side=tk.BOTTOM, anchor="sw", padx=5, pady=2)
-            
-            # 标记今天
-            if cell_date == today:
-                cell_frame.configure(relief='solid', bd=2, bg='#e3f2fd')
-                day_label.configure(bg='#e3f2fd', fg='#1976d2')
-            
-            # 标记选中日期
-            if self.selected_date and cell_date == self.selected_date:
-                cell_frame.configure(relief='solid', bd=3, bg='#fff9c4')
-                day_label.configure(bg='#fff9c4', fg='#f57c00')
-                self.selected_cell = cell_frame
-            
-            # 绑定点击事件
-            cell_frame.bind('<Button-1>', lambda e, d=cell_date: self.on_date_click(d))
-            day_label.bind('<Button-1>', lambda e, d=cell_date: self.on_date_click(d))
-            
-        except ValueError as e:
-            print(f"创建日期单元格错误: {e}")
+                # 显示事件信息
+                info_text, info_fg = f"📅{stats_today.event_count} 🔥{max_heat}", day_fg
+        
+        # 标记今天
+        if cell_date == today:
+            relief, border = 'solid', 2
+            cell_bg, day_fg = '#e3f2fd', '#1976d2'
+        
+        # 标记选中日期
+        if self.selected_date and cell_date == self.selected_date:
+            relief, border = 'solid', 3
+            cell_bg, day_fg = '#fff9c4', '#f57c00'
+            self.selected_cell = cell_frame
+        
+        cell_frame.configure(bg=cell_bg, relief=relief, bd=border)
+        cell_frame.day_label.configure(text=str(cell_date.day), bg=cell_bg, fg=day_fg)
+        cell_frame.info_label.configure(text=info_text, bg=cell_bg, fg=info_fg)
+
+    def on_cell_click(self, cell_frame):
+        """单元格点击：转发到单元格当前绑定的日期"""
+        if cell_frame.cell_date is not None:
+            self.on_date_click(cell_frame.cell_date)
 
     def on_date_click(self, clicked_date):
         """日期点击事件 - 支持跨月点击与安全选中"""
@@ -409,21 +534,10 @@ class CalendarView:
         if clicked_date.month != self.current_month or clicked_date.year != self.current_year:
             self.current_year = clicked_date.year
             self.current_month = clicked_date.month
-            self.load_events_data()   # ⚡ 如果改成只加载当月数据，这里也要改
+            self.load_events_data()
             self.update_calendar()
-            self.status_label.config(text=f"已切换到 {self.current_year}年{self.current_month}月")
             return
 
-        # 清除之前选中的高亮（防止 invalid command）
-        if self.selected_cell and self.selected_cell.winfo_exists():
-            try:
-                self.selected_cell.configure(relief='raised', bd=1, bg='white')
-                for child in self.selected_cell.winfo_children():
-                    if isinstance(child, tk.Label):
-                        child.configure(bg='white')
-            except tk.TclError:
-                pass  # 安全忽略已销毁组件
-
         # 设置新的选中日期
         self.selected_date = clicked_date
         date_str = clicked_date.strftime("%Y年%m月%d日")
@@ -435,47 +549,65 @@ class CalendarView:
         # 显示该日期的事件
         self.show_date_events(clicked_date)
 
-
-    
     def highlight_selected_date(self, selected_date):
-        """高亮显示选中的日期"""
-        for widget in self.calendar_grid.winfo_children():
-            if hasattr(widget, 'is_day_cell') and hasattr(widget, 'cell_date'):
-                if widget.cell_date == selected_date:
-                    widget.configure(relief='solid', bd=3, bg='#fff9c4')
-                    self.selected_cell = widget
-                    # 更新内部标签的背景色
-                    for child in widget.winfo_children():
-                        if isinstance(child, tk.Label):
-                            child.configure(bg='#fff9c4')
+        """高亮显示选中的日期，并恢复之前选中单元格的原有样式"""
+        previous_cell = self.selected_cell
+        self.selected_cell = None
+        if previous_cell is not None and previous_cell.cell_date is not None:
+            self.configure_day_cell(previous_cell)
+        
+        for row_cells in self.day_cells:
+            for cell_frame in row_cells:
+                if cell_frame.cell_date == selected_date:
+                    self.configure_day_cell(cell_frame)
+                    return
     
     def show_date_events(self, target_date):
-        """显示指定日期的事件 - 修复显示问题"""
-        # 清空现有事件
+        """显示指定日期的事件（后台查询）"""
+        date_str = target_date.strftime("%Y-%m-%d")
+        # 当月聚合已加载且没有该日期的记录时无需查询
+        month_loaded = self.stats_month == (target_date.year, target_date.month)
+        if not self.db_connected or (month_loaded and date_str not in self.day_stats):
+            self.loader.cancel("day")
+            self.fill_event_tree(target_date, [])
+            return
+        
+        self.clear_event_tree()
+        self.event_tree.insert("", "end", values=("", "⏳ 正在加载...", "", ""))
+        self.loader.submit(
+            "day", self.fetch_date_events, target_date,
+            on_success=lambda rows: self.fill_event_tree(target_date, rows),
+            on_error=self.on_load_error
+        )
+    
+    @staticmethod
+    def fetch_date_events(target_date):
+        """工作线程：查询某天的事件列表行（只查询列表需要的列）"""
+        return db_manager.get_event_rows_by_date_range(target_date, target_date)
+    
+    def clear_event_tree(self):
+        """清空事件列表"""
         for item in self.event_tree.get_children():
             self.event_tree.delete(item)
+    
+    def fill_event_tree(self, target_date, rows):
+        """主线程：显示某天的事件"""
+        if target_date != self.selected_date:
+            return
         
-        date_str = target_date.strftime("%Y-%m-%d")
-        events = self.events_data.get(date_str, [])
-        
-        if not events:
+        self.clear_event_tree()
+        if not rows:
             self.event_tree.insert("", "end", values=("全天", "该日期暂无事件", "0%", "无"))
             return
         
         # 按热度排序
-        sorted_events = sorted(events, key=lambda x: getattr(x, 'heat_score', 0), reverse=True)
-        
-        for event in sorted_events:
-            event_time = "全天"  # 简化处理
-            event_type = self.get_event_type_display(getattr(event, 'event_type', 'meme'))
-            heat_score = getattr(event, 'heat_score', 0)
-            
+        for row in sorted(rows, key=lambda r: r.heat_score, reverse=True):
             self.event_tree.insert("", "end", values=(
-                event_time,
-                event.title,
-                f"{heat_score}%",
-                event_type
-            ), tags=(getattr(event, 'id', 'sample'),))
+                "全天",  # 简化处理
+                row.title,
+                f"{row.heat_score}%",
+                self.get_event_type_display(row.event_type)
+            ), tags=(row.id,))
     
     def get_event_type_display(self, event_type):
         """获取事件类型显示文本"""
@@ -529,7 +661,7 @@ class CalendarView:
         """显示年历缩略图快速选择窗口"""
         year_window = tk.Toplevel(self.window)
         year_window.title("📅 年历视图 - 快速选择")
-        year_window.geometry("600x400")
+        year_window.geometry("900x380")
         year_window.transient(self.window)
         year_window.grab_set()
         
@@ -540,7 +672,7 @@ class CalendarView:
         # 标题
         title_label = ttk.Label(
             main_frame,
-            text="📅 年历快速选择",
+            text="📅 年度事件热力图",
             font=("微软雅黑", 16, "bold"),
             foreground="#2c3e50"
         )
@@ -565,38 +697,53 @@ class CalendarView:
         )
         year_combo.pack(side=tk.LEFT, padx=(10, 0))
         
-        # 月份网格
-        month_frame = ttk.Frame(main_frame)
-        month_frame.pack(fill=tk.BOTH, expand=True)
+        # 全年热力图：每天一格，数据来自一次每日聚合查询
+        heatmap_frame = ttk.Frame(main_frame)
+        heatmap_frame.pack(fill=tk.BOTH, expand=True)
         
-        months = [
-            ("1月", 1), ("2月", 2), ("3月", 3),
-            ("4月", 4), ("5月", 5), ("6月", 6),
-            ("7月", 7), ("8月", 8), ("9月", 9),
-            ("10月", 10), ("11月", 11), ("12月", 12)
-        ]
+        info_label = ttk.Label(main_frame, text="", font=("微软雅黑", 9), foreground="#7f8c8d")
+        info_label.pack(fill=tk.X, pady=(10, 0))
         
-        for i, (month_name, month_num) in enumerate(months):
-            row = i // 3
-            col = i % 3
-            
-            btn = tk.Button(
-                month_frame,
-                text=month_name,
-                font=("微软雅黑", 11),
-                bg="#3498db",
-                fg="white",
-                width=8,
-                height=2,
-                cursor="hand2",
-                command=lambda m=month_num: self.select_month_from_year_view(
-                    int(year_var.get()), m, year_window
-                )
+        def show_hover(cell_date, stats):
+            if cell_date is None:
+                return
+            if stats:
+                info_label.config(text=f"{cell_date.strftime('%Y年%m月%d日')}：{stats.event_count} 个事件，最高热度 {stats.max_heat}")
+            else:
+                info_label.config(text=f"{cell_date.strftime('%Y年%m月%d日')}：暂无事件")
+        
+        heatmap = YearHeatmap(
+            heatmap_frame,
+            on_day_click=lambda d: self.select_date_from_year_view(d, year_window),
+            on_month_click=lambda y, m: self.select_month_from_year_view(y, m, year_window),
+            on_hover=show_hover
+        )
+        heatmap.pack(anchor="center")
+        
+        def show_year(year, day_stats):
+            if not year_window.winfo_exists() or int(year_var.get()) != year:
+                return
+            elapsed_ms = heatmap.draw(year, day_stats)
+            total = sum(row.event_count for row in day_stats.values())
+            info_label.config(
+                text=f"{year}年共 {total} 个事件，{len(day_stats)} 天有事件（点击日期查看，点击月份跳转）· 绘制 {elapsed_ms:.1f}ms"
             )
-            btn.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            
-            month_frame.columnconfigure(col, weight=1)
-            month_frame.rowconfigure(row, weight=1)
+        
+        def update_heatmap():
+            """后台读取所选年份的每日聚合后重绘热力图"""
+            year = int(year_var.get())
+            if not self.db_connected:
+                show_year(year, {})
+                return
+            info_label.config(text=f"⏳ 正在加载 {year} 年的事件...")
+            self.loader.submit(
+                "year", self.fetch_year_stats, year,
+                on_success=lambda day_stats: show_year(year, day_stats),
+                on_error=self.on_load_error
+            )
+        
+        year_combo.bind('<<ComboboxSelected>>', lambda e: update_heatmap())
+        update_heatmap()
         
         # 按钮区域
         button_frame = ttk.Frame(main_frame)
@@ -608,15 +755,25 @@ class CalendarView:
             command=year_window.destroy
         ).pack(side=tk.RIGHT, padx=5)
     
+    @staticmethod
+    def fetch_year_stats(year):
+        """工作线程：一次查询全年的每日聚合，返回 {date: 聚合行}"""
+        return {row.date: row for row in db_manager.get_daily_stats(date(year, 1, 1), date(year, 12, 31))}
+    
+    def select_date_from_year_view(self, clicked_date, year_window):
+        """从年度热力图点击某天：跳转到该月并选中这一天"""
+        self.select_month_from_year_view(clicked_date.year, clicked_date.month, year_window)
+        self.on_date_click(clicked_date)
+    
     def select_month_from_year_view(self, year, month, year_window):
         """从年历视图选择月份"""
         self.current_year = year
         self.current_month = month
         year_window.destroy()
+        self.loader.cancel("year")
         
         self.load_events_data()
         self.update_calendar()
-        self.status_label.config(text=f"已切换到 {year}年{month}月")
     
     def previous_month(self):
         """切换到上个月"""
@@ -628,7 +785,6 @@ class CalendarView:
         
         self.load_events_data()
         self.update_calendar()
-        self.status_label.config(text=f"已切换到 {self.current_year}年{self.current_month}月")
     
     def next_month(self):
         """切换到下个月"""
@@ -640,7 +796,6 @@ class CalendarView:
         
         self.load_events_data()
         self.update_calendar()
-        self.status_label.config(text=f"已切换到 {self.current_year}年{self.current_month}月")
     
     def go_to_today(self):
         """回到今天"""
@@ -650,11 +805,17 @@ class CalendarView:
         
         self.load_events_data()
         self.update_calendar()
-        self.status_label.config(text="已回到今天")
         
         # 自动选中今天
         self.on_date_click(today)
 
+    def close(self):
+        """关闭窗口并停止后台加载"""
+        if DATABASE_AVAILABLE:
+            db_manager.remove_change_listener(self.on_data_changed)
+        self.loader.shutdown()
+        self.window.destroy()
+
     def __del__(self):
         """析构函数，关闭数据库连接"""
         if DATABASE_AVAILABLE and self.db_connected:
@@ -11,11 +11,16 @@ sys.path.insert(0, project_root)
 try:
     from core.database.database_manager import db_manager
     from core.database.models import InternetEvent
+    from core.database.query_builder import HEAT_BANDS
     DATABASE_AVAILABLE = True
 except ImportError as e:
     print(f"数据库导入错误: {e}")
     DATABASE_AVAILABLE = False
 
+from ui.desktop.ttk_app.background import BackgroundLoader
+from ui.desktop.ttk_app.virtual_table import VirtualEventTable, EventRowSource
+from config.settings import UI_CONFIG
+
 class DataManager:
     def __init__(self, parent):
         self.parent = parent
@@ -31,6 +36,25 @@ class DataManager:
         # 当前选中的事件
         self.selected_event = None
         
+        # 虚拟表格按页（游标）加载，只保留当前筛选条件
+        self.page_size = 100
+        self.current_filters = {}
+        
+        # 筛选下拉框显示的文字（带数量）到筛选值的映射：{维度: {显示文字: 值}}
+        self.facet_options = {'category': {}, 'event_type': {}, 'heat': {}}
+        
+        # 数据库查询在后台线程执行；工作线程只读，使用只读连接，每个任务结束后归还连接
+        self.loader = BackgroundLoader(
+            self.window,
+            initializer=(lambda: db_manager.connect(read_only=True)) if self.db_connected else None,
+            finalizer=db_manager.release_connection if self.db_connected else None
+        )
+        
+        # 边输入边搜索：停止输入一段时间后才发起查询
+        self.search_delay = UI_CONFIG.get("search_debounce_ms", 300)
+        self.search_after_id = None
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
         self.setup_ui()
         self.load_events()
     
@@ -90,6 +114,7 @@ class DataManager:
         self.search_entry = ttk.Entry(keyword_row, width=30, font=("微软雅黑", 10))
         self.search_entry.pack(side=tk.LEFT, padx=(0, 20))
         self.search_entry.bind('<Return>', lambda e: self.search_events())
+        self.search_entry.bind('<KeyRelease>', self.on_search_key)
         
         ttk.Button(
             keyword_row, 
@@ -105,14 +130,27 @@ class DataManager:
             width=8
         ).pack(side=tk.LEFT)
         
-        # 第二行：分类搜索
+        # 第二行：分类、类型、热度筛选
         category_row = ttk.Frame(search_frame)
         category_row.pack(fill=tk.X, pady=5)
         
         ttk.Label(category_row, text="分类:", font=("微软雅黑", 10)).pack(side=tk.LEFT, padx=(0, 10))
-        self.category_entry = ttk.Entry(category_row, width=30, font=("微软雅黑", 10))
-        self.category_entry.pack(side=tk.LEFT, padx=(0, 20))
+        # 分类下拉框：候选项为当前条件下各分类的事件数，也可手动输入
+        self.category_entry = ttk.Combobox(category_row, width=20, font=("微软雅黑", 10))
+        self.category_entry.pack(side=tk.LEFT, padx=(0, 15))
         self.category_entry.bind('<Return>', lambda e: self.search_events())
+        self.category_entry.bind('<<ComboboxSelected>>', lambda e: self.search_events())
+        
+        ttk.Label(category_row, text="类型:", font=("微软雅黑", 10)).pack(side=tk.LEFT, padx=(0, 10))
+        self.event_type_entry = ttk.Combobox(category_row, width=14, font=("微软雅黑", 10), state="readonly")
+        self.event_type_entry.pack(side=tk.LEFT, padx=(0, 15))
+        self.event_type_entry.bind('<<ComboboxSelected>>', lambda e: self.search_events())
+        
+        ttk.Label(category_row, text="热度:", font=("微软雅黑", 10)).pack(side=tk.LEFT, padx=(0, 10))
+        self.heat_entry = ttk.Combobox(category_row, width=16, font=("微软雅黑", 10), state="readonly")
+        self.heat_entry.pack(side=tk.LEFT, padx=(0, 20))
+        self.heat_entry.bind('<<ComboboxSelected>>', lambda e: self.search_events())
+        self.facet_entries = {'category': self.category_entry, 'event_type': self.event_type_entry, 'heat': self.heat_entry}
         
         ttk.Button(
             category_row, 
@@ -128,19 +166,65 @@ class DataManager:
             width=8
         ).pack(side=tk.LEFT)
 
+    def load_facet_options(self):
+        """在后台统计当前条件下各分类、类型、热度区间的事件数，作为下拉框候选项"""
+        if not self.db_connected:
+            return
+        
+        filters = {key: value for key, value in self.current_filters.items() if value}
+        self.loader.submit(
+            "facets", lambda: db_manager.get_facet_counts(**filters), on_success=self.show_facet_options
+        )
+    
+    def show_facet_options(self, facets):
+        """用统计结果更新筛选下拉框，已选中的项换成新的数量"""
+        for dimension, entry in self.facet_entries.items():
+            current = self.get_filter_value(dimension)
+            current_text = entry.get()
+            
+            options = {"全部": None}
+            for value, count in facets.get(dimension, []):
+                options[f"{self.get_filter_display(dimension, value)} ({count})"] = value
+            if current and current not in options.values():
+                options[f"{self.get_filter_display(dimension, current)} (0)"] = current
+            
+            self.facet_options[dimension] = options
+            entry['values'] = list(options)
+            
+            # 手动输入的分类保持原样；从列表选中的项更新为带最新数量的文字
+            if current and (dimension != 'category' or current_text != current):
+                entry.set(next(text for text, value in options.items() if value == current))
+    
+    def get_filter_value(self, dimension):
+        """筛选下拉框当前对应的值：带数量的显示文字换回原值，"全部" 表示不限"""
+        text = self.facet_entries[dimension].get().strip()
+        value = self.facet_options[dimension].get(text, text)
+        return value if value and value != "全部" else ''
+    
+    def get_filter_display(self, dimension, value):
+        """筛选值的显示文字"""
+        if dimension == 'event_type':
+            return self.get_event_type_display(value)
+        if dimension == 'heat':
+            return next((label for key, label, _, _ in HEAT_BANDS if key == value), value)
+        return value
+
     def create_data_table(self, parent):
         """创建数据表格"""
         table_frame = ttk.LabelFrame(parent, text="📊 事件列表", padding="10")
         table_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        # 创建树形视图
+        # 创建虚拟滚动表格：条目数量固定为可见行数
         columns = ("date", "title", "type", "categories", "heat_score", "has_literature")
-        self.tree = ttk.Treeview(
-            table_frame, 
-            columns=columns,
-            show="headings",
-            height=15
+        self.table = VirtualEventTable(
+            table_frame,
+            columns,
+            self.loader,
+            self.format_row,
+            on_select=self.on_item_select,
+            on_loaded=self.on_table_loaded
         )
+        self.tree = self.table.tree
         
         # 设置列标题
         self.tree.heading("date", text="日期")
@@ -158,16 +242,10 @@ class DataManager:
         self.tree.column("heat_score", width=80, anchor="center")
         self.tree.column("has_literature", width=60, anchor="center")
         
-        # 滚动条
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        # 布局
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # 布局（滚动条由虚拟表格按总行数控制）
+        self.table.pack()
         
-        # 绑定事件
-        self.tree.bind('<<TreeviewSelect>>', self.on_item_select)
+        # 绑定事件（选中事件由虚拟表格转发）
         self.tree.bind('<Double-1>', self.on_item_double_click)
     
     def create_action_buttons(self, parent):
@@ -215,61 +293,50 @@ class DataManager:
         )
         self.status_label.pack(side=tk.LEFT)
     
-    def load_events(self, events=None):
-        """加载事件到表格"""
-        # 清空现有数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # 如果没有传入events参数，从数据库加载
-        if events is None:
-            if not self.db_connected:
-                self.load_sample_data()
-                return
-            
-            try:
-                events = db_manager.get_all_events(limit=100)
-            except Exception as e:
-                print(f"从数据库加载事件失败: {e}")
-                self.load_sample_data()
-                return
-        
-        try:
-            # 填充数据
-            for event in events:
-                has_lit = "✅" if getattr(event, 'has_literature', False) else "❌"
-                
-                # 处理分类显示
-                categories = getattr(event, 'categories', [])
-                if isinstance(categories, list):
-                    categories_display = ", ".join(categories)
-                else:
-                    categories_display = str(categories)
-                
-                self.tree.insert("", "end", values=(
-                    event.date.strftime("%Y-%m-%d") if hasattr(event, 'date') and event.date else "",
-                    event.title,
-                    self.get_event_type_display(getattr(event, 'event_type', 'meme')),
-                    categories_display,
-                    f"{getattr(event, 'heat_score', 0)}%",
-                    has_lit
-                ), tags=(str(event.id),))  # 确保ID是字符串
-                
-            # 更新统计信息
-            self.update_stats(len(events))
-            
-        except Exception as e:
-            print(f"加载数据到表格失败: {e}")
+    def load_events(self):
+        """按当前筛选条件重新加载表格（只读取可见区域所在的页）"""
+        if not self.db_connected:
             self.load_sample_data()
+            return
+        
+        self.status_label.config(text="⏳ 正在加载事件...")
+        self.stats_label.config(text="正在统计...")
+        self.table.set_source(EventRowSource(self.current_filters, self.page_size))
+        self.load_facet_options()
+    
+    def on_table_loaded(self, total):
+        """表格总数统计完成"""
+        self.update_stats(total)
+        if any(self.current_filters.values()):
+            if total:
+                self.status_label.config(text=f"搜索完成，找到 {total} 个事件")
+            else:
+                self.status_label.config(text="未找到匹配的事件")
+        elif self.status_label.cget("text").startswith("⏳"):
+            self.status_label.config(text="数据库连接正常")
+    
+    def format_row(self, row):
+        """把数据源的行转换为表格显示的值"""
+        event_id, event_date, title, event_type, categories, heat_score, has_literature = row
+        
+        # 处理分类显示
+        if isinstance(categories, list):
+            categories_display = ", ".join(categories)
+        else:
+            categories_display = str(categories)
+        
+        return (
+            event_date.strftime("%Y-%m-%d") if event_date else "",
+            title,
+            self.get_event_type_display(event_type),
+            categories_display,
+            f"{heat_score}%",
+            "✅" if has_literature else "❌"
+        )
 
     def load_sample_data(self):
         """加载示例数据 - 返回空数据"""
         # 不插入任何示例数据
-        sample_events = []
-        
-        for event in sample_events:
-            self.tree.insert("", "end", values=event[:6], tags=(event[6],))
-        
         self.update_stats(0)  # 更新统计为0
 
     def get_event_type_display(self, event_type):
@@ -287,26 +354,38 @@ class DataManager:
         """更新统计信息"""
         self.stats_label.config(text=f"共 {count} 个事件")
     
+    def on_search_key(self, event):
+        """关键词输入变化后延迟搜索，连续输入时只保留最后一次"""
+        if self.search_after_id is not None:
+            self.window.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        
+        keyword = self.search_entry.get().strip()
+        if keyword == self.current_filters.get('keyword', ''):
+            return  # 方向键等不改变内容的按键
+        self.search_after_id = self.window.after(self.search_delay, self.search_events)
+    
     def search_events(self):
-        """搜索事件 - 优化错误处理"""
+        """搜索事件：查询在后台执行，第一页结果先显示，总数统计完成后再更新"""
+        if self.search_after_id is not None:
+            self.window.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        
         if not self.db_connected:
             messagebox.showinfo("提示", "数据库不可用，搜索功能受限")
             return
         
         keyword = self.search_entry.get().strip()
-        category = self.category_entry.get().strip()
-        
+        filters = {dimension: self.get_filter_value(dimension) for dimension in self.facet_options}
         try:
-            # 使用安全的搜索方法
-            events = db_manager.search_events_safe(keyword=keyword, category=category)
-            
-            if events:
-                self.load_events(events)
-                self.status_label.config(text=f"搜索完成，找到 {len(events)} 个事件")
-            else:
-                self.load_events([])
-                self.status_label.config(text="未找到匹配的事件")
-                
+            # 新的数据源会取代仍在排队的旧查询，旧查询的结果直接丢弃
+            self.current_filters = dict(keyword=keyword, **filters)
+            self.load_events()
+            if any(self.current_filters.values()):
+                description = [keyword] + [
+                    self.get_filter_display(dimension, value) for dimension, value in filters.items() if value
+                ]
+                self.status_label.config(text=f"🔍 正在搜索 {' / '.join(text for text in description if text)} ...")
         except Exception as e:
             print(f"搜索错误: {e}")
             self.status_label.config(text="搜索过程中发生错误")
@@ -317,16 +396,20 @@ class DataManager:
         self.search_events()
     
     def reset_category_search(self):
-        """重置分类搜索"""
+        """重置分类、类型和热度筛选"""
         self.category_entry.delete(0, tk.END)
+        self.event_type_entry.set("")
+        self.heat_entry.set("")
         self.search_events()
     
     def reset_search(self):
         """重置所有搜索条件"""
         self.search_entry.delete(0, tk.END)
         self.category_entry.delete(0, tk.END)
+        self.event_type_entry.set("")
+        self.heat_entry.set("")
+        self.current_filters = {}
         self.load_events()
-        self.status_label.config(text="搜索条件已重置")
     
     def on_item_select(self, event):
         """选中事件"""
@@ -759,7 +842,11 @@ class DataManager:
     def refresh_data(self):
         """刷新数据"""
         self.load_events()
-        self.status_label.config(text="数据已刷新")
+    
+    def close(self):
+        """关闭窗口并停止后台加载"""
+        self.loader.shutdown()
+        self.window.destroy()
     
     def __del__(self):
         """析构函数，关闭数据库连接"""
@@ -179,9 +179,10 @@ class MemeCalendarApp:
         try:
             from core.database.database_manager import db_manager
             if db_manager.connect():
-                events = db_manager.get_all_events(limit=10)
+                # 总数来自每日聚合，不加载事件
+                count = db_manager.count_events()
                 db_manager.disconnect()
-                return len(events)
+                return count
         except:
             pass
         return -1
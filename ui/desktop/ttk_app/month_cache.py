@@ -0,0 +1,72 @@
+"""
+日历月份缓存 - 按 (年, 月) 缓存每日聚合，LRU 淘汰
+
+数据变更时由 DatabaseManager 的变更监听器精确失效对应月份。
+每个月份带版本号：失效发生在后台查询期间时，查询结果不会写回缓存。
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class MonthCache:
+    """线程安全的月份 LRU 缓存"""
+
+    def __init__(self, max_size=12):
+        self.max_size = max(1, int(max_size))
+        self._data = OrderedDict()
+        self._versions = {}
+        self._epoch = 0  # 整体清空时递增
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """读取缓存，命中时移到最近使用位置；未命中返回 None"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def token(self, key):
+        """发起查询前取得版本号，写回时用于检查是否已失效"""
+        with self._lock:
+            return self._epoch, self._versions.get(key, 0)
+
+    def put(self, key, value, token=None):
+        """写入缓存；token 已过期（期间发生过失效）时放弃写入"""
+        with self._lock:
+            if token is not None and token != (self._epoch, self._versions.get(key, 0)):
+                return False
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            return True
+
+    def invalidate(self, keys=None):
+        """失效指定月份；keys 为 None 时清空全部"""
+        with self._lock:
+            if keys is None:
+                self._data.clear()
+                self._epoch += 1
+                return
+            for key in keys:
+                self._data.pop(key, None)
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def invalidate_dates(self, dates):
+        """按日期失效所在月份，返回受影响的 (年, 月) 集合；dates 为 None 时清空全部"""
+        if dates is None:
+            self.invalidate()
+            return None
+        keys = {(d.year, d.month) for d in dates}
+        self.invalidate(keys)
+        return keys
@@ -0,0 +1,283 @@
+"""
+虚拟滚动事件表格 - Treeview 只保留可见行数的条目
+
+表格条目数量固定为可见行数，滚动时只替换条目内容；
+数据按页通过 (date, id) 游标在后台加载，最近访问的页缓存在内存中。
+总数来自每日聚合（无筛选时）或一次 COUNT 查询，打开百万行的表也只需读一页。
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+try:
+    from core.database.database_manager import db_manager
+except ImportError as e:
+    print(f"数据库导入错误: {e}")
+
+
+class EventRowSource:
+    """按页读取事件的数据源（load_page 在工作线程中调用）
+
+    每行为只包含列表字段的 EventListRow。
+    """
+
+    def __init__(self, filters=None, page_size=100):
+        self.filters = {key: value for key, value in (filters or {}).items() if value}
+        self.page_size = page_size
+        # 第 i 页起始位置的游标；第 0 页为 None
+        self.cursors = {0: None}
+        self._lock = threading.Lock()
+
+    def count(self):
+        """事件总数"""
+        return db_manager.count_events(**self.filters)
+
+    def load_pages(self, page_indexes):
+        """读取多页，返回 {页号: 行列表}"""
+        return {index: self.load_page(index) for index in page_indexes}
+
+    def load_page(self, page_index):
+        """读取一页，已知的游标会被记录下来供后续翻页使用"""
+        cursor = self._cursor_for(page_index)
+        page = db_manager.get_event_rows_page(cursor=cursor, page_size=self.page_size, **self.filters)
+        if page.next_cursor is not None:
+            with self._lock:
+                self.cursors[page_index + 1] = page.next_cursor
+        return page.items
+
+    def _cursor_for(self, page_index):
+        with self._lock:
+            if page_index in self.cursors:
+                return self.cursors[page_index]
+
+        # 跳转到未访问过的页：按位置直接定位游标，不逐页翻过去
+        cursor = db_manager.get_cursor_at(page_index * self.page_size, **self.filters)
+        with self._lock:
+            self.cursors[page_index] = cursor
+        return cursor
+
+
+class VirtualEventTable:
+    """固定条目池的虚拟滚动表格"""
+
+    MAX_CACHED_PAGES = 50
+
+    def __init__(self, parent, columns, loader, format_row, on_select=None, on_loaded=None):
+        self.loader = loader
+        self.format_row = format_row
+        self.on_select = on_select
+        self.on_loaded = on_loaded
+        self.columns = columns
+
+        self.source = None
+        self.total = 0
+        self.top = 0
+        self.pages = OrderedDict()
+        self.selected_id = None
+        self.items = []
+        self.visible_items = []
+        self.requested_pages = None
+
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", height=15)
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll_by(-len(self.items)))
+        self.tree.bind('<Next>', lambda e: self.scroll_by(len(self.items)))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0) or "break")
+        self.tree.bind('<End>', lambda e: self.scroll_to(self.total) or "break")
+        self.tree.bind('<Up>', lambda e: self.on_arrow(-1))
+        self.tree.bind('<Down>', lambda e: self.on_arrow(1))
+
+        self.resize_pool(15)
+
+    def pack(self):
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    # ==================== 数据源 ====================
+
+    def set_source(self, source):
+        """切换数据源：清空缓存，后台读取总数和第一页"""
+        self.source = source
+        self.pages.clear()
+        self.total = 0
+        self.top = 0
+        self.loader.submit(
+            "table-count", source.count,
+            on_success=lambda total: self.on_count(source, total),
+            on_error=lambda e: print(f"统计事件数失败: {e}")
+        )
+        self.request_pages([0])
+        self.render()
+
+    def on_count(self, source, total):
+        if source is not self.source:
+            return
+        # 第一页已到达且不足一页时以实际行数为准
+        if 0 in self.pages and len(self.pages[0]) < source.page_size:
+            total = len(self.pages[0])
+        self.total = total
+        self.render()
+        if self.on_loaded:
+            self.on_loaded(total)
+
+    def request_pages(self, page_indexes):
+        """后台加载缺失的页；新的请求会取代尚未完成的旧请求"""
+        source = self.source
+        request = (source, tuple(page_indexes))
+        if request == self.requested_pages and self.loader.is_loading("table-rows"):
+            return
+        self.requested_pages = request
+        self.loader.submit(
+            "table-rows", source.load_pages, page_indexes,
+            on_success=lambda pages: self.on_pages(source, pages),
+            on_error=lambda e: print(f"加载事件页失败: {e}")
+        )
+
+    def on_pages(self, source, pages):
+        if source is not self.source:
+            return
+        for index, rows in pages.items():
+            self.pages[index] = rows
+            self.pages.move_to_end(index)
+            # 不足一页说明已到末尾，修正总数；总数尚未返回时先按已加载的行显示
+            if len(rows) < source.page_size:
+                self.total = index * source.page_size + len(rows)
+            else:
+                self.total = max(self.total, index * source.page_size + len(rows))
+        while len(self.pages) > self.MAX_CACHED_PAGES:
+            self.pages.popitem(last=False)
+        self.render()
+
+    def refresh(self):
+        """重新加载当前数据源"""
+        if self.source is not None:
+            self.set_source(type(self.source)(self.source.filters, self.source.page_size))
+
+    # ==================== 渲染 ====================
+
+    def resize_pool(self, row_count):
+        """调整条目池大小为可见行数"""
+        row_count = max(1, row_count)
+        while len(self.items) < row_count:
+            self.items.append(self.tree.insert("", "end", values=("",) * len(self.columns)))
+            self.visible_items.append(self.items[-1])
+        while len(self.items) > row_count:
+            item = self.items.pop()
+            if item in self.visible_items:
+                self.visible_items.remove(item)
+            self.tree.delete(item)
+
+    def on_resize(self, event):
+        # 减去表头所占的一行
+        row_count = max(1, event.height // self.row_height - 1)
+        if row_count != len(self.items):
+            self.resize_pool(row_count)
+            self.render()
+
+    def render(self):
+        """用当前窗口 [top, top + 可见行数) 的数据更新条目"""
+        if self.source is None:
+            return
+        page_size = self.source.page_size
+        self.top = max(0, min(self.top, self.total - len(self.items)))
+
+        missing = []
+        selected_item = None
+        visible_items = []
+        for offset, item in enumerate(self.items):
+            position = self.top + offset
+            # 超出总数的条目暂时移出表格（首页加载中时保留一行提示）
+            if position >= self.total and not (position == 0 and 0 not in self.pages):
+                if item in self.visible_items:
+                    self.tree.detach(item)
+                continue
+
+            if item not in self.visible_items:
+                self.tree.move(item, "", offset)
+            visible_items.append(item)
+            page_index, row_index = divmod(position, page_size)
+            rows = self.pages.get(page_index)
+            if rows is not None and row_index < len(rows):
+                row = rows[row_index]
+                self.tree.item(item, values=self.format_row(row), tags=(row[0],))
+                if row[0] == self.selected_id:
+                    selected_item = item
+            else:
+                placeholder = ("",) * len(self.columns)
+                if rows is None:
+                    placeholder = ("", "⏳ 加载中...") + placeholder[2:]
+                    if page_index not in missing:
+                        missing.append(page_index)
+                self.tree.item(item, values=placeholder, tags=("",))
+
+        # 选中状态跟随事件 ID，而不是条目
+        if selected_item is not None:
+            if self.tree.selection() != (selected_item,):
+                self.tree.selection_set(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        self.visible_items = visible_items
+        if missing:
+            self.request_pages(missing)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        if self.total <= 0:
+            self.scrollbar.set(0, 1)
+            return
+        first = self.top / self.total
+        last = min(1.0, (self.top + len(self.items)) / self.total)
+        self.scrollbar.set(first, last)
+
+    # ==================== 滚动与选择 ====================
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), self.total - len(self.items)))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+        return "break"
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = len(self.items) if args[2] == "pages" else 1
+            self.scroll_by(int(args[1]) * step)
+
+    def on_arrow(self, direction):
+        """方向键到达可见区域边缘时滚动表格"""
+        visible = self.visible_items
+        focus = self.tree.focus()
+        if not visible or focus not in visible:
+            return None
+        index = visible.index(focus)
+        if (direction < 0 and index == 0) or (direction > 0 and index == len(visible) - 1):
+            self.scroll_by(direction)
+            return "break"
+        return None
+
+    def on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        tags = self.tree.item(selection[0])['tags']
+        event_id = str(tags[0]) if tags else ""
+        if not event_id or event_id == self.selected_id:
+            return
+        self.selected_id = event_id
+        if self.on_select:
+            self.on_select(event)
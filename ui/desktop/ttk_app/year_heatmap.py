@@ -0,0 +1,140 @@
+"""
+年度热力图 - 在单个 Canvas 上绘制全年每天的事件密度
+
+每周一列、每天一格（周一在上），共 54×7 个矩形。矩形只在创建时生成一次，
+切换年份时只修改颜色和可见性，重绘不创建新组件。
+"""
+
+import time
+import tkinter as tk
+from datetime import date, timedelta
+
+# 从无事件到事件最多的颜色等级
+HEAT_COLORS = ["#ebedf0", "#ffcdd2", "#ef9a9a", "#e57373", "#c62828"]
+
+
+class YearHeatmap:
+    """全年事件热力图"""
+
+    CELL = 12
+    GAP = 3
+    LEFT = 34
+    TOP = 22
+    COLUMNS = 54  # 闰年且 1 月 1 日为周日时需要 54 列
+
+    def __init__(self, parent, on_day_click=None, on_month_click=None, on_hover=None):
+        self.on_day_click = on_day_click
+        self.on_month_click = on_month_click
+        self.on_hover = on_hover
+        self.year = None
+        self.day_stats = {}
+        self.last_render_ms = None
+
+        step = self.CELL + self.GAP
+        self.canvas = tk.Canvas(
+            parent,
+            width=self.LEFT + self.COLUMNS * step + 10,
+            height=self.TOP + 7 * step + 10,
+            bg="white",
+            highlightthickness=0
+        )
+
+        # 星期标签
+        for row, label in ((0, "一"), (2, "三"), (4, "五"), (6, "日")):
+            self.canvas.create_text(
+                self.LEFT - 8, self.TOP + row * step + self.CELL / 2,
+                text=label, anchor="e", font=("微软雅黑", 8), fill="#7f8c8d"
+            )
+
+        # 日期格子：按 (列, 行) 预先创建
+        self.cells = []
+        for col in range(self.COLUMNS):
+            for row in range(7):
+                x, y = self.LEFT + col * step, self.TOP + row * step
+                self.cells.append(self.canvas.create_rectangle(
+                    x, y, x + self.CELL, y + self.CELL,
+                    fill=HEAT_COLORS[0], outline="", state="hidden"
+                ))
+
+        self.canvas.tag_bind("month", "<Button-1>", self._on_month_label_click)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Motion>", self._on_motion)
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def draw(self, year, day_stats):
+        """按 {date: 聚合行} 重绘指定年份，返回绘制耗时（毫秒）"""
+        start_time = time.perf_counter()
+        self.year = year
+        self.day_stats = day_stats
+
+        max_count = max((row.event_count for row in day_stats.values()), default=0)
+        first_day = self._first_cell_date(year)
+        for index, item in enumerate(self.cells):
+            cell_date = first_day + timedelta(days=(index // 7) * 7 + index % 7)
+            if cell_date.year != year:
+                self.canvas.itemconfigure(item, state="hidden")
+                continue
+            stats = day_stats.get(cell_date)
+            count = stats.event_count if stats else 0
+            self.canvas.itemconfigure(item, state="normal", fill=self._color(count, max_count))
+
+        # 月份标签（位置随年份变化）
+        self.canvas.delete("month")
+        step = self.CELL + self.GAP
+        for month in range(1, 13):
+            col = (date(year, month, 1) - first_day).days // 7
+            self.canvas.create_text(
+                self.LEFT + col * step, self.TOP - 12,
+                text=f"{month}月", anchor="w", font=("微软雅黑", 8),
+                fill="#2c3e50", tags=("month", f"month-{month}")
+            )
+
+        self.canvas.update_idletasks()
+        self.last_render_ms = (time.perf_counter() - start_time) * 1000
+        return self.last_render_ms
+
+    @staticmethod
+    def _first_cell_date(year):
+        """第一列周一对应的日期"""
+        jan_first = date(year, 1, 1)
+        return jan_first - timedelta(days=jan_first.weekday())
+
+    @staticmethod
+    def _color(count, max_count):
+        if not count or not max_count:
+            return HEAT_COLORS[0]
+        # 按当年最大值线性分为 4 级
+        level = 1 + min(3, int((count - 1) * 4 / max_count))
+        return HEAT_COLORS[level]
+
+    def date_at(self, x, y):
+        """画布坐标对应的日期；不在当年格子上时返回 None"""
+        if self.year is None:
+            return None
+        step = self.CELL + self.GAP
+        col, col_offset = divmod(x - self.LEFT, step)
+        row, row_offset = divmod(y - self.TOP, step)
+        if not (0 <= col < self.COLUMNS and 0 <= row < 7):
+            return None
+        if col_offset >= self.CELL or row_offset >= self.CELL:
+            return None
+        cell_date = self._first_cell_date(self.year) + timedelta(days=int(col) * 7 + int(row))
+        return cell_date if cell_date.year == self.year else None
+
+    def _on_click(self, event):
+        cell_date = self.date_at(event.x, event.y)
+        if cell_date and self.on_day_click:
+            self.on_day_click(cell_date)
+
+    def _on_month_label_click(self, event):
+        item = self.canvas.find_withtag("current")
+        for tag in self.canvas.gettags(item):
+            if tag.startswith("month-") and self.on_month_click:
+                self.on_month_click(self.year, int(tag.split("-")[1]))
+
+    def _on_motion(self, event):
+        if self.on_hover:
+            cell_date = self.date_at(event.x, event.y)
+            self.on_hover(cell_date, self.day_stats.get(cell_date) if cell_date else None)
@@ -1,5 +1,19 @@
 """
-模块文档
+FastAPI 依赖 - 每个请求一个 AsyncSession 和绑定它的 AsyncEventRepository
 """
 
-# 待实现
+from fastapi import Depends
+
+from core.database.async_repository import AsyncEventRepository, get_async_sessionmaker
+from core.database.database_manager import db_manager
+
+
+async def get_session():
+    """从异步连接池借出一个会话，请求结束后归还"""
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def get_repository(session=Depends(get_session)):
+    """当前请求的事件仓库；写入后使同一进程中 db_manager 的查询缓存失效"""
+    return AsyncEventRepository(session, notify=db_manager.query_cache.invalidate_dates)
@@ -2,19 +2,196 @@
 FastAPI 后端主程序
 """
 
-from fastapi import FastAPI
+import os
+import sys
+import json
+import hashlib
+import calendar
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Optional
 
-app = FastAPI(title="抽象梗日历")
+from fastapi import FastAPI, HTTPException, Query, Depends, Request, Response
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.database.query_builder import HEAT_BANDS
+from core.database.pagination import decode_cursor
+from core.database.async_repository import init_async_database, dispose_async_engines
+from ui.web.backend.dependencies import get_repository
+from config.settings import SEARCH_RESULT_LIMIT
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # 迁移在线程池中完成，请求处理时不再执行同步的数据库初始化
+    await init_async_database()
+    yield
+    await dispose_async_engines()
+
+app = FastAPI(title="抽象梗日历", lifespan=lifespan)
+
+
+def serialize_event(event):
+    """把事件对象转换为 JSON 可序列化的字典"""
+    return {
+        "id": event.id,
+        "date": event.date.isoformat() if event.date else None,
+        "title": event.title,
+        "description": getattr(event, 'description', None),
+        "event_type": getattr(event, 'event_type', 'meme'),
+        "categories": getattr(event, 'categories', None) or [],
+        "keywords": getattr(event, 'keywords', None) or [],
+        "heat_level": getattr(event, 'heat_level', None),
+        "heat_score": getattr(event, 'heat_score', 0),
+        "has_literature": bool(getattr(event, 'has_literature', False))
+    }
+
+
+def check_heat_band(heat):
+    """热度区间只接受 HEAT_BANDS 中的键"""
+    if heat and heat not in {key for key, _, _, _ in HEAT_BANDS}:
+        raise HTTPException(status_code=400, detail=f"未知的热度区间: {heat}")
+
+def make_etag(*parts):
+    """由请求参数和数据版本生成强 ETag（内容相同则 ETag 相同）"""
+    raw = json.dumps(parts, default=str, ensure_ascii=False, sort_keys=True)
+    return '"' + hashlib.sha1(raw.encode('utf-8')).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 是否命中（按 RFC 7232 的弱比较，W/ 前缀忽略）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in {tag[2:] if tag.startswith("W/") else tag for tag in tags}
 
 @app.get("/")
 async def root():
     return {"message": "抽象梗日历 API"}
 
-@app.get("/events/")
-async def get_events():
-    return {"events": []}
+@app.get("/events")
+@app.get("/events/", include_in_schema=False)
+async def get_events(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    keyword: Optional[str] = None,
+    category: Optional[str] = None,
+    event_type: Optional[str] = None,
+    heat: Optional[str] = None,
+    repository=Depends(get_repository)
+):
+    """按 (date, id) 游标分页列出事件；next_cursor 为空表示没有更多数据
+
+    ETag 由请求参数和事件表的修订号生成，数据未变时带 If-None-Match 的请求
+    只做一次主键查找并返回 304。
+    """
+    check_heat_band(heat)
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="开始日期不能晚于结束日期")
+    try:
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "keyword": keyword,
+        "category": category,
+        "event_type": event_type,
+        "heat": heat
+    }
+    # 修订号和分页查询在同一会话（同一事务）中执行，ETag 与返回的内容一致
+    revision = await repository.get_events_revision()
+    headers = {}
+    if revision is not None:
+        headers = {"ETag": make_etag(filters, cursor, limit, revision), "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    page = await repository.get_events_page(cursor=cursor, page_size=limit, **filters)
+    response.headers.update(headers)
+    return {
+        "events": [serialize_event(event) for event in page.items],
+        "next_cursor": page.next_cursor
+    }
+
+@app.get("/events/search")
+async def search_events(
+    keyword: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    limit: int = Query(SEARCH_RESULT_LIMIT, ge=1, le=500),
+    repository=Depends(get_repository)
+):
+    """关键词/分类/标签搜索；有关键词时按相关度排序，最多返回 limit 条"""
+    events = await repository.search_events(keyword=keyword, category=category, tag=tag, limit=limit)
+    return {"events": [serialize_event(event) for event in events]}
+
+@app.get("/calendar/{year}/{month}")
+async def get_month_stats(year: int, month: int, repository=Depends(get_repository)):
+    """某月每天的事件数和热度（来自每日聚合）"""
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail=f"无效的月份: {month}")
+    start_date = date(year, month, 1)
+    end_date = date(year, month, calendar.monthrange(year, month)[1])
+    stats = await repository.get_daily_stats(start_date, end_date)
+    return {
+        "days": [
+            {
+                "date": row.date.isoformat(),
+                "event_count": row.event_count,
+                "max_heat": row.max_heat,
+                "avg_heat": row.avg_heat,
+                "top_event_id": row.top_event_id
+            }
+            for row in stats
+        ]
+    }
+
+@app.get("/events/facets")
+async def get_event_facets(
+    keyword: Optional[str] = None,
+    category: Optional[str] = None,
+    event_type: Optional[str] = None,
+    heat: Optional[str] = None,
+    tag: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    repository=Depends(get_repository)
+):
+    """当前筛选条件下各分类、事件类型、热度区间的事件数（一次 UNION ALL 查询统计）"""
+    check_heat_band(heat)
+    facets = await repository.get_facet_counts(
+        keyword=keyword,
+        category=category,
+        event_type=event_type,
+        heat=heat,
+        tag=tag,
+        start_date=start_date,
+        end_date=end_date
+    )
+    labels = {key: label for key, label, _, _ in HEAT_BANDS}
+    return {
+        "category": [{"value": value, "count": count} for value, count in facets["category"]],
+        "event_type": [{"value": value, "count": count} for value, count in facets["event_type"]],
+        "heat": [
+            {"value": value, "label": labels.get(value, value), "count": count}
+            for value, count in facets["heat"]
+        ]
+    }
 
 @app.get("/events/sample")
-async def get_sample_events():
-    events = load_sample_data()
-    return {"events": events}
+async def get_sample_events(limit: int = Query(10, ge=1, le=100), repository=Depends(get_repository)):
+    """最近的若干条事件（用于前端预览）"""
+    events = await repository.get_all_events(limit=limit)
+    return {"events": [serialize_event(event) for event in events]}